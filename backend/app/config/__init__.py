@@ -17,6 +17,84 @@ class Config(object):
         self.OPENAI_API_KEY = os.getenv('OPENAI_API_KEY','abcxyz')
         self.GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
         self.AUDD_API_KEY = os.getenv('AUDD_API_KEY')
+        # Import heavy subsystems (TensorFlow navigation, real-time description, sentence-transformers,
+        # LangChain providers) in a background thread after startup instead of on first use
+        self.SUBSYSTEM_WARMUP = os.getenv('SUBSYSTEM_WARMUP', 'true').lower() == 'true'
+        # Real-time description: describe a frame only when its similarity to the last described
+        # frame (0-1, see app/utils/scene_change.py) drops below this; clients can override it
+        self.DESCRIPTION_CHANGE_THRESHOLD = float(os.getenv('DESCRIPTION_CHANGE_THRESHOLD', 0.85))
+        # Real-time description budget: seconds between descriptions per user (clients may ask for
+        # more, never less than MIN), Gemini calls per minute shared fairly by all users, calls in flight
+        self.DESCRIPTION_INTERVAL = float(os.getenv('DESCRIPTION_INTERVAL', 3.0))
+        self.DESCRIPTION_MIN_INTERVAL = float(os.getenv('DESCRIPTION_MIN_INTERVAL', 1.0))
+        self.DESCRIPTION_CALLS_PER_MINUTE = float(os.getenv('DESCRIPTION_CALLS_PER_MINUTE', 60))
+        self.DESCRIPTION_MAX_IN_FLIGHT = int(os.getenv('DESCRIPTION_MAX_IN_FLIGHT', 4))
+        # Seconds before a Gemini description request is abandoned
+        self.DESCRIPTION_TIMEOUT = float(os.getenv('DESCRIPTION_TIMEOUT', 10.0))
+        # Stream real-time descriptions as description_partial chunks while Gemini generates them
+        self.DESCRIPTION_STREAMING = os.getenv('DESCRIPTION_STREAMING', 'true').lower() == 'true'
+        # Per-user description memory: do not repeat sentences whose embedding similarity to one spoken
+        # in the last DEDUP_WINDOW seconds reaches DEDUP_THRESHOLD, and answer revisited scenes (frame
+        # similarity >= CACHE_THRESHOLD) from an LRU of CACHE_SIZE descriptions without a Gemini call
+        self.DESCRIPTION_DEDUP = os.getenv('DESCRIPTION_DEDUP', 'true').lower() == 'true'
+        self.DESCRIPTION_DEDUP_THRESHOLD = float(os.getenv('DESCRIPTION_DEDUP_THRESHOLD', 0.9))
+        self.DESCRIPTION_DEDUP_WINDOW = float(os.getenv('DESCRIPTION_DEDUP_WINDOW', 60.0))
+        self.DESCRIPTION_CACHE_SIZE = int(os.getenv('DESCRIPTION_CACHE_SIZE', 16))
+        self.DESCRIPTION_CACHE_THRESHOLD = float(os.getenv('DESCRIPTION_CACHE_THRESHOLD', 0.95))
+        # Resize / re-encode images per task (app/utils/image_prep.py) before sending them to the LLM
+        self.LLM_IMAGE_PREP = os.getenv('LLM_IMAGE_PREP', 'true').lower() == 'true'
+        # Barcode decode cascade (app/services/barcode_scanning/cascade.py): stages to try (comma-separated,
+        # empty = all in the default order), time budget per scan in ms (0 = none), and whether stages
+        # are reordered by measured cost per hit
+        self.BARCODE_STAGES = os.getenv('BARCODE_STAGES', '')
+        self.BARCODE_SCAN_BUDGET_MS = float(os.getenv('BARCODE_SCAN_BUDGET_MS', 800))
+        self.BARCODE_ADAPTIVE_ORDER = os.getenv('BARCODE_ADAPTIVE_ORDER', 'true').lower() == 'true'
+        # Decode the cascade stages in parallel on a pool of this many threads (same result as sequential)
+        self.BARCODE_PARALLEL = os.getenv('BARCODE_PARALLEL', 'false').lower() == 'true'
+        self.BARCODE_PARALLEL_WORKERS = int(os.getenv('BARCODE_PARALLEL_WORKERS', 4))
+        # Load outdoor navigation models at startup instead of on first connection
+        self.NAVIGATION_PRELOAD_MODELS = os.getenv('NAVIGATION_PRELOAD_MODELS', 'false').lower() == 'true'
+        # Navigation inference path: "predict" (Keras model.predict), "compiled" (traced tf.function),
+        # "onnx" (ONNX Runtime) or "tflite" (TFLite interpreter) on models exported with export.py,
+        # or "int8" (quantized TFLite, calibrated on example videos and cached in NAVIGATION_EXPORT_DIR)
+        self.NAVIGATION_INFERENCE_MODE = os.getenv('NAVIGATION_INFERENCE_MODE', 'predict')
+        self.NAVIGATION_EXPORT_DIR = os.getenv('NAVIGATION_EXPORT_DIR', 'app/models/exported')
+        self.NAVIGATION_CALIBRATION_FRAMES = int(os.getenv('NAVIGATION_CALIBRATION_FRAMES', 200))
+        # CPU threads for the onnx / tflite backends (0 = runtime default)
+        self.NAVIGATION_INTRA_OP_THREADS = int(os.getenv('NAVIGATION_INTRA_OP_THREADS', 0))
+        self.NAVIGATION_INTER_OP_THREADS = int(os.getenv('NAVIGATION_INTER_OP_THREADS', 0))
+        # Navigation models: "separate" (VGG16 + ResNet152) or "combined" (one model, two heads;
+        # Keras only, i.e. the "predict" or "compiled" inference mode)
+        self.NAVIGATION_MODEL_MODE = os.getenv('NAVIGATION_MODEL_MODE', 'separate')
+        self.NAVIGATION_COMBINED_WEIGHTS = os.getenv(
+            'NAVIGATION_COMBINED_WEIGHTS', 'app/models/navigation_combined_vgg16.weights.h5'
+        )
+        # Adaptive navigation inference rate: skip frames with little motion, but infer at least
+        # every MAX interval; the MIN interval grows with server load
+        self.NAVIGATION_ADAPTIVE_RATE = os.getenv('NAVIGATION_ADAPTIVE_RATE', 'true').lower() == 'true'
+        self.NAVIGATION_MIN_INFERENCE_INTERVAL = float(os.getenv('NAVIGATION_MIN_INFERENCE_INTERVAL', 0.1))
+        self.NAVIGATION_MAX_INFERENCE_INTERVAL = float(os.getenv('NAVIGATION_MAX_INFERENCE_INTERVAL', 0.5))
+        self.NAVIGATION_MOTION_THRESHOLD = float(os.getenv('NAVIGATION_MOTION_THRESHOLD', 0.04))
+        # Worker threads for navigation frame decode + inference (off the event loop)
+        self.NAVIGATION_WORKERS = int(os.getenv('NAVIGATION_WORKERS', 4))
+        # Batch navigation inference across sessions
+        self.NAVIGATION_BATCHING = os.getenv('NAVIGATION_BATCHING', 'false').lower() == 'true'
+        self.NAVIGATION_MAX_BATCH_SIZE = int(os.getenv('NAVIGATION_MAX_BATCH_SIZE', 8))
+        self.NAVIGATION_MAX_BATCH_WAIT_MS = float(os.getenv('NAVIGATION_MAX_BATCH_WAIT_MS', 10))
+        # Decode navigation JPEGs at reduced scale straight to the 100x100 model input. Off until
+        # benchmark_frame_ingest.py --agreement shows the predictions match the full decode
+        self.NAVIGATION_REDUCED_DECODE = os.getenv('NAVIGATION_REDUCED_DECODE', 'false').lower() == 'true'
+        # Guidance hysteresis: emit "changes" (+ heartbeats) or "all" processed frames
+        self.NAVIGATION_GUIDANCE_EMIT = os.getenv('NAVIGATION_GUIDANCE_EMIT', 'changes').lower()
+        self.NAVIGATION_GUIDANCE_MIN_DWELL = float(os.getenv('NAVIGATION_GUIDANCE_MIN_DWELL', 1.0))
+        self.NAVIGATION_GUIDANCE_CONFIRM_FRAMES = int(os.getenv('NAVIGATION_GUIDANCE_CONFIRM_FRAMES', 3))
+        self.NAVIGATION_GUIDANCE_HEARTBEAT = float(os.getenv('NAVIGATION_GUIDANCE_HEARTBEAT', 5.0))
+        # Admission control: concurrent sessions, waiting queue, inferences in flight
+        self.NAVIGATION_MAX_SESSIONS = int(os.getenv('NAVIGATION_MAX_SESSIONS', 8))
+        self.NAVIGATION_MAX_QUEUED_SESSIONS = int(os.getenv('NAVIGATION_MAX_QUEUED_SESSIONS', 4))
+        self.NAVIGATION_QUEUE_TIMEOUT = float(os.getenv('NAVIGATION_QUEUE_TIMEOUT', 30))
+        self.NAVIGATION_MAX_IN_FLIGHT = int(os.getenv('NAVIGATION_MAX_IN_FLIGHT', self.NAVIGATION_WORKERS))
+        self.NAVIGATION_DEGRADE_THRESHOLD = float(os.getenv('NAVIGATION_DEGRADE_THRESHOLD', 0.75))
         # self.VOICE_RSS = os.getenv('Voice_RSS')
 
 config = Config()
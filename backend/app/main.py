@@ -13,7 +13,6 @@ from fpdf import FPDF
 import numpy as np
 import openai
 from pydantic import BaseModel, Json
-from sympy import content
 
 # from app.article_reading.pipeline import execute_pipeline
 from app.services.question_answering.pipeline import ask_general_question
@@ -37,7 +36,6 @@ import json
 import mimetypes
 #from app.services.image_captioning.provider.gpt4.gpt4 import OpenAIProvider
 from fastapi import FastAPI, UploadFile, File
-from sentence_transformers import SentenceTransformer, util
 import tempfile
 import requests
 from collections import OrderedDict
@@ -46,6 +44,7 @@ from .services.barcode_scanning import BarcodeProcessingError, BarcodeScannerSer
 from .services.music_detection.pipeline import execute_music_detection
 from .utils.formatter import format_audio_response
 from .websocket_manager import manager
+from .utils.subsystems import subsystems
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
@@ -65,31 +64,86 @@ print(f"All Models loaded in {time.time() - start:.2f} seconds", file=sys.stderr
 
 app = FastAPI()
 
-# Import WebSocket handlers for real-time description
-from app.services.stream_video.websocket_server import (
-    websocket_realtime_description,
-    start_realtime_description,
-    stop_realtime_description,
-    get_description_status,
-    stream_descriptions_to_clients
-)
+# ============================================================================
+# Heavy subsystems (loaded lazily, warmed in the background after startup)
+# ============================================================================
+
+def _load_navigation():
+    # Pulls in TensorFlow / Keras applications
+    from app.services.outdoor_navigation import websocket_server
+    from app.services.outdoor_navigation.model_registry import model_registry
+    if config.NAVIGATION_PRELOAD_MODELS:
+        model_registry.preload()
+    return websocket_server
+
+
+def _load_realtime_description():
+    from app.services.stream_video import websocket_server
+    websocket_server.get_gemini_client()
+    return websocket_server
+
+
+def _load_embeddings():
+    return get_embedder()
+
+
+def _load_llm():
+    from app.services.all_task.pipeline import get_llm
+    return get_llm("gemini")
+
+
+subsystems.register("navigation", _load_navigation, "Outdoor navigation (TensorFlow models)")
+subsystems.register("realtime_description", _load_realtime_description, "Real-time scene description (Gemini)")
+subsystems.register("embeddings", _load_embeddings, "Voice command routing (sentence-transformers)")
+subsystems.register("llm", _load_llm, "LangChain LLM providers")
+
+
+async def _start_streaming_tasks():
+    """Legacy streaming loops of the WebSocket services (idle placeholders), once loaded"""
+    try:
+        description_server = await subsystems.require("realtime_description")
+        asyncio.create_task(description_server.stream_descriptions_to_clients())
+        navigation_server = await subsystems.require("navigation")
+        asyncio.create_task(navigation_server.stream_navigation_to_clients())
+        print("[STARTUP] WebSocket streaming tasks started")
+    except Exception as e:
+        print(f"[STARTUP] WebSocket streaming tasks not started: {e}")
 
-# Import WebSocket handlers for outdoor navigation
-from app.services.outdoor_navigation.websocket_server import (
-    websocket_outdoor_navigation,
-    start_outdoor_navigation,
-    stop_outdoor_navigation,
-    get_navigation_status,
-    stream_navigation_to_clients
-)
 
-# Start background task for streaming descriptions
 @app.on_event("startup")
 async def startup_event():
-    """Start background tasks when FastAPI starts"""
-    asyncio.create_task(stream_descriptions_to_clients())
-    asyncio.create_task(stream_navigation_to_clients())
-    print("[STARTUP] WebSocket streaming tasks started")
+    """Start background work without blocking the first request"""
+    if config.SUBSYSTEM_WARMUP:
+        subsystems.warm()
+        asyncio.create_task(_start_streaming_tasks())
+    elif config.NAVIGATION_PRELOAD_MODELS:
+        subsystems.warm(["navigation"])
+
+    if config.NAVIGATION_PRELOAD_MODELS:
+        # Sessions that connect before loading finishes simply wait on the registry
+        print("[STARTUP] Preloading outdoor navigation models")
+
+
+@app.get("/health")
+async def health():
+    """Liveness: the API answers even while subsystems are still loading"""
+    return {"status": "ok"}
+
+
+@app.get("/health/subsystems")
+async def subsystems_health():
+    """Readiness of every lazily loaded subsystem"""
+    return subsystems.status()
+
+
+@app.get("/health/subsystems/{name}")
+async def subsystem_health(name: str):
+    """Readiness of one subsystem: 200 when ready, 503 while loading or failed"""
+    if name not in subsystems:
+        raise HTTPException(status_code=404, detail=f"Unknown subsystem: {name}")
+    status = subsystems.status()["subsystems"][name]
+    return JSONResponse(content={"name": name, **status}, status_code=200 if status["ready"] else 503)
+
 
 # Configure CORS for WebSocket
 app.add_middleware(
@@ -255,6 +309,17 @@ async def barcode_scan(
     return JSONResponse(content=payload)
 
 
+@app.get("/barcode/stats")
+async def barcode_stats():
+    """Decode cascade statistics: per-stage attempts, hits and cost, current order"""
+    if barcode_scanner is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Barcode scanning service is not available on this server.",
+        )
+    return barcode_scanner.get_stats()
+
+
 
 # image_path = "./app/dis.jpg"  
 
@@ -697,31 +762,54 @@ async def general_qa(message: str = Form(...)):
 
 
 
+async def _require_or_close(name: str, websocket: WebSocket):
+    """Load a subsystem for a WebSocket; on failure tell the client and close"""
+    try:
+        return await subsystems.require(name)
+    except Exception as e:
+        await websocket.accept()
+        await websocket.send_json({"type": "error", "message": f"Service unavailable: {e}"})
+        await websocket.close(code=1011)
+        return None
+
+
+async def _require_or_503(name: str):
+    try:
+        return await subsystems.require(name)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Service unavailable: {e}")
+
+
 @app.websocket("/ws/realtime-description")
 async def websocket_endpoint(websocket: WebSocket):
     """
     WebSocket endpoint for real-time scene description.
     Frontend connects here to receive continuous descriptions.
     """
-    await websocket_realtime_description(websocket)
+    server = await _require_or_close("realtime_description", websocket)
+    if server is not None:
+        await server.websocket_realtime_description(websocket)
 
 
 @app.post("/realtime-description/start")
 async def start_description():
     """Start real-time description service"""
-    return await start_realtime_description()
+    server = await _require_or_503("realtime_description")
+    return await server.start_realtime_description()
 
 
 @app.post("/realtime-description/stop")
 async def stop_description():
     """Stop real-time description service"""
-    return await stop_realtime_description()
+    server = await _require_or_503("realtime_description")
+    return await server.stop_realtime_description()
 
 
 @app.get("/realtime-description/status")
 async def description_status():
     """Get status of real-time description service"""
-    return await get_description_status()
+    server = await _require_or_503("realtime_description")
+    return await server.get_description_status()
 
 
 # ============================================================================
@@ -734,25 +822,33 @@ async def outdoor_navigation_ws(websocket: WebSocket):
     WebSocket endpoint for outdoor navigation.
     Frontend connects here to receive continuous navigation guidance.
     """
-    await websocket_outdoor_navigation(websocket)
+    server = await _require_or_close("navigation", websocket)
+    if server is not None:
+        await server.websocket_outdoor_navigation(websocket)
 
 
 @app.post("/outdoor-navigation/start")
 async def start_navigation(use_camera: bool = True, video_path: str = None):
     """Start outdoor navigation service"""
-    return await start_outdoor_navigation(use_camera, video_path)
+    server = await _require_or_503("navigation")
+    return await server.start_outdoor_navigation(use_camera, video_path)
 
 
 @app.post("/outdoor-navigation/stop")
 async def stop_navigation():
     """Stop outdoor navigation service"""
-    return await stop_outdoor_navigation()
+    server = await _require_or_503("navigation")
+    return await server.stop_outdoor_navigation()
 
 
 @app.get("/outdoor-navigation/status")
 async def navigation_status():
     """Get status of outdoor navigation service"""
-    return await get_navigation_status()
+    if not subsystems.is_ready("navigation"):
+        # Do not trigger a TensorFlow import just to report status
+        return JSONResponse(content={"subsystem": subsystems.status()["subsystems"]["navigation"]}, status_code=503)
+    server = await subsystems.require("navigation")
+    return await server.get_navigation_status()
 
 
 # ============================================================================
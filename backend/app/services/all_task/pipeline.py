@@ -1,16 +1,14 @@
 import base64
 import logging
 import os
+from functools import lru_cache
 from typing import Optional
 
 from dotenv import load_dotenv
 
-# LangChain Models
-from langchain_community.chat_models import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_groq import ChatGroq
-
+from app.config import config
 from app.services.barcode_scanning import BarcodeProcessingError, BarcodeScannerService
+from app.utils.image_prep import prepare_base64
 
 # Load env vars
 load_dotenv()
@@ -84,12 +82,18 @@ Expected output:
 # Unified LLM Handler
 # ---------------------------
 
+@lru_cache(maxsize=None)
 def get_llm(provider: str):
+    # LangChain providers are imported on first use: they are slow to import
+    # and only one of them is normally needed
     if provider == "openai":
+        from langchain_community.chat_models import ChatOpenAI
         return ChatOpenAI(model="gpt-4o-mini", temperature=0.2)
     elif provider == "gemini":
+        from langchain_google_genai import ChatGoogleGenerativeAI
         return ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0.2, google_api_key=os.getenv("GOOGLE_API_KEY"))
     elif provider == "groq":
+        from langchain_groq import ChatGroq
         return ChatGroq(model="llama-3.1-8b-instant", groq_api_key=os.getenv("GROQ_API_KEY"))
     else:
         raise ValueError(f"Unsupported provider: {provider}")
@@ -220,6 +224,8 @@ def get_llm_response(query: str, task: str, base64_image: Optional[str] = None,
         
 
     if task != "product_recognition" and base64_image:
+        if config.LLM_IMAGE_PREP:
+            base64_image = prepare_base64(base64_image, task)
         image_url = f"data:image/jpeg;base64,{base64_image}"
         messages = [
             {"role": "system", "content": prompt},
@@ -0,0 +1,257 @@
+"""
+Staged barcode decode cascade.
+
+A scan tries a list of stages (image variants: flips, warped ROI, CLAHE,
+thresholds, rescales, ...) and stops at the first one zbar decodes. The
+cascade adds, on top of trying them one after another:
+
+    - shared intermediates: a ScanContext computes values several stages
+      need (grayscale, the CLAHE-enhanced image, the warped ROI) once per
+      scan instead of once per stage
+    - per-stage statistics: attempts, hits, mean cost (image preparation
+      plus decode; an intermediate is charged to the first stage needing it)
+    - adaptive ordering: once stages have min_samples attempts they are
+      sorted by expected cost per hit (mean cost / hit rate), so cheap
+      stages that find barcodes run first; stages with fewer samples keep
+      their configured position
+    - a time budget: no new stage starts once budget_ms have passed (the
+      first stage always runs)
+
+run_parallel() fans the stages out over a thread pool instead (zbar, via
+ctypes, and OpenCV release the GIL). The result is still that of the first
+stage in order that decodes: once stage i succeeds, stages after it are
+cancelled, and stages before it are waited for. Without a budget it is
+therefore identical to run().
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SCAN_WINDOW = 200  # Recent scans kept for latency percentiles
+
+
+class ScanContext:
+    """
+    The frame of one scan and the intermediates computed from it so far.
+    Safe to share between the threads of a parallel scan: each intermediate
+    is computed once, other threads needing it wait for it.
+    """
+
+    def __init__(self, frame: np.ndarray, producers: Dict[str, Callable[["ScanContext"], Any]]):
+        self.frame = frame
+        self._producers = producers
+        self._values: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        if name in self._values:
+            return self._values[name]
+        with self._locks_lock:
+            lock = self._locks.setdefault(name, threading.Lock())
+        with lock:
+            if name not in self._values:
+                self._values[name] = self._producers[name](self)
+        return self._values[name]
+
+
+@dataclass
+class CascadeStage:
+    name: str
+    # Image to decode, or None when the stage does not apply to this frame
+    prepare: Callable[[ScanContext], Optional[np.ndarray]]
+    attempts: int = 0
+    hits: int = 0
+    skipped: int = 0
+    total_ms: float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.attempts if self.attempts else 0.0
+
+    def expected_cost(self) -> float:
+        """Mean cost per hit, hit rate smoothed so unseen successes are not infinite"""
+        return self.mean_ms * (self.attempts + 2) / (self.hits + 1)
+
+
+@dataclass
+class CascadeResult:
+    detections: List[Any] = field(default_factory=list)
+    stage: Optional[str] = None   # Stage that decoded, None if nothing found
+    elapsed_ms: float = 0.0
+    stages_tried: int = 0
+    budget_exhausted: bool = False
+
+
+class BarcodeCascade:
+    """Runs stages in (adaptive) order until one decodes or the budget runs out"""
+
+    def __init__(self, stages: Sequence[CascadeStage], budget_ms: float = 0.0, adaptive: bool = True,
+                 min_samples: int = 20, reorder_every: int = 10):
+        self.stages = list(stages)
+        self.budget_ms = budget_ms
+        self.adaptive = adaptive
+        self.min_samples = min_samples
+        self.reorder_every = max(1, reorder_every)
+
+        self._lock = threading.Lock()
+        self._order = list(self.stages)
+        self.scans = 0
+        self.hits = 0
+        self.budget_exhausted = 0
+        self.scan_ms = deque(maxlen=SCAN_WINDOW)
+
+    def order(self) -> List[CascadeStage]:
+        return list(self._order)
+
+    def _reorder(self):
+        """Sort the well-sampled stages by expected cost, keeping the others in place"""
+        sampled = [i for i, stage in enumerate(self.stages) if stage.attempts >= self.min_samples]
+        ranked = sorted((self.stages[i] for i in sampled), key=CascadeStage.expected_cost)
+        order = list(self.stages)
+        for index, stage in zip(sampled, ranked):
+            order[index] = stage
+        self._order = order
+
+    def record(self, stage: CascadeStage, elapsed_ms: float, hit: bool):
+        with self._lock:
+            stage.attempts += 1
+            stage.total_ms += elapsed_ms
+            stage.hits += hit
+
+    def finish(self, result: CascadeResult):
+        with self._lock:
+            self.scans += 1
+            self.hits += result.stage is not None
+            self.budget_exhausted += result.budget_exhausted
+            self.scan_ms.append(result.elapsed_ms)
+            if self.adaptive and self.scans % self.reorder_every == 0:
+                self._reorder()
+
+    def run(self, context: ScanContext, decode: Callable[[np.ndarray], List[Any]]) -> CascadeResult:
+        start = time.perf_counter()
+        result = CascadeResult()
+        for stage in self.order():
+            if self.budget_ms and result.stages_tried and (time.perf_counter() - start) * 1000.0 >= self.budget_ms:
+                result.budget_exhausted = True
+                break
+
+            stage_start = time.perf_counter()
+            image = stage.prepare(context)
+            if image is None:
+                with self._lock:
+                    stage.skipped += 1
+                continue
+            detections = decode(image)
+            result.stages_tried += 1
+            self.record(stage, (time.perf_counter() - stage_start) * 1000.0, bool(detections))
+            if detections:
+                result.detections, result.stage = detections, stage.name
+                break
+
+        result.elapsed_ms = (time.perf_counter() - start) * 1000.0
+        self.finish(result)
+        return result
+
+    def run_parallel(self, context: ScanContext, decode: Callable[[np.ndarray], List[Any]],
+                     executor: Executor) -> CascadeResult:
+        start = time.perf_counter()
+        order = self.order()
+        first_hit = [len(order)]  # Index of the earliest stage that decoded so far
+        hit_lock = threading.Lock()
+        futures = []
+
+        def attempt(index: int, stage: CascadeStage):
+            if index > first_hit[0]:
+                return "cancelled", []
+            stage_start = time.perf_counter()
+            image = stage.prepare(context)
+            if image is None:
+                with self._lock:
+                    stage.skipped += 1
+                return "skipped", []
+            if index > first_hit[0]:
+                return "cancelled", []
+            detections = decode(image)
+            self.record(stage, (time.perf_counter() - stage_start) * 1000.0, bool(detections))
+            if detections:
+                with hit_lock:
+                    if index < first_hit[0]:
+                        first_hit[0] = index
+                        for future in futures[index + 1:]:
+                            future.cancel()
+            return "decoded", detections
+
+        with hit_lock:
+            # Submitted in order: with fewer workers than stages, earlier stages start first
+            futures.extend(executor.submit(attempt, index, stage) for index, stage in enumerate(order))
+
+        result = CascadeResult()
+        deadline = start + self.budget_ms / 1000.0 if self.budget_ms else None
+        try:
+            # Earlier stages take precedence, so look at the results in order
+            for index, future in enumerate(futures):
+                if index > first_hit[0]:
+                    break
+                timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+                try:
+                    status, detections = future.result(timeout=timeout)
+                except FutureTimeoutError:
+                    result.budget_exhausted = True
+                    break
+                result.stages_tried += status == "decoded"
+                if detections:
+                    result.detections, result.stage = detections, order[index].name
+                    break
+
+            if result.budget_exhausted:
+                # Out of time: take the earliest stage that has already decoded, if any
+                for index, future in enumerate(futures):
+                    if future.done() and not future.cancelled() and future.result()[1]:
+                        result.detections, result.stage = future.result()[1], order[index].name
+                        break
+        finally:
+            first_hit[0] = -1  # Stages not started yet return at once
+            for future in futures:
+                future.cancel()
+
+        result.elapsed_ms = (time.perf_counter() - start) * 1000.0
+        self.finish(result)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            scan_ms = np.asarray(self.scan_ms, dtype=np.float64)
+            return {
+                "scans": self.scans,
+                "hit_ratio": round(self.hits / self.scans, 3) if self.scans else None,
+                "budget_ms": self.budget_ms,
+                "budget_exhausted": self.budget_exhausted,
+                "scan_p50_ms": round(float(np.percentile(scan_ms, 50)), 1) if scan_ms.size else None,
+                "scan_p95_ms": round(float(np.percentile(scan_ms, 95)), 1) if scan_ms.size else None,
+                "adaptive": self.adaptive,
+                "order": [stage.name for stage in self._order],
+                "stages": {
+                    stage.name: {
+                        "attempts": stage.attempts,
+                        "hits": stage.hits,
+                        "skipped": stage.skipped,
+                        "mean_ms": round(stage.mean_ms, 2),
+                    }
+                    for stage in self.stages
+                },
+            }
+
+
+def parse_stage_names(value: str, available: Sequence[str]) -> Tuple[List[str], List[str]]:
+    """Comma-separated stage names from config -> (known names in that order, unknown names)"""
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    if not names:
+        return list(available), []
+    return [name for name in names if name in available], [name for name in names if name not in available]
@@ -1,6 +1,8 @@
 import base64
 import logging
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urlparse
@@ -10,6 +12,10 @@ import numpy as np
 import requests
 from newspaper import Article
 
+from app.config import config
+
+from .cascade import BarcodeCascade, CascadeStage, ScanContext, parse_stage_names
+
 try:
     from pyzbar.pyzbar import ZBarSymbol, decode as zbar_decode
     BARCODE_IMPORT_ERROR: Optional[Exception] = None
@@ -61,6 +67,14 @@ class BarcodeScannerService:
             ZBarSymbol.DATABAR,     # GS1 DataBar
             ZBarSymbol.DATABAR_EXP, # GS1 DataBar Expanded
         ]
+        self._intermediates = self._build_intermediates()
+        self._cascade = BarcodeCascade(
+            self._build_stages(),
+            budget_ms=config.BARCODE_SCAN_BUDGET_MS,
+            adaptive=config.BARCODE_ADAPTIVE_ORDER,
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
 
     def scan_base64(self, base64_image: str, trigger: str = "snapshot") -> Dict[str, object]:
         try:
@@ -289,131 +303,107 @@ class BarcodeScannerService:
             raise BarcodeProcessingError("Invalid image data: unable to decode frame.")
         return frame
 
-    def _decode_barcodes(self, frame: np.ndarray) -> List[BarcodeDetection]:
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(1, config.BARCODE_PARALLEL_WORKERS),
+                    thread_name_prefix="barcode-decode",
+                )
+            return self._executor
+
+    def _decode_barcodes(self, frame: np.ndarray, parallel: Optional[bool] = None) -> List[BarcodeDetection]:
         """
         Hàm decode barcode hoàn chỉnh:
         - Thử mọi flip/rotate
         - Tự động detect + warp vùng barcode
         - Áp dụng toàn bộ pipeline tăng cường hiện có
+        Các bước chạy qua BarcodeCascade (xem cascade.py): dừng ở bước đầu
+        tiên decode được, sắp xếp lại theo chi phí / tỉ lệ thành công, dùng
+        chung grayscale / CLAHE và giới hạn thời gian mỗi lần scan.
+        parallel (mặc định BARCODE_PARALLEL): chạy các bước song song trên
+        thread pool, kết quả giống hệt khi chạy tuần tự.
         """
-
-        # ------------------------------------------------------------
-        # 1) TRY BASIC TRANSFORMS (rất quan trọng cho ảnh webcam)
-        # ------------------------------------------------------------
-        transforms = [
-            ("orig", lambda x: x),
-            ("flip_h", lambda x: cv2.flip(x, 1)),
-            ("flip_v", lambda x: cv2.flip(x, 0)),
-            ("rot_90", lambda x: cv2.rotate(x, cv2.ROTATE_90_CLOCKWISE)),
-            ("rot_180", lambda x: cv2.rotate(x, cv2.ROTATE_180)),
-            ("rot_270", lambda x: cv2.rotate(x, cv2.ROTATE_90_COUNTERCLOCKWISE)),
-        ]
-
-        for name, tf in transforms:
-            timg = tf(frame)
-            decoded = self._perform_decode(timg)
-            if decoded:
-                logger.info(f"[BARCODE] Detected after transform {name}: {[d.code for d in decoded]}")
-                return decoded
-
-        # ------------------------------------------------------------
-        # 2) TRY TO EXTRACT + WARP BARCODE REGION
-        # ------------------------------------------------------------
-        warp = self._extract_and_warp_barcode(frame)
-        if warp is not None:
+        context = ScanContext(frame, self._intermediates)
+        if config.BARCODE_PARALLEL if parallel is None else parallel:
+            result = self._cascade.run_parallel(context, self._perform_decode, self._get_executor())
+        else:
+            result = self._cascade.run(context, self._perform_decode)
+        if result.stage is not None:
+            logger.info(f"[BARCODE] Detected after {result.stage}: {[d.code for d in result.detections]}")
+        elif result.budget_exhausted:
+            logger.info(f"[BARCODE] No barcode detected within {self._cascade.budget_ms:.0f} ms "
+                        f"({result.stages_tried} stages)")
+        else:
+            logger.info("[BARCODE] No barcode detected after all methods")
+        return result.detections
+
+    # ------------------------------------------------------------
+    # Cascade stages (same images, same order as the original sequence)
+    # ------------------------------------------------------------
+    def _build_intermediates(self) -> Dict[str, Any]:
+        def first_channel(ctx):
+            # zbar only reads the first channel of a colour image: flip/rotate just that
+            frame = ctx.frame
+            return np.ascontiguousarray(frame[:, :, 0]) if frame.ndim == 3 else frame
+
+        def gray(ctx):
+            return cv2.cvtColor(ctx.frame, cv2.COLOR_BGR2GRAY)
+
+        def warp(ctx):
+            roi = self._extract_and_warp_barcode(ctx.frame, gray=ctx.get("gray"))
+            if roi is None:
+                return None
             # tăng kích thước
-            warp = cv2.resize(warp, None, fx=2.0, fy=2.0, interpolation=cv2.INTER_CUBIC)
+            return cv2.resize(roi, None, fx=2.0, fy=2.0, interpolation=cv2.INTER_CUBIC)
 
-            decoded = self._perform_decode(warp)
-            if decoded:
-                logger.info(f"[BARCODE] Detected on warped ROI: {[d.code for d in decoded]}")
-                return decoded
+        return {
+            "first_channel": first_channel,
+            "gray": gray,
+            "enhanced": lambda ctx: self._enhance_gray(ctx.get("gray")),
+            "warp": warp,
+        }
 
-            # thử preprocess + decode
-            enhanced = self._preprocess(warp)
-            decoded = self._perform_decode(enhanced)
-            if decoded:
-                logger.info(f"[BARCODE] Detected after preprocess(warp): {[d.code for d in decoded]}")
-                return decoded
+    def _build_stages(self) -> List[CascadeStage]:
+        def warp_enhanced(ctx):
+            roi = ctx.get("warp")
+            return self._preprocess(roi) if roi is not None else None
+
+        stages = [
+            # 1) basic transforms (rất quan trọng cho ảnh webcam)
+            ("orig", lambda ctx: ctx.get("first_channel")),
+            ("flip_h", lambda ctx: cv2.flip(ctx.get("first_channel"), 1)),
+            ("flip_v", lambda ctx: cv2.flip(ctx.get("first_channel"), 0)),
+            ("rot_90", lambda ctx: cv2.rotate(ctx.get("first_channel"), cv2.ROTATE_90_CLOCKWISE)),
+            ("rot_180", lambda ctx: cv2.rotate(ctx.get("first_channel"), cv2.ROTATE_180)),
+            ("rot_270", lambda ctx: cv2.rotate(ctx.get("first_channel"), cv2.ROTATE_90_COUNTERCLOCKWISE)),
+            # 2) extracted + warped barcode region
+            ("warp", lambda ctx: ctx.get("warp")),
+            ("warp_enhanced", warp_enhanced),
+            # 3) enhancement pipeline
+            ("gray", lambda ctx: ctx.get("gray")),
+            ("enhanced", lambda ctx: ctx.get("enhanced")),
+            ("sharpen", lambda ctx: self._sharpen(ctx.get("enhanced"))),
+            ("adaptive", lambda ctx: self._adaptive_threshold(ctx.get("enhanced"))),
+            ("otsu", lambda ctx: self._binary_threshold(ctx.get("enhanced"))),
+            ("morphology", lambda ctx: self._morphological_operations(ctx.get("enhanced"))),
+            ("contrast", lambda ctx: self._increase_contrast(ctx.get("enhanced"))),
+            ("upscale", lambda ctx: self._preprocess(
+                cv2.resize(ctx.frame, None, fx=2.0, fy=2.0, interpolation=cv2.INTER_CUBIC))),
+            ("downscale", lambda ctx: self._preprocess(
+                cv2.resize(ctx.frame, None, fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA))),
+            ("invert", lambda ctx: cv2.bitwise_not(ctx.get("enhanced"))),
+        ]
 
-        # ------------------------------------------------------------
-        # 3) ORIGINAL FULL PIPELINE (như code của bạn)
-        # ------------------------------------------------------------
+        available = [name for name, _ in stages]
+        names, unknown = parse_stage_names(config.BARCODE_STAGES, available)
+        if unknown:
+            logger.warning("Unknown barcode stages ignored: %s (available: %s)", unknown, available)
+        prepare = dict(stages)
+        return [CascadeStage(name, prepare[name]) for name in names]
 
-        # 3.1 grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        decoded = self._perform_decode(gray)
-        if decoded:
-            logger.info(f"Detected barcode on grayscale frame: {[d.code for d in decoded]}")
-            return decoded
-
-        # 3.2 preprocess
-        enhanced = self._preprocess(frame)
-        decoded = self._perform_decode(enhanced)
-        if decoded:
-            logger.info(f"Detected barcode after preprocessing: {[d.code for d in decoded]}")
-            return decoded
-
-        # 3.3 sharpen
-        sharpened = self._sharpen(enhanced)
-        decoded = self._perform_decode(sharpened)
-        if decoded:
-            logger.info(f"Detected barcode after sharpening: {[d.code for d in decoded]}")
-            return decoded
-
-        # 3.4 adaptive threshold
-        adaptive = self._adaptive_threshold(enhanced)
-        decoded = self._perform_decode(adaptive)
-        if decoded:
-            logger.info(f"Detected barcode after adaptive threshold: {[d.code for d in decoded]}")
-            return decoded
-
-        # 3.5 Otsu
-        binary = self._binary_threshold(enhanced)
-        decoded = self._perform_decode(binary)
-        if decoded:
-            logger.info(f"Detected barcode after binary threshold: {[d.code for d in decoded]}")
-            return decoded
-
-        # 3.6 morphological
-        morphed = self._morphological_operations(enhanced)
-        decoded = self._perform_decode(morphed)
-        if decoded:
-            logger.info(f"Detected barcode after morphological ops: {[d.code for d in decoded]}")
-            return decoded
-
-        # 3.7 high contrast
-        high_contrast = self._increase_contrast(enhanced)
-        decoded = self._perform_decode(high_contrast)
-        if decoded:
-            logger.info(f"Detected barcode after high contrast: {[d.code for d in decoded]}")
-            return decoded
-
-        # 3.8 resize up
-        resized_up = cv2.resize(frame, None, fx=2.0, fy=2.0, interpolation=cv2.INTER_CUBIC)
-        enhanced_up = self._preprocess(resized_up)
-        decoded = self._perform_decode(enhanced_up)
-        if decoded:
-            logger.info(f"Detected barcode after scaling up: {[d.code for d in decoded]}")
-            return decoded
-
-        # 3.9 resize down
-        resized_down = cv2.resize(frame, None, fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA)
-        enhanced_down = self._preprocess(resized_down)
-        decoded = self._perform_decode(enhanced_down)
-        if decoded:
-            logger.info(f"Detected barcode after scaling down: {[d.code for d in decoded]}")
-            return decoded
-
-        # 3.10 invert
-        inverted = cv2.bitwise_not(enhanced)
-        decoded = self._perform_decode(inverted)
-        if decoded:
-            logger.info(f"Detected barcode after invert: {[d.code for d in decoded]}")
-            return decoded
-
-        logger.info("[BARCODE] No barcode detected after all methods")
-        return []
+    def get_stats(self) -> Dict[str, Any]:
+        return self._cascade.get_stats()
 
     def _decode_barcodes_2(self, frame: np.ndarray) -> List[str]:
         decoded_objects = zbar_decode(frame)
@@ -448,18 +438,22 @@ class BarcodeScannerService:
 
     def _preprocess(self, frame: np.ndarray) -> np.ndarray:
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return self._enhance_gray(gray)
+
+    def _enhance_gray(self, gray: np.ndarray) -> np.ndarray:
         clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
         equalised = clahe.apply(gray)
         blurred = cv2.GaussianBlur(equalised, (5, 5), 0)
         return blurred
     
-    def _extract_and_warp_barcode(self, img: np.ndarray) -> Optional[np.ndarray]:
+    def _extract_and_warp_barcode(self, img: np.ndarray, gray: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
         """
         Tự động tìm vùng barcode bằng Sobel gradient theo X,
         sau đó warp vùng đó thành hình chữ nhật thẳng.
         """
 
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        if gray is None:
+            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
 
         # 1) nhấn mạnh gradient theo chiều X (barcode có vạch dọc)
         gradX = cv2.Sobel(gray, ddepth=cv2.CV_32F, dx=1, dy=0, ksize=3)
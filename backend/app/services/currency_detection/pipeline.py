@@ -3,6 +3,9 @@ import json
 import os
 import requests
 
+from app.config import config
+from app.utils.image_prep import prepare_image
+
 def detect_currency(image_bytes):
     """
     Detect currency in an image byte stream using Gemini API (direct HTTP)
@@ -19,7 +22,9 @@ def detect_currency(image_bytes):
         if not gemini_api_key:
             return {"error": "GOOGLE_API_KEY is missing in environment variables"}
 
-        # Encode image to base64
+        # Resize / re-encode for the model, then encode to base64
+        if config.LLM_IMAGE_PREP:
+            image_bytes = prepare_image(image_bytes, "currency_detection").data
         base64_image = base64.b64encode(image_bytes).decode("utf-8")
         
         # Prepare Gemini API request - using thinking model for better accuracy
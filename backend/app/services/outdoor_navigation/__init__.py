@@ -11,6 +11,7 @@ from app.services.outdoor_navigation.turn_classification import (
     TurnClassification,
     LABELS as TURN_LABELS
 )
+from app.services.outdoor_navigation.model_registry import ModelRegistry, model_registry
 from app.services.outdoor_navigation.pipeline import OutdoorNavigationPipeline
 from app.services.outdoor_navigation.websocket_server import (
     websocket_outdoor_navigation,
@@ -25,6 +26,8 @@ __all__ = [
     "SidewalkClassification",
     "TurnClassification",
     "OutdoorNavigationPipeline",
+    "ModelRegistry",
+    "model_registry",
     
     # Constants
     "SIDEWALK_CLASSES",
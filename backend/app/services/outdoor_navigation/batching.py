@@ -0,0 +1,144 @@
+"""
+Cross-session micro-batching for navigation model inference.
+Frames from all active sessions are collected for a short window and
+run through the model in a single batched forward pass.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict
+
+import numpy as np
+
+DEFAULT_MAX_BATCH_SIZE = 8
+DEFAULT_MAX_WAIT_MS = 10
+STATS_WINDOW = 1000  # Number of recent frames/batches kept for statistics
+
+
+class BatchInferenceServer:
+    """
+    Runs one model on a dedicated worker thread.
+
+    Sessions call submit() with a single preprocessed frame (100, 100, 3)
+    and get a Future resolving to that frame's class probabilities (a tuple
+    of per-output probabilities for multi-output models). The worker
+    waits at most max_wait_ms after the first queued frame for the batch to
+    fill up to max_batch_size before running inference.
+    """
+
+    def __init__(self, name: str, predict_fn: Callable[[np.ndarray], np.ndarray],
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+        self.name = name
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._running = True
+
+        # Statistics
+        self._stats_lock = threading.Lock()
+        self._latencies = deque(maxlen=STATS_WINDOW)
+        self._batch_sizes = deque(maxlen=STATS_WINDOW)
+        self._total_frames = 0
+        self._total_batches = 0
+
+        self._thread = threading.Thread(target=self._run, name=f"batcher-{name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, frame: np.ndarray) -> Future:
+        """Queue one preprocessed frame for the next batch"""
+        future = Future()
+        if not self._running:
+            future.set_exception(RuntimeError(f"Batcher '{self.name}' is stopped"))
+            return future
+        self._queue.put((frame, future, time.perf_counter()))
+        return future
+
+    def stop(self):
+        """Stop the worker thread; pending frames are failed"""
+        self._running = False
+        self._queue.put(None)
+        self._thread.join(timeout=1)
+
+    def _run(self):
+        while self._running:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._running = False
+                    break
+                batch.append(item)
+
+            self._run_batch(batch)
+
+        # Fail anything still waiting so callers do not block forever
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[1].set_exception(RuntimeError(f"Batcher '{self.name}' is stopped"))
+
+    def _run_batch(self, batch):
+        inputs = np.stack([frame for frame, _, _ in batch])
+        try:
+            outputs = self.predict_fn(inputs)
+        except Exception as e:
+            print(f"[Batcher:{self.name}] Inference failed: {e}")
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        if isinstance(outputs, (list, tuple)):
+            # Multi-output model: each frame gets a tuple with one row per output
+            outputs = list(zip(*outputs))
+
+        done = time.perf_counter()
+        for (_, future, submitted), output in zip(batch, outputs):
+            future.set_result(output)
+
+        with self._stats_lock:
+            self._latencies.extend(done - submitted for _, _, submitted in batch)
+            self._batch_sizes.append(len(batch))
+            self._total_frames += len(batch)
+            self._total_batches += 1
+
+    def get_stats(self) -> Dict:
+        """Latency percentiles (queue wait + inference) and batch-fill statistics"""
+        with self._stats_lock:
+            latencies = np.array(self._latencies) * 1000.0
+            batch_sizes = np.array(self._batch_sizes)
+            total_frames = self._total_frames
+            total_batches = self._total_batches
+
+        stats = {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "total_frames": total_frames,
+            "total_batches": total_batches,
+            "queue_depth": self._queue.qsize(),
+        }
+        if len(latencies):
+            stats["latency_p50_ms"] = round(float(np.percentile(latencies, 50)), 2)
+            stats["latency_p99_ms"] = round(float(np.percentile(latencies, 99)), 2)
+        if len(batch_sizes):
+            mean_batch = float(batch_sizes.mean())
+            stats["mean_batch_size"] = round(mean_batch, 2)
+            stats["batch_fill_ratio"] = round(mean_batch / self.max_batch_size, 3)
+        return stats
@@ -0,0 +1,178 @@
+"""
+Combined navigation model: one forward pass per frame yields both the
+sidewalk position and the turn probabilities.
+
+The existing heads were trained on different backbones (VGG16 features for
+the sidewalk head, ResNet152 features for the turn head), so they cannot be
+placed on a single backbone as-is. Two variants are provided:
+
+- Shared backbone: the sidewalk VGG16 backbone feeds both the original
+  sidewalk head and a turn head distilled from the ResNet152 turn model.
+  Loaded from COMBINED_WEIGHTS_PATH (created with `--build`).
+- Fused: both original models wrapped in a single graph with two outputs.
+  Used when no combined weights file exists; outputs are identical to the
+  separate models but the backbone compute is not shared, so it is no
+  faster than NAVIGATION_MODEL_MODE=separate.
+
+The combined mode only saves a backbone once the weights file has been
+built (from the backend directory):
+    python -m app.services.outdoor_navigation.combined_model --build
+"""
+
+import argparse
+import logging
+import os
+
+import numpy as np
+import tensorflow as tf
+
+from app.services.outdoor_navigation import sidewalk_classification
+from app.services.outdoor_navigation.sidewalk_classification import SidewalkClassification
+from app.services.outdoor_navigation.turn_classification import TurnClassification
+from app.services.outdoor_navigation.utils.frame_sampling import (
+    EXAMPLE_VIDEO_DIR,
+    list_example_videos,
+    sample_video_frames,
+)
+
+COMBINED_WEIGHTS_PATH = r"app/models/navigation_combined_vgg16.weights.h5"
+SIDEWALK_HEAD = "dense"  # Same name as in the sidewalk H5 file
+TURN_HEAD = "turn_dense"
+FEATURES_LAYER = "global_average_pooling2d"
+
+# The last 20% of every example video is never used for distillation; the
+# turn head agreement (and benchmark_combined_model.py) is measured on it
+HOLDOUT_FRACTION = 0.2
+
+VARIANT_SHARED = "shared_backbone"
+VARIANT_FUSED = "fused"
+
+logger = logging.getLogger(__name__)
+
+
+def build_shared_backbone_model():
+    """VGG16 backbone + GAP feeding both the sidewalk head and the turn head"""
+    base = tf.keras.applications.VGG16(
+        include_top=False,
+        weights=None,  # All weights come from H5 files
+        input_shape=(100, 100, 3)
+    )
+
+    x = base.output
+    x = tf.keras.layers.GlobalAveragePooling2D(name=FEATURES_LAYER)(x)
+    sidewalk = tf.keras.layers.Dense(3, activation="softmax", name=SIDEWALK_HEAD)(x)
+    turn = tf.keras.layers.Dense(3, activation="softmax", name=TURN_HEAD)(x)
+
+    return tf.keras.Model(inputs=base.input, outputs=[sidewalk, turn], name="navigation_combined")
+
+
+def build_fused_model(sidewalk_model=None, turn_model=None):
+    """Single graph running both original models; outputs [sidewalk, turn]"""
+    sidewalk_model = sidewalk_model or SidewalkClassification.load_model()
+    turn_model = turn_model or TurnClassification.load_model()
+
+    inputs = tf.keras.Input(shape=(100, 100, 3))
+    return tf.keras.Model(
+        inputs=inputs,
+        outputs=[sidewalk_model(inputs), turn_model(inputs)],
+        name="navigation_fused"
+    )
+
+
+def combined_variant(weights_path=COMBINED_WEIGHTS_PATH):
+    """Variant load_combined_model returns for this weights file"""
+    return VARIANT_SHARED if weights_path and os.path.exists(weights_path) else VARIANT_FUSED
+
+
+def load_combined_model(weights_path=COMBINED_WEIGHTS_PATH):
+    """Load the shared-backbone model, or fall back to the fused model"""
+    if combined_variant(weights_path) == VARIANT_SHARED:
+        print("[Combined] Loading shared-backbone model...")
+        model = build_shared_backbone_model()
+        model.load_weights(weights_path)
+        print("[Combined] Model ready")
+        return model
+
+    logger.warning(
+        "[Combined] %s not found: falling back to the fused model, which still runs both backbones. "
+        "Build the weights with: python -m app.services.outdoor_navigation.combined_model --build",
+        weights_path,
+    )
+    return build_fused_model()
+
+
+def training_frames(videos, max_frames=2000, stride=2):
+    """Distillation frames: everything but the held-out tail of each video"""
+    return sample_video_frames(videos, max_frames=max_frames, stride=stride, end_fraction=1.0 - HOLDOUT_FRACTION)
+
+
+def holdout_frames(videos, max_frames=200, stride=5):
+    """Evaluation frames from the held-out tail of each video"""
+    return sample_video_frames(videos, max_frames=max_frames, stride=stride, start_fraction=1.0 - HOLDOUT_FRACTION)
+
+
+def distill_turn_head(model, turn_model, frames, eval_frames, epochs=50, batch_size=32):
+    """
+    Train the turn head of a shared-backbone model to reproduce the
+    ResNet152 turn model's probabilities on the given frames. Only the
+    3-class dense head is trained; the backbone stays frozen. Returns the
+    argmax agreement with the turn model on eval_frames (held out).
+    """
+    extractor = tf.keras.Model(inputs=model.input, outputs=model.get_layer(FEATURES_LAYER).output)
+
+    def features_and_targets(sample):
+        inputs = np.stack([SidewalkClassification.preprocess_frame(frame)[0] for frame in sample])
+        return (extractor.predict(inputs, batch_size=batch_size, verbose=0),
+                turn_model.predict(inputs, batch_size=batch_size, verbose=0))
+
+    features, targets = features_and_targets(frames)
+    eval_features, eval_targets = features_and_targets(eval_frames)
+
+    head_input = tf.keras.Input(shape=features.shape[1:])
+    head = tf.keras.layers.Dense(3, activation="softmax")
+    student = tf.keras.Model(head_input, head(head_input))
+    student.compile(optimizer=tf.keras.optimizers.Adam(1e-3), loss="categorical_crossentropy")
+    student.fit(features, targets, epochs=epochs, batch_size=batch_size, verbose=0)
+
+    model.get_layer(TURN_HEAD).set_weights(head.get_weights())
+
+    agreement = np.mean(
+        np.argmax(student.predict(eval_features, verbose=0), axis=1) == np.argmax(eval_targets, axis=1)
+    )
+    print(f"[Combined] Distilled turn head on {len(frames)} frames, "
+          f"agreement on {len(eval_frames)} held-out frames {agreement * 100:.1f}%")
+    return agreement
+
+
+def build_combined_weights(video_dir=EXAMPLE_VIDEO_DIR, weights_path=COMBINED_WEIGHTS_PATH, max_frames=2000):
+    """Create the combined weights file from the two existing H5 files"""
+    videos = list_example_videos(video_dir)
+    if not videos:
+        raise RuntimeError(f"No .mp4 files found in {video_dir}")
+    frames = training_frames(videos, max_frames=max_frames)
+    eval_frames = holdout_frames(videos)
+    if not frames or not eval_frames:
+        raise RuntimeError(f"Could not sample training and held-out frames from {video_dir}")
+
+    model = build_shared_backbone_model()
+    # Backbone + sidewalk head come straight from the sidewalk model
+    SidewalkClassification.load_custom_dense(model, sidewalk_classification.MODEL_PATH)
+    distill_turn_head(model, TurnClassification.load_model(), frames, eval_frames)
+
+    model.save_weights(weights_path)
+    print(f"[Combined] Saved weights to {weights_path}")
+    return model
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the combined navigation model weights")
+    parser.add_argument("--build", action="store_true", help="Distill and save the combined weights file")
+    parser.add_argument("--video-dir", default=EXAMPLE_VIDEO_DIR)
+    parser.add_argument("--output", default=COMBINED_WEIGHTS_PATH)
+    parser.add_argument("--frames", type=int, default=2000)
+    args = parser.parse_args()
+
+    if args.build:
+        build_combined_weights(args.video_dir, args.output, args.frames)
+    else:
+        parser.print_help()
@@ -0,0 +1,148 @@
+"""
+Export the navigation classifiers to ONNX and/or TFLite for the CPU-optimized
+inference backends (see inference.py), or to an INT8 post-training quantized
+TFLite model calibrated on frames from the example videos.
+
+Run from the backend directory:
+    python -m app.services.outdoor_navigation.export --format onnx tflite int8
+"""
+
+import argparse
+import os
+
+import numpy as np
+import tensorflow as tf
+
+from app.services.outdoor_navigation import sidewalk_classification, turn_classification
+from app.services.outdoor_navigation.inference import INPUT_SHAPE
+from app.services.outdoor_navigation.sidewalk_classification import SidewalkClassification
+from app.services.outdoor_navigation.turn_classification import TurnClassification
+from app.services.outdoor_navigation.utils.frame_sampling import (
+    EXAMPLE_VIDEO_DIR,
+    list_example_videos,
+    sample_video_frames,
+)
+
+try:
+    import tf2onnx
+except ImportError:  # pragma: no cover - optional dependency
+    tf2onnx = None
+
+EXPORT_DIR = r"app/models/exported"
+EXPORT_FORMATS = ("onnx", "tflite")  # Float exports, numerically equivalent to Keras
+QUANTIZED_FORMAT = "int8"
+EXPORT_EXTENSIONS = {"onnx": ".onnx", "tflite": ".tflite", QUANTIZED_FORMAT: "_int8.tflite"}
+CALIBRATION_FRAMES = 200
+
+MODEL_LOADERS = {
+    "sidewalk": SidewalkClassification.load_model,
+    "turn": TurnClassification.load_model,
+}
+# Source weights of each model; exported artifacts older than these are stale
+MODEL_SOURCES = {
+    "sidewalk": sidewalk_classification.MODEL_PATH,
+    "turn": turn_classification.MODEL_PATH,
+}
+
+
+def exported_model_path(name, fmt, export_dir=EXPORT_DIR):
+    """Path of an exported artifact, e.g. app/models/exported/turn.onnx"""
+    return os.path.join(export_dir, f"{name}{EXPORT_EXTENSIONS[fmt]}")
+
+
+def is_export_stale(name, path):
+    """True if the artifact is missing or older than the model's H5 file"""
+    if not os.path.exists(path):
+        return True
+    source = MODEL_SOURCES.get(name)
+    return source is not None and os.path.exists(source) and os.path.getmtime(source) > os.path.getmtime(path)
+
+
+def _input_signature():
+    return [tf.TensorSpec(shape=(None, *INPUT_SHAPE), dtype=tf.float32, name="input")]
+
+
+def export_onnx(model, output_path, opset=13):
+    """Convert a Keras model (after load_custom_dense) to ONNX"""
+    if tf2onnx is None:
+        raise RuntimeError("ONNX export requires tf2onnx (pip install tf2onnx)")
+
+    forward = tf.function(lambda x: model(x, training=False), input_signature=_input_signature())
+    tf2onnx.convert.from_function(forward, input_signature=_input_signature(), opset=opset, output_path=output_path)
+    return output_path
+
+
+def export_tflite(model, output_path, representative_dataset=None):
+    """
+    Convert a Keras model to TFLite (float32). With a representative dataset
+    the model is fully quantized to INT8 weights and activations.
+    """
+    forward = tf.function(lambda x: model(x, training=False), input_signature=_input_signature())
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([forward.get_concrete_function()], model)
+
+    if representative_dataset is not None:
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        # Keep float32 input/output so callers don't have to (de)quantize
+        converter.inference_input_type = tf.float32
+        converter.inference_output_type = tf.float32
+
+    with open(output_path, "wb") as f:
+        f.write(converter.convert())
+    return output_path
+
+
+def calibration_dataset(frames):
+    """Representative dataset for INT8 calibration: preprocessed frames, one at a time"""
+    def generator():
+        for frame in frames:
+            yield [SidewalkClassification.preprocess_frame(frame).astype(np.float32)]
+    return generator
+
+
+def export_int8(name, output_path, video_dir=EXAMPLE_VIDEO_DIR, calibration_frames=CALIBRATION_FRAMES, model=None):
+    """Quantize a navigation model to INT8, calibrated on the example videos"""
+    if model is None and name not in MODEL_LOADERS:
+        raise ValueError(f"INT8 export supports {', '.join(MODEL_LOADERS)}, not {name!r}")
+
+    videos = list_example_videos(video_dir)
+    if not videos:
+        raise RuntimeError(f"INT8 calibration needs example videos, but no .mp4 files were found in {video_dir}")
+
+    frames = sample_video_frames(videos, max_frames=calibration_frames)
+    print(f"[Export] Calibrating {name} on {len(frames)} frames from {len(videos)} videos")
+
+    model = model or MODEL_LOADERS[name]()
+    return export_tflite(model, output_path, representative_dataset=calibration_dataset(frames))
+
+
+def export_models(names=tuple(MODEL_LOADERS), formats=EXPORT_FORMATS, export_dir=EXPORT_DIR):
+    """Export each navigation model in each format; returns the written paths"""
+    os.makedirs(export_dir, exist_ok=True)
+    written = []
+
+    for name in names:
+        model = MODEL_LOADERS[name]()
+        for fmt in formats:
+            path = exported_model_path(name, fmt, export_dir)
+            print(f"[Export] {name} -> {path}")
+            if fmt == "onnx":
+                export_onnx(model, path)
+            elif fmt == QUANTIZED_FORMAT:
+                export_int8(name, path, model=model)
+            else:
+                export_tflite(model, path)
+            written.append(path)
+
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export navigation models to ONNX / TFLite")
+    parser.add_argument("--format", nargs="+", choices=[*EXPORT_FORMATS, QUANTIZED_FORMAT], default=list(EXPORT_FORMATS))
+    parser.add_argument("--models", nargs="+", choices=list(MODEL_LOADERS), default=list(MODEL_LOADERS))
+    parser.add_argument("--output-dir", default=EXPORT_DIR)
+    args = parser.parse_args()
+
+    export_models(args.models, args.format, args.output_dir)
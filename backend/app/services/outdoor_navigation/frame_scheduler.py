@@ -0,0 +1,134 @@
+"""
+Adaptive inference scheduling for outdoor navigation sessions.
+Decides per frame whether to run the models or reuse the latest guidance,
+based on cheap motion estimates, time since the last inference and server load.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+import cv2
+import numpy as np
+
+THUMBNAIL_SIZE = (32, 24)  # (width, height) used for motion estimates
+FPS_WINDOW = 5.0  # Seconds over which effective FPS is measured
+LOAD_BACKOFF = 2.0  # Minimum interval grows by this factor per unit of load
+
+
+class InferenceLoadTracker:
+    """Counts navigation inferences in flight across all sessions"""
+
+    def __init__(self, capacity: Optional[int] = None):
+        self.capacity = capacity or os.cpu_count() or 1
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self):
+        with self._lock:
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def load(self) -> float:
+        """In-flight inferences relative to CPU capacity (1.0 = saturated)"""
+        return self._in_flight / self.capacity
+
+
+inference_load = InferenceLoadTracker()
+
+
+class AdaptiveInferenceScheduler:
+    """
+    Per-session frame-skipping policy.
+
+    A frame is inferred when:
+    - no frame has been inferred yet, or
+    - max_interval has passed since the last inference, or
+    - the scene moved (thumbnail difference >= motion_threshold) and at least
+      min_interval has passed. min_interval grows with server load.
+    """
+
+    def __init__(self, min_interval: float = 0.1, max_interval: float = 0.5,
+                 motion_threshold: float = 0.04, load_fn: Optional[Callable[[], float]] = None):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.motion_threshold = motion_threshold
+        self.load_fn = load_fn or inference_load.load
+
+        self._last_thumbnail = None
+        self._last_inference_time = 0.0
+        self._inference_times = deque()
+        self._frame_times = deque()
+        self.frames_received = 0
+        self.frames_inferred = 0
+        self.last_motion = 0.0
+
+    @staticmethod
+    def _thumbnail(frame: np.ndarray) -> np.ndarray:
+        small = cv2.resize(frame, THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small
+
+    def _intervals(self):
+        load = max(0.0, self.load_fn())
+        min_interval = self.min_interval * (1.0 + LOAD_BACKOFF * load)
+        return min_interval, max(self.max_interval, min_interval)
+
+    def should_infer(self, frame: np.ndarray, now: Optional[float] = None) -> bool:
+        """Decide whether to run inference on this frame (records it if so)"""
+        now = time.time() if now is None else now
+        self.frames_received += 1
+        self._frame_times.append(now)
+
+        thumbnail = self._thumbnail(frame)
+        elapsed = now - self._last_inference_time
+        min_interval, max_interval = self._intervals()
+
+        if self._last_thumbnail is None:
+            run = True
+        else:
+            # Mean absolute difference in [0, 1]
+            self.last_motion = float(cv2.absdiff(thumbnail, self._last_thumbnail).mean()) / 255.0
+            run = elapsed >= max_interval or (
+                elapsed >= min_interval and self.last_motion >= self.motion_threshold
+            )
+
+        if run:
+            self._last_thumbnail = thumbnail
+            self._last_inference_time = now
+            self._inference_times.append(now)
+            self.frames_inferred += 1
+
+        self._trim(now)
+        return run
+
+    def _trim(self, now: float):
+        for times in (self._inference_times, self._frame_times):
+            while times and now - times[0] > FPS_WINDOW:
+                times.popleft()
+
+    def inference_fps(self) -> float:
+        """Effective inference FPS over the last FPS_WINDOW seconds"""
+        return len(self._inference_times) / FPS_WINDOW
+
+    def get_stats(self) -> Dict:
+        return {
+            "inference_fps": round(self.inference_fps(), 2),
+            "input_fps": round(len(self._frame_times) / FPS_WINDOW, 2),
+            "frames_received": self.frames_received,
+            "frames_inferred": self.frames_inferred,
+            "last_motion": round(self.last_motion, 4),
+        }
@@ -0,0 +1,159 @@
+"""
+Admission control and resource governor for navigation WebSocket sessions.
+
+- Caps concurrent sessions; extra clients wait in a FIFO queue (told their
+  position) for up to queue_timeout seconds, or are rejected right away when
+  the queue is full.
+- Caps inferences in flight across all sessions; a session whose frame
+  cannot get a slot drops it instead of queuing more work.
+- Degrades gracefully: once session or inference occupancy passes
+  degrade_threshold, load() rises towards 1.0 and every session's adaptive
+  scheduler stretches its inference interval (see frame_scheduler.py).
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional
+
+from app.config import config
+from app.services.outdoor_navigation.frame_scheduler import inference_load
+
+QUEUE_POLL_INTERVAL = 0.25  # Seconds between admission checks while queued
+
+
+class SessionGovernor:
+    """Session admission + global in-flight inference budget"""
+
+    def __init__(self, max_sessions: int = 8, max_queued: int = 4, queue_timeout: float = 30.0,
+                 max_in_flight: int = 4, degrade_threshold: float = 0.75):
+        self.max_sessions = max(1, max_sessions)
+        self.max_queued = max(0, max_queued)
+        self.queue_timeout = queue_timeout
+        self.max_in_flight = max(1, max_in_flight)
+        self.degrade_threshold = min(max(degrade_threshold, 0.0), 0.99)
+
+        # Plain lock (not asyncio) so counters are safe from worker threads
+        # and from any event loop
+        self._lock = threading.Lock()
+        self._queue = deque()
+        self.active_sessions = 0
+        self.in_flight = 0
+
+        self.admitted = 0
+        self.queued_total = 0
+        self.rejected_full = 0
+        self.rejected_timeout = 0
+        self.frames_shed = 0
+
+    # ============================================================
+    # Sessions
+    # ============================================================
+    async def admit(self, on_queued: Optional[Callable[[int], Awaitable]] = None) -> bool:
+        """
+        Wait for a session slot. Returns False if the client is rejected
+        (queue full or queue_timeout expired). on_queued(position) is awaited
+        whenever the client's 1-based queue position changes. Cancelling the
+        call (client gone) gives up the queue place.
+        """
+        with self._lock:
+            if self.active_sessions < self.max_sessions and not self._queue:
+                self.active_sessions += 1
+                self.admitted += 1
+                return True
+            if len(self._queue) >= self.max_queued:
+                self.rejected_full += 1
+                return False
+            ticket = object()
+            self._queue.append(ticket)
+            self.queued_total += 1
+
+        deadline = time.monotonic() + self.queue_timeout
+        last_position = None
+        try:
+            while True:
+                with self._lock:
+                    position = self._queue.index(ticket)
+                    if position == 0 and self.active_sessions < self.max_sessions:
+                        self._queue.popleft()
+                        self.active_sessions += 1
+                        self.admitted += 1
+                        return True
+
+                if time.monotonic() >= deadline:
+                    with self._lock:
+                        self.rejected_timeout += 1
+                    return False
+
+                if on_queued is not None and position != last_position:
+                    last_position = position
+                    await on_queued(position + 1)
+                await asyncio.sleep(QUEUE_POLL_INTERVAL)
+        finally:
+            # Timed out or the client went away while waiting
+            with self._lock:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+
+    def release(self):
+        """Free the slot of an admitted session"""
+        with self._lock:
+            self.active_sessions = max(0, self.active_sessions - 1)
+
+    # ============================================================
+    # Inference budget
+    # ============================================================
+    def try_begin_inference(self) -> bool:
+        """Reserve an in-flight inference slot (False = drop this frame)"""
+        with self._lock:
+            if self.in_flight >= self.max_in_flight:
+                self.frames_shed += 1
+                return False
+            self.in_flight += 1
+            return True
+
+    def end_inference(self):
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+
+    # ============================================================
+    # Degradation
+    # ============================================================
+    def occupancy(self) -> float:
+        return max(self.active_sessions / self.max_sessions, self.in_flight / self.max_in_flight)
+
+    def load(self) -> float:
+        """
+        Load signal for the adaptive schedulers: CPU load from in-flight
+        inferences, raised to 1.0 as occupancy goes from degrade_threshold to full.
+        """
+        pressure = (self.occupancy() - self.degrade_threshold) / (1.0 - self.degrade_threshold)
+        return max(inference_load.load(), min(1.0, max(0.0, pressure)))
+
+    def get_stats(self) -> Dict:
+        return {
+            "active_sessions": self.active_sessions,
+            "max_sessions": self.max_sessions,
+            "queued": len(self._queue),
+            "max_queued": self.max_queued,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "occupancy": round(self.occupancy(), 3),
+            "load": round(self.load(), 3),
+            "degraded": self.occupancy() > self.degrade_threshold,
+            "admitted": self.admitted,
+            "queued_total": self.queued_total,
+            "rejected_full": self.rejected_full,
+            "rejected_timeout": self.rejected_timeout,
+            "frames_shed": self.frames_shed,
+        }
+
+
+navigation_governor = SessionGovernor(
+    max_sessions=config.NAVIGATION_MAX_SESSIONS,
+    max_queued=config.NAVIGATION_MAX_QUEUED_SESSIONS,
+    queue_timeout=config.NAVIGATION_QUEUE_TIMEOUT,
+    max_in_flight=config.NAVIGATION_MAX_IN_FLIGHT,
+    degrade_threshold=config.NAVIGATION_DEGRADE_THRESHOLD,
+)
@@ -0,0 +1,155 @@
+"""
+Temporal-consistency layer between per-frame guidance and what the user hears.
+
+The pipeline produces a guidance string for every inferred frame; sending
+each one makes the client re-render (and possibly re-speak) at the frame
+rate and lets a single misclassified frame flip the instruction.
+GuidanceStateMachine only switches to a new guidance after it has been seen
+on `confirm_frames` consecutive inferred frames (hysteresis) and the current
+guidance has been active for `min_dwell` seconds. Clients are sent a
+"change" event when the stable guidance switches and a "heartbeat" event
+when nothing has been sent for `heartbeat_interval` seconds.
+"""
+
+import math
+import time
+from typing import Dict, Iterable, Optional
+
+EVENT_CHANGE = "change"
+EVENT_HEARTBEAT = "heartbeat"
+
+EMIT_CHANGES = "changes"  # Send change + heartbeat events only
+EMIT_ALL = "all"  # Send every processed frame (previous behaviour)
+
+# Guidance that needs immediate action; skips the min_dwell wait
+# (still needs confirm_frames so a single bad frame cannot trigger it)
+URGENT_GUIDANCE = frozenset({
+    "Turn left ahead",
+    "Turn right ahead",
+    "Caution: No sidewalk detected",
+})
+
+# Lower bounds for client-supplied settings; a shorter heartbeat interval
+# would send a message on every inferred frame
+MIN_DWELL = 0.0
+MIN_CONFIRM_FRAMES = 1
+MIN_HEARTBEAT_INTERVAL = 1.0
+
+
+def _setting(name: str, value, minimum, cast=float):
+    """Parse a setting, clamped to minimum; ValueError if it is not a finite number"""
+    try:
+        number = cast(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"{name} must be a number, got {value!r}") from None
+    if not math.isfinite(number):
+        raise ValueError(f"{name} must be finite, got {value!r}")
+    return max(minimum, number)
+
+
+class GuidanceStateMachine:
+    """Stable guidance state with hysteresis, minimum dwell and heartbeats"""
+
+    def __init__(self, min_dwell: float = 1.0, confirm_frames: int = 3,
+                 heartbeat_interval: float = 5.0, urgent: Iterable[str] = URGENT_GUIDANCE):
+        self.min_dwell = _setting("min_dwell", min_dwell, MIN_DWELL)
+        self.confirm_frames = _setting("confirm_frames", confirm_frames, MIN_CONFIRM_FRAMES, int)
+        self.heartbeat_interval = _setting("heartbeat_interval", heartbeat_interval, MIN_HEARTBEAT_INTERVAL)
+        self.urgent = frozenset(urgent)
+
+        self.current: Optional[str] = None
+        self._state_since = 0.0
+        self._last_emit = 0.0
+        self._candidate: Optional[str] = None
+        self._candidate_count = 0
+
+        self.transitions = 0
+        self.heartbeats = 0
+        self.observations = 0
+        self.suppressed = 0
+
+    def configure(self, min_dwell: Optional[float] = None, confirm_frames: Optional[int] = None,
+                  heartbeat_interval: Optional[float] = None):
+        """
+        Change the thresholds of a running session (None keeps the value).
+        Values are clamped to their minimum; ValueError if one is not a
+        number, in which case nothing is changed.
+        """
+        if min_dwell is not None:
+            min_dwell = _setting("min_dwell", min_dwell, MIN_DWELL)
+        if confirm_frames is not None:
+            confirm_frames = _setting("confirm_frames", confirm_frames, MIN_CONFIRM_FRAMES, int)
+        if heartbeat_interval is not None:
+            heartbeat_interval = _setting("heartbeat_interval", heartbeat_interval, MIN_HEARTBEAT_INTERVAL)
+
+        if min_dwell is not None:
+            self.min_dwell = min_dwell
+        if confirm_frames is not None:
+            self.confirm_frames = confirm_frames
+        if heartbeat_interval is not None:
+            self.heartbeat_interval = heartbeat_interval
+
+    def update(self, guidance: str, now: Optional[float] = None) -> Optional[str]:
+        """
+        Feed the guidance of a newly inferred frame.
+        Returns EVENT_CHANGE, EVENT_HEARTBEAT or None (nothing to send).
+        """
+        now = time.time() if now is None else now
+        self.observations += 1
+
+        if self.current is None:
+            return self._switch(guidance, now)
+
+        if guidance == self.current:
+            self._candidate = None
+            self._candidate_count = 0
+        elif guidance == self._candidate:
+            self._candidate_count += 1
+        else:
+            self._candidate = guidance
+            self._candidate_count = 1
+
+        return self.tick(now)
+
+    def tick(self, now: Optional[float] = None) -> Optional[str]:
+        """
+        Advance timers without new evidence (e.g. a frame the scheduler skipped).
+        A confirmed candidate waiting on min_dwell switches here.
+        """
+        now = time.time() if now is None else now
+        if self.current is None:
+            return None
+
+        if self._candidate is not None and self._candidate_count >= self.confirm_frames:
+            dwell = 0.0 if self._candidate in self.urgent else self.min_dwell
+            if now - self._state_since >= dwell:
+                return self._switch(self._candidate, now)
+
+        if now - self._last_emit >= self.heartbeat_interval:
+            self._last_emit = now
+            self.heartbeats += 1
+            return EVENT_HEARTBEAT
+
+        self.suppressed += 1
+        return None
+
+    def _switch(self, guidance: str, now: float) -> str:
+        self.current = guidance
+        self._state_since = now
+        self._last_emit = now
+        self._candidate = None
+        self._candidate_count = 0
+        self.transitions += 1
+        return EVENT_CHANGE
+
+    def get_stats(self) -> Dict:
+        return {
+            "guidance": self.current,
+            "observations": self.observations,
+            "transitions": self.transitions,
+            "heartbeats": self.heartbeats,
+            "suppressed": self.suppressed,
+            "min_dwell": self.min_dwell,
+            "confirm_frames": self.confirm_frames,
+            "heartbeat_interval": self.heartbeat_interval,
+        }
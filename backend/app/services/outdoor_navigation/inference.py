@@ -0,0 +1,142 @@
+"""
+Inference backends for the navigation classifiers.
+Every backend exposes the same predict(batch, verbose=0) call as a Keras model,
+so classifiers and batching servers can use them interchangeably.
+"""
+
+import threading
+
+import numpy as np
+import tensorflow as tf
+
+try:
+    import onnxruntime as ort
+except ImportError:  # pragma: no cover - optional dependency
+    ort = None
+
+INFERENCE_MODE_PREDICT = "predict"
+INFERENCE_MODE_COMPILED = "compiled"
+INFERENCE_MODE_ONNX = "onnx"
+INFERENCE_MODE_TFLITE = "tflite"
+INFERENCE_MODE_INT8 = "int8"
+INFERENCE_MODES = (
+    INFERENCE_MODE_PREDICT,
+    INFERENCE_MODE_COMPILED,
+    INFERENCE_MODE_ONNX,
+    INFERENCE_MODE_TFLITE,
+    INFERENCE_MODE_INT8,
+)
+# Modes that run an exported artifact instead of the Keras model
+EXPORTED_MODES = (INFERENCE_MODE_ONNX, INFERENCE_MODE_TFLITE, INFERENCE_MODE_INT8)
+
+INPUT_SHAPE = (100, 100, 3)
+
+
+class CompiledKerasModel:
+    """
+    Calls a Keras model directly through a traced tf.function.
+
+    Keras `model.predict` builds a data adapter and callback list on every
+    call, which costs more than the forward pass itself for a single frame.
+    The fixed input signature (any batch size, 100x100x3 float32) means the
+    graph is traced exactly once, during warmup().
+    """
+
+    def __init__(self, model, input_shape=INPUT_SHAPE):
+        self.model = model
+        self.input_shape = tuple(input_shape)
+        self._forward = tf.function(
+            self._call_model,
+            input_signature=[tf.TensorSpec(shape=(None, *self.input_shape), dtype=tf.float32)],
+        )
+
+    def _call_model(self, inputs):
+        return self.model(inputs, training=False)
+
+    def warmup(self):
+        """Trace the graph and run one dummy frame"""
+        self.predict(np.zeros((1, *self.input_shape), dtype=np.float32))
+        return self
+
+    def predict(self, inputs, verbose=0):
+        # Same input cast that model.predict applies to uint8 frames
+        inputs = np.asarray(inputs, dtype=np.float32)
+        outputs = self._forward(inputs)
+        if isinstance(outputs, (list, tuple)):
+            return [output.numpy() for output in outputs]
+        return outputs.numpy()
+
+    def __getattr__(self, name):
+        # Expose the wrapped model's attributes (layers, get_layer, ...)
+        if name == "model":
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+
+class OnnxRuntimeModel:
+    """Runs an exported .onnx navigation model with ONNX Runtime on CPU"""
+
+    def __init__(self, model_path, intra_op_threads=0, inter_op_threads=0):
+        if ort is None:
+            raise RuntimeError("The onnx inference mode requires onnxruntime (pip install onnxruntime)")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # 0 lets ONNX Runtime pick the number of threads
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = inter_op_threads
+
+        self.model_path = model_path
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def predict(self, inputs, verbose=0):
+        outputs = self.session.run(None, {self.input_name: np.asarray(inputs, dtype=np.float32)})
+        return outputs[0] if len(outputs) == 1 else outputs
+
+
+class TFLiteModel:
+    """
+    Runs an exported .tflite navigation model with the TFLite interpreter.
+    The interpreter is not thread-safe, so calls are serialized.
+    """
+
+    def __init__(self, model_path, num_threads=None):
+        self.model_path = model_path
+        self.interpreter = tf.lite.Interpreter(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._outputs = self.interpreter.get_output_details()
+        self._batch_size = int(self._input["shape"][0])
+        self._lock = threading.Lock()
+
+    def predict(self, inputs, verbose=0):
+        inputs = np.asarray(inputs, dtype=np.float32)
+        with self._lock:
+            if inputs.shape[0] != self._batch_size:
+                self.interpreter.resize_tensor_input(self._input["index"], inputs.shape)
+                self.interpreter.allocate_tensors()
+                self._batch_size = inputs.shape[0]
+
+            self.interpreter.set_tensor(self._input["index"], inputs)
+            self.interpreter.invoke()
+            outputs = [self.interpreter.get_tensor(detail["index"]) for detail in self._outputs]
+        return outputs[0] if len(outputs) == 1 else outputs
+
+
+def load_exported_model(model_path, mode, intra_op_threads=0, inter_op_threads=0):
+    """Load an exported artifact for the onnx / tflite inference modes"""
+    if mode == INFERENCE_MODE_ONNX:
+        return OnnxRuntimeModel(model_path, intra_op_threads, inter_op_threads)
+    if mode in (INFERENCE_MODE_TFLITE, INFERENCE_MODE_INT8):
+        return TFLiteModel(model_path, num_threads=intra_op_threads or None)
+    raise ValueError(f"Not an exported inference mode: {mode} (expected one of {EXPORTED_MODES})")
+
+
+def wrap_model(model, mode=INFERENCE_MODE_PREDICT):
+    """Wrap a loaded Keras model for the requested inference mode"""
+    if mode == INFERENCE_MODE_PREDICT:
+        return model
+    if mode == INFERENCE_MODE_COMPILED:
+        return CompiledKerasModel(model).warmup()
+    raise ValueError(f"Unsupported inference mode: {mode} (expected one of {INFERENCE_MODES})")
@@ -0,0 +1,185 @@
+"""
+Process-wide model registry for outdoor navigation.
+Loads each classifier backbone once and shares it across WebSocket sessions.
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from app.config import config
+from app.services.outdoor_navigation import sidewalk_classification, turn_classification
+from app.services.outdoor_navigation.batching import BatchInferenceServer
+from app.services.outdoor_navigation.combined_model import combined_variant, load_combined_model
+from app.services.outdoor_navigation.export import export_int8, exported_model_path, is_export_stale
+from app.services.outdoor_navigation.inference import (
+    EXPORTED_MODES,
+    INFERENCE_MODE_INT8,
+    load_exported_model,
+    wrap_model,
+)
+from app.services.outdoor_navigation.sidewalk_classification import SidewalkClassification
+from app.services.outdoor_navigation.turn_classification import TurnClassification
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - optional dependency
+    psutil = None
+
+SIDEWALK_MODEL = "sidewalk"
+TURN_MODEL = "turn"
+COMBINED_MODEL = "combined"
+
+MODEL_MODE_SEPARATE = "separate"
+MODEL_MODE_COMBINED = "combined"
+
+
+def _current_rss_bytes() -> Optional[int]:
+    """Return the resident set size of this process, if it can be measured"""
+    if psutil is not None:
+        return psutil.Process(os.getpid()).memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class ModelRegistry:
+    """
+    Loads navigation models lazily (or eagerly via preload) and caches them
+    for the lifetime of the process. Sessions only own their smoothing state.
+    """
+
+    def __init__(self, inference_mode: Optional[str] = None):
+        self.inference_mode = inference_mode or config.NAVIGATION_INFERENCE_MODE
+        self._loaders: Dict[str, Callable] = {
+            SIDEWALK_MODEL: lambda: SidewalkClassification.load_model(sidewalk_classification.MODEL_PATH),
+            TURN_MODEL: lambda: TurnClassification.load_model(turn_classification.MODEL_PATH),
+            COMBINED_MODEL: lambda: load_combined_model(config.NAVIGATION_COMBINED_WEIGHTS),
+        }
+        self._models: Dict[str, object] = {}
+        self._stats: Dict[str, Dict] = {}
+        self._batchers: Dict[str, BatchInferenceServer] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str):
+        """Return the shared model, loading it on first use"""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        # Only one thread loads a given model; others wait for it
+        with self._lock:
+            if name not in self._models:
+                self._models[name] = self._load(name)
+            return self._models[name]
+
+    def _load(self, name: str):
+        if name not in self._loaders:
+            raise KeyError(f"Unknown navigation model: {name}")
+
+        rss_before = _current_rss_bytes()
+        start = time.time()
+        # Which combined model load_combined_model picks (shared backbone or fused fallback)
+        variant = combined_variant(config.NAVIGATION_COMBINED_WEIGHTS) if name == COMBINED_MODEL else None
+        if self.inference_mode in EXPORTED_MODES:
+            model = self._load_exported(name)
+        else:
+            model = wrap_model(self._loaders[name](), self.inference_mode)
+        load_time = time.time() - start
+        rss_after = _current_rss_bytes()
+
+        memory_mb = None
+        if rss_before is not None and rss_after is not None:
+            memory_mb = round((rss_after - rss_before) / (1024 * 1024), 1)
+
+        self._stats[name] = {
+            "load_time_s": round(load_time, 2),
+            "resident_memory_mb": memory_mb,
+            "inference_mode": self.inference_mode,
+            "loaded_at": time.time(),
+        }
+        if variant is not None:
+            self._stats[name]["variant"] = variant
+        print(f"[Registry] Loaded {name} model in {load_time:.2f}s (RSS +{memory_mb} MB)")
+        return model
+
+    def check_model_mode(self, model_mode: str):
+        """Reject model mode / inference mode pairs that can never load"""
+        if model_mode == MODEL_MODE_COMBINED and self.inference_mode in EXPORTED_MODES:
+            # export.py only writes (and quantizes) the separate sidewalk / turn classifiers
+            raise RuntimeError(
+                f"NAVIGATION_MODEL_MODE=combined is not available with NAVIGATION_INFERENCE_MODE="
+                f"{self.inference_mode}: there is no exported combined model. Use "
+                f"NAVIGATION_MODEL_MODE=separate, or the 'predict' / 'compiled' inference mode"
+            )
+
+    def _load_exported(self, name: str):
+        """Load the ONNX / TFLite artifact written by export.py instead of the Keras model"""
+        if name == COMBINED_MODEL:
+            self.check_model_mode(MODEL_MODE_COMBINED)
+        path = exported_model_path(name, self.inference_mode, config.NAVIGATION_EXPORT_DIR)
+        if self.inference_mode == INFERENCE_MODE_INT8 and is_export_stale(name, path):
+            # Quantize once and cache on disk; later boots reuse the file
+            os.makedirs(config.NAVIGATION_EXPORT_DIR, exist_ok=True)
+            export_int8(name, path, calibration_frames=config.NAVIGATION_CALIBRATION_FRAMES)
+        if not os.path.exists(path):
+            raise RuntimeError(
+                f"{path} not found. Export it first: "
+                f"python -m app.services.outdoor_navigation.export --format {self.inference_mode}"
+            )
+        return load_exported_model(
+            path,
+            self.inference_mode,
+            intra_op_threads=config.NAVIGATION_INTRA_OP_THREADS,
+            inter_op_threads=config.NAVIGATION_INTER_OP_THREADS,
+        )
+
+    def get_sidewalk_model(self):
+        return self.get(SIDEWALK_MODEL)
+
+    def get_turn_model(self):
+        return self.get(TURN_MODEL)
+
+    def get_batcher(self, name: str) -> BatchInferenceServer:
+        """Return the cross-session batching server for a model"""
+        batcher = self._batchers.get(name)
+        if batcher is not None:
+            return batcher
+
+        model = self.get(name)
+        with self._lock:
+            if name not in self._batchers:
+                self._batchers[name] = BatchInferenceServer(
+                    name,
+                    lambda batch: model.predict(batch, verbose=0),
+                    max_batch_size=config.NAVIGATION_MAX_BATCH_SIZE,
+                    max_wait_ms=config.NAVIGATION_MAX_BATCH_WAIT_MS,
+                )
+            return self._batchers[name]
+
+    def get_batcher_stats(self) -> Dict[str, Dict]:
+        return {name: batcher.get_stats() for name, batcher in self._batchers.items()}
+
+    def preload(self, model_mode: Optional[str] = None):
+        """Load the models used by the configured model mode (used at application startup)"""
+        model_mode = model_mode or config.NAVIGATION_MODEL_MODE
+        self.check_model_mode(model_mode)
+        names = [COMBINED_MODEL] if model_mode == MODEL_MODE_COMBINED else [SIDEWALK_MODEL, TURN_MODEL]
+        for name in names:
+            self.get(name)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Load time and resident memory per loaded model"""
+        return {
+            name: {"loaded": name in self._models, **self._stats.get(name, {})}
+            for name in self._loaders
+        }
+
+
+model_registry = ModelRegistry()
@@ -7,11 +7,33 @@ import cv2
 import numpy as np
 import threading
 import time
+from collections import deque
 from typing import Optional, Dict
 from concurrent.futures import ThreadPoolExecutor
 
 from app.services.outdoor_navigation.sidewalk_classification import SidewalkClassification
 from app.services.outdoor_navigation.turn_classification import TurnClassification
+from app.config import config
+from app.services.outdoor_navigation.frame_scheduler import AdaptiveInferenceScheduler, inference_load
+from app.services.outdoor_navigation.governor import navigation_governor
+from app.services.outdoor_navigation.guidance import GuidanceStateMachine
+from app.services.outdoor_navigation.model_registry import (
+    COMBINED_MODEL,
+    MODEL_MODE_COMBINED,
+    SIDEWALK_MODEL,
+    TURN_MODEL,
+    ModelRegistry,
+    model_registry,
+)
+
+STAGE_TIMING_WINDOW = 1000  # Latest per-stage latencies kept per session
+
+# Thread pool for running the two separate models in parallel, shared by all
+# sessions (each session has at most one frame in flight, see websocket_server)
+model_executor = ThreadPoolExecutor(
+    max_workers=2 * config.NAVIGATION_MAX_IN_FLIGHT,
+    thread_name_prefix="navigation-model"
+)
 
 
 class OutdoorNavigationPipeline:
@@ -20,25 +42,79 @@ class OutdoorNavigationPipeline:
     to provide comprehensive outdoor navigation guidance.
     """
 
-    def __init__(self):
+    def __init__(self, registry: Optional[ModelRegistry] = None, use_batching: Optional[bool] = None,
+                 model_mode: Optional[str] = None, adaptive_rate: Optional[bool] = None):
         """
         Initialize the outdoor navigation pipeline.
         Pipeline processes frames received from frontend via WebSocket.
+
+        Args:
+            registry: Model registry providing the shared backbones
+                      (defaults to the process-wide registry)
+            use_batching: Send frames to the cross-session batching servers
+                          instead of running single-frame inference
+                          (defaults to NAVIGATION_BATCHING)
+            model_mode: "separate" (VGG16 + ResNet152) or "combined" (one
+                        model with both heads, see combined_model.py)
+                        (defaults to NAVIGATION_MODEL_MODE)
+            adaptive_rate: Skip inference on frames with little motion and
+                           reuse the latest guidance
+                           (defaults to NAVIGATION_ADAPTIVE_RATE)
         """
         print("\n" + "=" * 60)
         print("[Pipeline] Initializing Outdoor Navigation")
         print("=" * 60)
         
-        # Initialize models (load weights first)
-        self.sidewalk_classifier = SidewalkClassification()
-        self.turn_classifier = TurnClassification()
+        # Models are shared across sessions; each classifier only keeps
+        # its own smoothing state (readings_buffer, last_result)
+        registry = registry or model_registry
+        if use_batching is None:
+            use_batching = config.NAVIGATION_BATCHING
+        self.model_mode = model_mode or config.NAVIGATION_MODEL_MODE
+
+        self.combined_model = None
+        self.combined_batcher = None
+        self.sidewalk_batcher = None
+        self.turn_batcher = None
+
+        if self.model_mode == MODEL_MODE_COMBINED:
+            # One forward pass gives both heads; the classifiers are only
+            # used for preprocessing and smoothing (predict() is never called)
+            self.combined_model = registry.get(COMBINED_MODEL)
+            self.sidewalk_classifier = SidewalkClassification(model=self.combined_model)
+            self.turn_classifier = TurnClassification(model=self.combined_model)
+            if use_batching:
+                self.combined_batcher = registry.get_batcher(COMBINED_MODEL)
+        else:
+            self.sidewalk_classifier = SidewalkClassification(model=registry.get_sidewalk_model())
+            self.turn_classifier = TurnClassification(model=registry.get_turn_model())
+            if use_batching:
+                self.sidewalk_batcher = registry.get_batcher(SIDEWALK_MODEL)
+                self.turn_batcher = registry.get_batcher(TURN_MODEL)
+        
+        if adaptive_rate is None:
+            adaptive_rate = config.NAVIGATION_ADAPTIVE_RATE
+        self.scheduler = AdaptiveInferenceScheduler(
+            min_interval=config.NAVIGATION_MIN_INFERENCE_INTERVAL,
+            max_interval=config.NAVIGATION_MAX_INFERENCE_INTERVAL,
+            motion_threshold=config.NAVIGATION_MOTION_THRESHOLD,
+            # Sessions slow down together when the governor reports pressure
+            load_fn=navigation_governor.load,
+        ) if adaptive_rate else None
+        
+        # Stable guidance with hysteresis; decides which results are worth sending
+        self.guidance_state = GuidanceStateMachine(
+            min_dwell=config.NAVIGATION_GUIDANCE_MIN_DWELL,
+            confirm_frames=config.NAVIGATION_GUIDANCE_CONFIRM_FRAMES,
+            heartbeat_interval=config.NAVIGATION_GUIDANCE_HEARTBEAT,
+        )
         
         # State management
         self.is_running = False
         self.models_ready = True
         
-        # Thread pool for parallel inference
-        self.executor = ThreadPoolExecutor(max_workers=2)
+        # Thread pool for parallel inference (shared across sessions)
+        self.executor = model_executor
         
         # Latest results
         self.latest_frame = None
@@ -49,6 +125,10 @@ class OutdoorNavigationPipeline:
         # Threading locks
         self.lock = threading.Lock()
         
+        # stage -> latest latencies in ms (decode, preprocess, sidewalk, turn,
+        # combined, guidance, total)
+        self.stage_timings: Dict[str, deque] = {}
+        
         print("[Pipeline] Ready to start")
         print("=" * 60 + "\n")
 
@@ -71,48 +151,156 @@ class OutdoorNavigationPipeline:
             return
         
         self.is_running = False
-        self.executor.shutdown(wait=False)
         print("[Pipeline] Stopped")
 
     def process_frame(self, frame: np.ndarray) -> Dict:
         """
         Process a single frame received from frontend.
         Runs both models in parallel for faster inference.
+
+        Args:
+            frame: BGR frame at any resolution, or the 100x100 model input
+                   produced by utils.frame_ingest (then no resize is needed)
         """
         if not self.is_running:
             return None
             
         try:
-            # Run both models in parallel
-            sidewalk_future = self.executor.submit(self.sidewalk_classifier.predict, frame)
-            turn_future = self.executor.submit(self.turn_classifier.predict, frame)
-            
-            # Wait for both results
-            sidewalk_result = sidewalk_future.result()
-            turn_result = turn_future.result()
+            start = time.perf_counter()
+            # Resize once; both models and the scheduler share the 100x100 input
+            processed = self.sidewalk_classifier.preprocess_frame(frame)
+            model_input = processed[0]
+            self.record_timing("preprocess", start)
+
+            # Reuse the latest guidance when the scheduler decides to skip
+            if (self.scheduler is not None and not self.scheduler.should_infer(model_input)
+                    and self.latest_guidance is not None):
+                with self.lock:
+                    return {
+                        "sidewalk": self.latest_sidewalk,
+                        "turn": self.latest_turn,
+                        "guidance": self.guidance_state.current,
+                        "event": self.guidance_state.tick(),
+                        "timestamp": time.time(),
+                        "frame": model_input,
+                        "skipped": True
+                    }
+
+            with inference_load.track():
+                if self.combined_model is not None:
+                    sidewalk_result, turn_result = self._predict_combined(processed)
+                elif self.sidewalk_batcher is not None:
+                    sidewalk_result, turn_result = self._predict_batched(processed)
+                else:
+                    # Run both models in parallel
+                    sidewalk_future = self.executor.submit(
+                        self._timed, "sidewalk", self.sidewalk_classifier.predict_processed, processed
+                    )
+                    turn_future = self.executor.submit(
+                        self._timed, "turn", self.turn_classifier.predict_processed, processed
+                    )
+                    
+                    # Wait for both results
+                    sidewalk_result = sidewalk_future.result()
+                    turn_result = turn_future.result()
             
             # Generate guidance
+            guidance_start = time.perf_counter()
             guidance = self._generate_guidance(sidewalk_result, turn_result)
             
             # Update latest results
+            # Only the 100x100 model input is kept, never the full frame
             with self.lock:
-                self.latest_frame = frame.copy()
+                self.latest_frame = model_input
                 self.latest_sidewalk = sidewalk_result
                 self.latest_turn = turn_result
                 self.latest_guidance = guidance
+                event = self.guidance_state.update(guidance)
+            self.record_timing("guidance", guidance_start)
+            self.record_timing("total", start)
             
             return {
                 "sidewalk": sidewalk_result,
                 "turn": turn_result,
-                "guidance": guidance,
+                "guidance": self.guidance_state.current,
+                "raw_guidance": guidance,
+                "event": event,
                 "timestamp": time.time(),
-                "frame": frame
+                "frame": model_input,
+                "skipped": False
             }
             
         except Exception as e:
             print(f"[Pipeline] Error: {e}")
             return None
 
+    def record_timing(self, stage: str, start: float):
+        """Record the latency of a stage that started at perf_counter() == start"""
+        timings = self.stage_timings.get(stage)
+        if timings is None:
+            timings = self.stage_timings.setdefault(stage, deque(maxlen=STAGE_TIMING_WINDOW))
+        timings.append((time.perf_counter() - start) * 1000.0)
+
+    def _timed(self, stage: str, fn, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self.record_timing(stage, start)
+
+    def get_stage_stats(self) -> Dict:
+        """p50 / p99 latency (ms) per stage over the latest frames"""
+        stats = {}
+        for stage, timings in list(self.stage_timings.items()):
+            values = np.fromiter(list(timings), dtype=np.float64)
+            if values.size:
+                stats[stage] = {
+                    "count": int(values.size),
+                    "p50_ms": round(float(np.percentile(values, 50)), 2),
+                    "p99_ms": round(float(np.percentile(values, 99)), 2),
+                }
+        return stats
+
+    def get_stats(self) -> Dict:
+        """Per-session scheduling statistics (effective inference FPS, ...)"""
+        stats = {"guidance": self.guidance_state.get_stats(), "latency": self.get_stage_stats()}
+        if self.scheduler is None:
+            return {"adaptive_rate": False, **stats}
+        return {"adaptive_rate": True, **self.scheduler.get_stats(), **stats}
+
+    def _predict_batched(self, processed: np.ndarray):
+        """
+        Submit the preprocessed frame to the shared batching servers and feed
+        the returned probabilities into this session's smoothing buffers.
+        """
+        start = time.perf_counter()
+        sidewalk_future = self.sidewalk_batcher.submit(processed[0])
+        turn_future = self.turn_batcher.submit(processed[0])
+
+        # Includes the time spent waiting for a batch to fill
+        sidewalk_preds = sidewalk_future.result()
+        self.record_timing("sidewalk", start)
+        turn_preds = turn_future.result()
+        self.record_timing("turn", start)
+
+        sidewalk_result = self.sidewalk_classifier.update(sidewalk_preds)
+        turn_result = self.turn_classifier.update(turn_preds)
+        return sidewalk_result, turn_result
+
+    def _predict_combined(self, processed: np.ndarray):
+        """Run the combined model once and smooth both heads' outputs"""
+        start = time.perf_counter()
+        if self.combined_batcher is not None:
+            sidewalk_preds, turn_preds = self.combined_batcher.submit(processed[0]).result()
+        else:
+            sidewalk_out, turn_out = self.combined_model.predict(processed, verbose=0)
+            sidewalk_preds, turn_preds = sidewalk_out[0], turn_out[0]
+        self.record_timing("combined", start)
+
+        sidewalk_result = self.sidewalk_classifier.update(sidewalk_preds)
+        turn_result = self.turn_classifier.update(turn_preds)
+        return sidewalk_result, turn_result
+
     def _generate_guidance(self, sidewalk: str, turn: str) -> str:
         """
         Generate interpretable navigation guidance based on sidewalk position and turn detection.
@@ -149,7 +337,9 @@ class OutdoorNavigationPipeline:
         Get the latest navigation result.
         
         Returns:
-            Dictionary with sidewalk, turn, guidance, and frame
+            Dictionary with sidewalk, turn, guidance (the stable guidance
+            state), and frame (the 100x100 model input of the latest
+            inferred frame)
         """
         with self.lock:
             if self.latest_frame is None:
@@ -158,7 +348,7 @@ class OutdoorNavigationPipeline:
             return {
                 "sidewalk": self.latest_sidewalk,
                 "turn": self.latest_turn,
-                "guidance": self.latest_guidance,
+                "guidance": self.guidance_state.current,
                 "frame": self.latest_frame.copy()
             }
 
@@ -209,37 +399,43 @@ class OutdoorNavigationPipeline:
 
 # Example usage
 if __name__ == "__main__":
-    # Test with video file
-    video_path = r"examples/outdoor_navigation/ShiftSidewalk.mp4"
+    import sys
+    from app.utils.frame_capture import FrameCapturer
+
+    # Test with video file (or pass a camera index / stream URL / image directory)
+    source = sys.argv[1] if len(sys.argv) > 1 else r"examples/outdoor_navigation/ShiftSidewalk.mp4"
     
-    pipeline = OutdoorNavigationPipeline(use_camera=False, video_path=video_path)
+    pipeline = OutdoorNavigationPipeline()
     pipeline.start()
+    capturer = FrameCapturer(source, loop=False, name="navigation-capturer").start()
     
     print("\n>>> Running navigation pipeline...")
     print(">>> Press 'q' to quit\n")
     
     try:
+        last_sequence = 0
         while True:
-            result = pipeline.get_latest_result()
+            # Always the newest frame; frames decoded while we were busy are skipped
+            sequence, frame = capturer.wait_for_frame(last_sequence, timeout=5.0)
+            if sequence is None:
+                break
+            last_sequence = sequence
             
+            result = pipeline.process_frame(frame)
             if result:
-                frame = result["frame"]
-                sidewalk = result["sidewalk"]
-                turn = result["turn"]
-                guidance = result["guidance"]
-                
-                # Render and display
-                display_frame = pipeline.render_result(frame, sidewalk, turn, guidance)
+                # Render on the full frame; result["frame"] is the 100x100 model input
+                display_frame = pipeline.render_result(frame, result["sidewalk"], result["turn"], result["guidance"])
                 cv2.imshow("Outdoor Navigation", display_frame)
                 
                 if cv2.waitKey(1) & 0xFF == ord('q'):
                     break
-            else:
-                time.sleep(0.1)
                 
     except KeyboardInterrupt:
         print("\n>>> Interrupted by user")
     finally:
+        capturer.stop()
+        print(capturer.get_stats())
+        print(pipeline.get_stats())
         pipeline.stop()
         cv2.destroyAllWindows()
         print(">>> Stopped")
@@ -19,20 +19,24 @@ DETECTION_THRESHOLD = 0.5
 
 class SidewalkClassification:
 
-    def __init__(self, model_path=MODEL_PATH, buffer_size=READINGS_BUFFER_SIZE):
-        print("[Sidewalk] Loading model...")
-        self.model = self.build_sidewalk_model()
-        self.load_custom_dense(self.model, model_path)
-        print("[Sidewalk] Model ready")
-
-        self.readings_buffer = CircularBuffer(buffer_size, noneOverridePercent=0.5)
+    def __init__(self, model_path=MODEL_PATH, buffer_size=READINGS_BUFFER_SIZE, model=None):
+        # A pre-loaded model (e.g. from the shared model registry) can be
+        # injected so that only the smoothing state is per instance.
+        if model is None:
+            model = self.load_model(model_path)
+        self.model = model
+
+        self.readings_buffer = CircularBuffer(
+            buffer_size, noneOverridePercent=0.5, n_classes=len(CLASSES) - 1  # "Nothing Detected" is not a model output
+        )
         self.last_result = None
 
 
     # ============================================================
     # 1) Build VGG16 backbone + custom head (same as training)
     # ============================================================
-    def build_sidewalk_model(self):
+    @staticmethod
+    def build_sidewalk_model():
         base = tf.keras.applications.VGG16(
             include_top=False,
             weights="imagenet",
@@ -52,7 +56,8 @@ class SidewalkClassification:
     # 2) Load custom dense layer weights from H5 file
     # ============================================================
         
-    def load_custom_dense(self, model, weight_path):
+    @staticmethod
+    def load_custom_dense(model, weight_path):
         with h5py.File(weight_path, "r") as f:
             mw = f["model_weights"]
 
@@ -86,14 +91,27 @@ class SidewalkClassification:
             model.get_layer("dense").set_weights([kernel, bias])
 
 
+    @classmethod
+    def load_model(cls, model_path=MODEL_PATH):
+        """Build the backbone and load trained weights from the H5 file"""
+        print("[Sidewalk] Loading model...")
+        model = cls.build_sidewalk_model()
+        cls.load_custom_dense(model, model_path)
+        print("[Sidewalk] Model ready")
+        return model
+
+
     # ============================================================
     # 3) Preprocess frame
     # ============================================================
-    def preprocess_frame(self, frame):
+    @staticmethod
+    def preprocess_frame(frame):
         """Preprocess frame for model inference"""
         if frame is None:
             return None
-        frame = cv2.resize(frame, IMAGE_SIZE, interpolation=cv2.INTER_LINEAR)
+        # Frames from the ingest stage are already at model resolution
+        if frame.shape[1] != IMAGE_SIZE[0] or frame.shape[0] != IMAGE_SIZE[1]:
+            frame = cv2.resize(frame, IMAGE_SIZE, interpolation=cv2.INTER_LINEAR)
         frame = np.expand_dims(frame, 0)  # shape (1,100,100,3)
         return frame
 
@@ -107,8 +125,17 @@ class SidewalkClassification:
         if processed is None:
             return self.last_result
 
+        return self.predict_processed(processed)
+
+
+    def predict_processed(self, processed):
+        """Inference + smoothing on an already preprocessed (1,100,100,3) batch"""
         preds = self.model.predict(processed, verbose=0)[0]
+        return self.update(preds)
+
 
+    def update(self, preds):
+        """Add raw class probabilities to the smoothing buffer and return the sidewalk position"""
         # Nếu max prob < threshold → treat as None
         self.readings_buffer.add(
             None if max(preds) < DETECTION_THRESHOLD else preds
@@ -1,39 +1,93 @@
 import numpy as np
 
+# Recompute the running sum from scratch every this many adds to stop
+# floating point drift from accumulating
+RESYNC_INTERVAL = 1024
+
+
 class CircularBuffer:
-    def __init__(self, capacity, noneOverridePercent=0.8):
+    """
+    Fixed-size ring buffer of readings with an O(1) running mean.
+
+    Readings live in a preallocated (capacity, *shape) array with a validity
+    mask; None readings (and slots never written) are invalid. add() and
+    mean() do not allocate once the storage exists. Storage is allocated
+    up front when n_classes is given, otherwise on the first non-None add.
+    """
+
+    def __init__(self, capacity, noneOverridePercent=0.8, n_classes=None):
         self.capacity = capacity
-        self.queue = [None] * capacity
         self.minNumPercent = noneOverridePercent
         self.lastAccessed = False
 
+        self._head = -1  # Slot of the most recent reading
+        self._valid = np.zeros(capacity, dtype=bool)
+        self._valid_count = 0
+        self._adds_since_resync = 0
+        self._values = None
+        self._sum = None
+        self._mean = None
+
+        if n_classes is not None:
+            self._allocate((n_classes,), np.float64)
+
+    def _allocate(self, shape, dtype):
+        self._values = np.zeros((self.capacity, *shape), dtype=dtype)
+        self._sum = np.zeros(shape, dtype=np.float64)
+        self._mean = np.zeros(shape, dtype=np.float64)
+
     def add(self, term):
-        # Always insert at front, drop last
-        self.queue.pop()
-        self.queue.insert(0, term)
+        # Overwrite the oldest slot
+        self._head = (self._head + 1) % self.capacity
+        slot = self._head
+
+        if self._valid[slot]:
+            self._sum -= self._values[slot]
+            self._valid[slot] = False
+            self._valid_count -= 1
+
+        if term is not None:
+            if self._values is None:
+                term = np.asarray(term)
+                self._allocate(term.shape, term.dtype)
+            self._values[slot] = term
+            self._sum += self._values[slot]
+            self._valid[slot] = True
+            self._valid_count += 1
+
+        self._adds_since_resync += 1
+        if self._adds_since_resync >= RESYNC_INTERVAL and self._sum is not None:
+            np.sum(self._values, axis=0, where=self._valid.reshape(-1, *([1] * self._sum.ndim)), out=self._sum)
+            self._adds_since_resync = 0
+
         self.lastAccessed = False
 
     def get_last(self):
         self.lastAccessed = True
-        return self.queue[0]
+        if self._head < 0 or not self._valid[self._head]:
+            return None
+        return self._values[self._head].copy()
 
     def mean(self):
-        temp = self.queue.copy()
+        """
+        Mean of the valid readings, or None if too many readings are None.
+        The returned array is reused by the next call; copy it to keep it.
+        """
+        none_count = self.capacity - self._valid_count
 
-        # Count None safely
-        none_count = sum(1 for t in temp if t is None)
-
-        if none_count >= self.minNumPercent * self.capacity:
+        if none_count >= self.minNumPercent * self.capacity or self._valid_count == 0:
             return None
 
-        # Filter None safely
-        temp = [t for t in temp if t is not None]
-
-        # Convert to numpy array (shape: N x 3)
-        arr = np.array(temp)
-
-        # Return mean per column
-        return np.mean(arr, axis=0)
+        return np.divide(self._sum, self._valid_count, out=self._mean)
 
     def getList(self):
-        return self.queue
+        """Readings from newest to oldest (None for empty / None slots)"""
+        result = []
+        for i in range(self.capacity):
+            slot = (self._head - i) % self.capacity
+            result.append(self._values[slot].copy() if self._head >= 0 and self._valid[slot] else None)
+        return result
+
+    @property
+    def queue(self):
+        return self.getList()
@@ -0,0 +1,44 @@
+"""
+Ingest stage for navigation frames: decode client JPEGs straight to the
+models' input resolution.
+
+Both classifiers resize every frame to 100x100, so decoding the full
+resolution image first is wasted work. The JPEG is decoded at the largest
+libjpeg reduction that still leaves at least 100x100 pixels (see
+app/utils/jpeg.py), then a single resize produces the model input.
+"""
+
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from app.utils.jpeg import reduced_decode_flag as _reduced_decode_flag
+
+MODEL_INPUT_SIZE = (100, 100)  # (width, height), IMAGE_SIZE of both classifiers
+
+
+def reduced_decode_flag(data, target_size: Tuple[int, int] = MODEL_INPUT_SIZE) -> int:
+    """imdecode flag for the cheapest decode that still covers target_size"""
+    return _reduced_decode_flag(data, target_size)
+
+
+def resize_to_model_input(frame: np.ndarray, target_size: Tuple[int, int] = MODEL_INPUT_SIZE) -> np.ndarray:
+    """Resize once to the model input size (no-op if already that size)"""
+    if frame.shape[1] == target_size[0] and frame.shape[0] == target_size[1]:
+        return frame
+    return cv2.resize(frame, target_size, interpolation=cv2.INTER_LINEAR)
+
+
+def decode_model_input(data, reduced: bool = True,
+                       target_size: Tuple[int, int] = MODEL_INPUT_SIZE) -> Optional[np.ndarray]:
+    """
+    Decode JPEG bytes (or any imdecode-able image) into a BGR model input of
+    target_size. With reduced=False the full resolution image is decoded
+    first (the previous behaviour).
+    """
+    flag = reduced_decode_flag(data, target_size) if reduced else cv2.IMREAD_COLOR
+    frame = cv2.imdecode(np.frombuffer(data, np.uint8), flag)
+    if frame is None:
+        return None
+    return resize_to_model_input(frame, target_size)
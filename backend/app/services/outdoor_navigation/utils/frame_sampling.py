@@ -0,0 +1,58 @@
+import glob
+import os
+
+import cv2
+
+EXAMPLE_VIDEO_DIR = r"examples/outdoor_navigation"
+
+
+def list_example_videos(video_dir=EXAMPLE_VIDEO_DIR):
+    """Return the sorted list of .mp4 files in the example video directory"""
+    return sorted(glob.glob(os.path.join(video_dir, "*.mp4")))
+
+
+def sample_video_frames(video_paths, max_frames=200, stride=5, start_fraction=0.0, end_fraction=1.0):
+    """
+    Read every `stride`-th frame from the given videos (BGR, full resolution),
+    spreading the `max_frames` budget evenly across the videos. Only frames
+    between start_fraction and end_fraction of each video's length are read,
+    so that e.g. the tail of every video can be held out for evaluation.
+    """
+    if isinstance(video_paths, str):
+        video_paths = [video_paths]
+    if not video_paths:
+        return []
+
+    per_video = max(1, max_frames // len(video_paths))
+    frames = []
+
+    for path in video_paths:
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            print(f"[Sampling] Could not open video file: {path}")
+            continue
+
+        index = 0
+        end = None
+        if start_fraction > 0.0 or end_fraction < 1.0:
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            if frame_count <= 0:
+                print(f"[Sampling] Unknown length, cannot take a range of: {path}")
+                cap.release()
+                continue
+            index = int(frame_count * start_fraction)
+            end = int(frame_count * end_fraction)
+            cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+
+        taken = 0
+        while taken < per_video and (end is None or index < end):
+            ret, frame = cap.read()
+            if not ret or frame is None:
+                break
+            if index % stride == 0:
+                frames.append(frame)
+                taken += 1
+            index += 1
+        cap.release()
+
+    return frames[:max_frames]
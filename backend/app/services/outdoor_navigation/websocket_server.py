@@ -7,13 +7,35 @@ from fastapi import WebSocket, WebSocketDisconnect
 from fastapi.responses import JSONResponse
 import asyncio
 import json
+import time
 import cv2
 import base64
 import numpy as np
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Union
 
+from app.config import config
+from app.utils.frame_protocol import (
+    MESSAGE_TYPE_FRAME,
+    PROTOCOL_BINARY,
+    FrameProtocolError,
+    negotiate_protocol,
+    unpack_frame,
+)
 from app.websocket_manager import manager
+from .governor import navigation_governor
+from .guidance import EMIT_ALL, EMIT_CHANGES
 from .pipeline import OutdoorNavigationPipeline
+from .utils.frame_ingest import decode_model_input
+from .model_registry import model_registry
+
+# Decode + inference run here so the asyncio event loop never blocks on them
+navigation_executor = ThreadPoolExecutor(
+    max_workers=config.NAVIGATION_WORKERS,
+    thread_name_prefix="navigation"
+)
+# websocket -> NavigationSession
+sessions: dict = {}
 
 
 def encode_frame_to_base64(frame: np.ndarray) -> str:
@@ -43,6 +65,174 @@ async def stream_navigation_to_clients():
         await asyncio.sleep(1)  # Keep task alive but idle
 
 
+def decode_frame(frame_data: Union[str, bytes, memoryview]) -> Optional[np.ndarray]:
+    """
+    Decode a frame into the 100x100 BGR model input. Accepts raw JPEG bytes
+    (binary protocol) or a base64 string, optionally data-URL prefixed (JSON
+    protocol). The full resolution image is never materialized unless
+    NAVIGATION_REDUCED_DECODE is off.
+    """
+    if isinstance(frame_data, str):
+        # Remove data URL prefix if present
+        if "base64," in frame_data:
+            frame_data = frame_data.split("base64,")[1]
+        # Decode base64 to bytes
+        frame_data = base64.b64decode(frame_data)
+
+    return decode_model_input(frame_data, reduced=config.NAVIGATION_REDUCED_DECODE)
+
+
+def decode_and_process(navigation_pipeline: OutdoorNavigationPipeline,
+                       frame_data: Union[str, bytes, memoryview]) -> Optional[dict]:
+    """Decode + inference stage; runs on navigation_executor, never on the event loop"""
+    start = time.perf_counter()
+    frame = decode_frame(frame_data)
+    navigation_pipeline.record_timing("decode", start)
+    if frame is None or not navigation_pipeline.is_running:
+        return None
+    return navigation_pipeline.process_frame(frame)
+
+
+class NavigationSession:
+    """
+    Per-connection frame slot with backpressure.
+
+    The receive loop drops each frame into a single "latest" slot. A worker
+    task takes the slot, runs decode + inference on navigation_executor and
+    sends the result. At most one frame per session is in flight; frames that
+    arrive meanwhile replace the waiting one instead of queuing up.
+
+    With emit="changes" only guidance changes and heartbeats are sent (see
+    guidance.py); emit="all" sends every processed frame.
+    """
+
+    def __init__(self, websocket: WebSocket, navigation_pipeline: OutdoorNavigationPipeline):
+        self.websocket = websocket
+        self.pipeline = navigation_pipeline
+        self.frames_received = 0
+        self.frames_dropped = 0
+        self.frames_shed = 0
+        self.messages_sent = 0
+        self.emit = config.NAVIGATION_GUIDANCE_EMIT
+        self._pending = None
+        self._pending_sequence = None
+        self._frame_ready = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._worker = asyncio.create_task(self._process_loop())
+
+    def submit(self, frame_data, sequence: Optional[int] = None):
+        """Offer a new frame; replaces (drops) a frame still waiting"""
+        self.frames_received += 1
+        if self._pending is not None:
+            self.frames_dropped += 1
+        self._pending = frame_data
+        self._pending_sequence = sequence
+        self._frame_ready.set()
+
+    def configure(self, options: dict) -> dict:
+        """
+        Apply per-session guidance settings sent by the client:
+        emit ("changes" | "all"), min_dwell, confirm_frames, heartbeat_interval.
+        Raises ValueError for invalid settings (none are applied then).
+        """
+        if not isinstance(options, dict):
+            raise ValueError("guidance settings must be an object")
+        emit = options.get("emit")
+        if emit is not None and emit not in (EMIT_CHANGES, EMIT_ALL):
+            raise ValueError(f"emit must be '{EMIT_CHANGES}' or '{EMIT_ALL}', got {emit!r}")
+        with self.pipeline.lock:
+            self.pipeline.guidance_state.configure(
+                min_dwell=options.get("min_dwell"),
+                confirm_frames=options.get("confirm_frames"),
+                heartbeat_interval=options.get("heartbeat_interval"),
+            )
+        if emit is not None:
+            self.emit = emit
+        return {"emit": self.emit, **self.pipeline.guidance_state.get_stats()}
+
+    async def _process_loop(self):
+        loop = asyncio.get_running_loop()
+        while self.pipeline.is_running:
+            await self._frame_ready.wait()
+            self._frame_ready.clear()
+            frame_data, self._pending = self._pending, None
+            sequence = self._pending_sequence
+            if frame_data is None:
+                continue
+
+            # Global in-flight budget exhausted: drop this frame, the client
+            # keeps sending newer ones
+            if not navigation_governor.try_begin_inference():
+                self.frames_shed += 1
+                # Clients expecting a reply per frame are told it was dropped
+                if self.emit == EMIT_ALL and not await self._send(
+                    {"type": "navigation_update", "event": None, "shed": True}, sequence
+                ):
+                    break
+                continue
+
+            try:
+                result = await loop.run_in_executor(
+                    navigation_executor, decode_and_process, self.pipeline, frame_data
+                )
+            except Exception as e:
+                if self.pipeline.is_running:
+                    print(f"[Navigation WS] Error: {e}")
+                continue
+            finally:
+                navigation_governor.end_inference()
+
+            # Only send response if still running and connected
+            if not result or not self.pipeline.is_running:
+                continue
+            if result.get("event") is None and self.emit != EMIT_ALL:
+                continue
+            
+            response = {
+                "type": "navigation_update",
+                "event": result.get("event"),
+                "sidewalk": result["sidewalk"],
+                "turn": result["turn"],
+                "guidance": result["guidance"],
+                "timestamp": result.get("timestamp"),
+                "skipped": result.get("skipped", False)
+            }
+            if not await self._send(response, sequence):
+                break
+
+    async def _send(self, response: dict, sequence: Optional[int]) -> bool:
+        """Send a reply to a frame; False once the socket is gone"""
+        if sequence is not None:
+            # Lets binary-protocol clients match replies to frames
+            response["sequence"] = sequence
+        try:
+            await self.websocket.send_json(response)
+            self.messages_sent += 1
+            return True
+        except Exception:
+            return False
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    def get_stats(self) -> dict:
+        return {
+            "frames_received": self.frames_received,
+            "frames_dropped": self.frames_dropped,
+            "frames_shed": self.frames_shed,
+            "messages_sent": self.messages_sent,
+            "emit": self.emit,
+            **self.pipeline.get_stats(),
+        }
+
+
 # FastAPI route handlers (to be added to main.py)
 async def websocket_outdoor_navigation(websocket: WebSocket):
     """
@@ -54,37 +244,134 @@ async def websocket_outdoor_navigation(websocket: WebSocket):
         "type": "frame",
         "data": "base64_encoded_jpeg_image"
     }
+    or, when connected with ?protocol=binary, binary messages of a
+    frame_protocol header followed by the raw JPEG bytes.
     
-    Backend responds:
+    Backend responds when the stable guidance changes ("event": "change")
+    and periodically otherwise ("event": "heartbeat"):
     {
         "type": "navigation_update",
+        "event": "change",
         "sidewalk": "Middle of Sidewalk",
         "turn": "No Turn",
         "guidance": "Stay centered"
     }
+    With emit="all" a frame dropped because the server is at its in-flight
+    inference limit is answered with {"type": "navigation_update", "shed": true}.
+    
+    Guidance emission can be tuned per session:
+    {
+        "type": "config",
+        "guidance": {"emit": "all", "min_dwell": 1.0, "confirm_frames": 3, "heartbeat_interval": 5.0}
+    }
+    
+    When the server is at capacity the client first receives
+    {"type": "status", "state": "queued", "position": 2, ...} while waiting,
+    or {"type": "status", "state": "rejected", ...} before the socket closes.
+    Frames sent before {"type": "status", "state": "ready"} are discarded.
     """
     await manager.connect(websocket)
+    protocol = negotiate_protocol(websocket)
     
-    print("[Navigation WS] Client connected")
+    print(f"[Navigation WS] Client connected (protocol: {protocol})")
     
-    # Create pipeline for this session (models load here)
-    navigation_pipeline = OutdoorNavigationPipeline()
+    async def notify_queued(position: int):
+        await websocket.send_json({
+            "type": "status",
+            "state": "queued",
+            "position": position,
+            "message": f"Navigation is busy. You are number {position} in line"
+        })
     
-    # Start pipeline only after models are loaded
-    navigation_pipeline.start()
-    manager.pipelines[websocket] = navigation_pipeline
+    async def discard_until_disconnect():
+        # Frames sent while queued are not processed; returns when the client leaves
+        while True:
+            raw = await websocket.receive()
+            if raw["type"] == "websocket.disconnect":
+                return
     
-    # Send initial status
-    await websocket.send_json({
-        "type": "status",
-        "message": "Navigation ready"
-    })
+    # Watch the socket while waiting for a slot, so a client that leaves the
+    # queue gives up its place at once instead of holding it until queue_timeout
+    admission = asyncio.create_task(navigation_governor.admit(on_queued=notify_queued))
+    receiver = asyncio.create_task(discard_until_disconnect())
+    try:
+        await asyncio.wait({admission, receiver}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        client_left = receiver.done()
+        if not admission.done():
+            admission.cancel()  # Removes the queue ticket
+        receiver.cancel()
+        await asyncio.gather(receiver, return_exceptions=True)
+    try:
+        admitted = await admission
+    except (asyncio.CancelledError, WebSocketDisconnect, RuntimeError):
+        # Client left while queued
+        admitted = False
+        client_left = True
+    
+    if client_left:
+        if admitted:
+            navigation_governor.release()
+        manager.disconnect(websocket)
+        return
     
+    if not admitted:
+        print("[Navigation WS] Client rejected, navigation at capacity")
+        try:
+            await websocket.send_json({
+                "type": "status",
+                "state": "rejected",
+                "message": "Navigation is at capacity. Please try again later"
+            })
+            await websocket.close(code=1013)  # Try again later
+        except Exception:
+            pass
+        manager.disconnect(websocket)
+        return
+    
+    navigation_pipeline = None
+    session = None
     try:
+        # Create pipeline for this session. Models come from the shared registry;
+        # the first session may still have to load them, so keep that off the event loop.
+        navigation_pipeline = await asyncio.to_thread(OutdoorNavigationPipeline)
+        
+        # Start pipeline only after models are loaded
+        navigation_pipeline.start()
+        manager.pipelines[websocket] = navigation_pipeline
+        session = NavigationSession(websocket, navigation_pipeline)
+        sessions[websocket] = session
+        session.start()
+        
+        # Send initial status
+        await websocket.send_json({
+            "type": "status",
+            "state": "ready",
+            "message": "Navigation ready",
+            "protocol": protocol
+        })
+        
         # Keep connection alive and handle incoming messages
         while True:
-            data = await websocket.receive_text()
-            message = json.loads(data)
+            raw = await websocket.receive()
+            if raw["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(raw.get("code", 1000))
+            
+            if raw.get("bytes") is not None:
+                if protocol != PROTOCOL_BINARY:
+                    continue
+                try:
+                    frame = unpack_frame(raw["bytes"])
+                except FrameProtocolError as e:
+                    print(f"[Navigation WS] Bad binary frame: {e}")
+                    continue
+                if frame.message_type == MESSAGE_TYPE_FRAME:
+                    if not navigation_pipeline.is_running:
+                        break
+                    session.submit(frame.payload, frame.sequence)
+                continue
+            
+            message = json.loads(raw.get("text") or "{}")
             
             message_type = message.get("type")
             
@@ -92,40 +379,22 @@ async def websocket_outdoor_navigation(websocket: WebSocket):
                 # Check if pipeline is still running before processing
                 if not navigation_pipeline.is_running:
                     break
-                    
-                # Decode base64 frame
+                session.submit(message.get("data", ""))
+            
+            elif message_type == "config":
                 try:
-                    frame_data = message.get("data", "")
-                    # Remove data URL prefix if present
-                    if "base64," in frame_data:
-                        frame_data = frame_data.split("base64,")[1]
-                    
-                    # Decode base64 to bytes
-                    img_bytes = base64.b64decode(frame_data)
-                    # Convert to numpy array
-                    nparr = np.frombuffer(img_bytes, np.uint8)
-                    # Decode image
-                    frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-                    
-                    if frame is not None and navigation_pipeline.is_running:
-                        # Process frame
-                        result = navigation_pipeline.process_frame(frame)
-                        
-                        # Only send response if still running and connected
-                        if result and navigation_pipeline.is_running:
-                            response = {
-                                "type": "navigation_update",
-                                "sidewalk": result["sidewalk"],
-                                "turn": result["turn"],
-                                "guidance": result["guidance"],
-                                "timestamp": result.get("timestamp")
-                            }
-                            
-                            await websocket.send_json(response)
-                        
-                except Exception as e:
-                    if navigation_pipeline.is_running:
-                        print(f"[Navigation WS] Error: {e}")
+                    settings = session.configure(message.get("guidance") or {})
+                except ValueError as e:
+                    await websocket.send_json({
+                        "type": "error",
+                        "message": f"Invalid guidance settings: {e}"
+                    })
+                    continue
+                await websocket.send_json({
+                    "type": "status",
+                    "message": "Guidance settings updated",
+                    "guidance": settings
+                })
             
             elif message_type == "stop":
                 break
@@ -139,6 +408,10 @@ async def websocket_outdoor_navigation(websocket: WebSocket):
             navigation_pipeline.stop()
             if websocket in manager.pipelines:
                 del manager.pipelines[websocket]
+        if session is not None:
+            await session.close()
+        sessions.pop(websocket, None)
+        navigation_governor.release()
         print("[Navigation WS] Client disconnected, pipeline stopped")
 
 
@@ -162,5 +435,10 @@ async def get_navigation_status():
     """HTTP endpoint to check status"""
     return JSONResponse(content={
         "connected_clients": len(manager.active_connections),
+        "active_sessions": len(manager.pipelines),
+        "models": model_registry.get_stats(),
+        "batching": model_registry.get_batcher_stats(),
+        "governor": navigation_governor.get_stats(),
+        "sessions": [session.get_stats() for session in list(sessions.values())],
         "message": "Connect via WebSocket for real-time navigation"
     })
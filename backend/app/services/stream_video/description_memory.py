@@ -0,0 +1,143 @@
+"""
+Per-session memory of real-time descriptions.
+
+- Semantic deduplication: every spoken sentence is embedded with the
+  sentence-transformer of app.utils.audio.get_embedder(). A new sentence
+  whose cosine similarity to a sentence spoken within the last
+  window_seconds is at or above similarity_threshold counts as a duplicate
+  and is not spoken again. A description whose sentences are all duplicates
+  is suppressed; one with some new sentences is shortened to those.
+- Scene cache: a small LRU maps frame fingerprints (app/utils/scene_change.py)
+  to their description, so a scene the user comes back to is answered
+  locally instead of with a Gemini call.
+
+If the embedder cannot be loaded, duplicates fall back to exact
+(case-insensitive) sentence matches.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.utils.audio import get_embedder
+from app.utils.scene_change import Fingerprint, compare
+
+_embedder_failed = False
+
+
+def embed_sentences(sentences: List[str]) -> Optional[np.ndarray]:
+    """Unit-length embeddings, one row per sentence (None if no embedder)"""
+    global _embedder_failed
+    if _embedder_failed or not sentences:
+        return None
+    try:
+        embeddings = np.asarray(get_embedder().encode(sentences), dtype=np.float32)
+    except Exception as e:
+        _embedder_failed = True
+        print(f"[Description Memory] Embedder unavailable, using exact matches: {e}")
+        return None
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-8)
+
+
+class DescriptionMemory:
+    """Recent sentences (for dedup) + fingerprint -> description LRU"""
+
+    def __init__(self, similarity_threshold: float = 0.9, window_seconds: float = 60.0,
+                 max_recent: int = 20, cache_size: int = 16, cache_similarity: float = 0.95):
+        self.similarity_threshold = similarity_threshold
+        self.window_seconds = window_seconds
+        self.cache_similarity = cache_similarity
+        self.cache_size = cache_size
+        # (time, normalised text, embedding or None)
+        self._recent = deque(maxlen=max_recent)
+        self._scenes: "OrderedDict[int, Tuple[Fingerprint, str]]" = OrderedDict()
+        self._next_key = 0
+
+        self.sentences_checked = 0
+        self.sentences_duplicate = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # ============================================================
+    # Semantic deduplication
+    # ============================================================
+    def _prune(self, now: float):
+        while self._recent and now - self._recent[0][0] > self.window_seconds:
+            self._recent.popleft()
+
+    def _is_duplicate(self, text: str, embedding: Optional[np.ndarray]) -> bool:
+        for _, recent_text, recent_embedding in self._recent:
+            if recent_text == text:
+                return True
+            if embedding is not None and recent_embedding is not None:
+                if float(np.dot(embedding, recent_embedding)) >= self.similarity_threshold:
+                    return True
+        return False
+
+    def filter_sentences(self, sentences: List[str]) -> List[bool]:
+        """
+        For each sentence, True if it is new (and now remembered), False if
+        it repeats something said recently. Runs the embedder: call it
+        through filter_sentences_async from the event loop.
+        """
+        now = time.monotonic()
+        self._prune(now)
+        embeddings = embed_sentences(sentences)
+        is_new = []
+        for i, sentence in enumerate(sentences):
+            text = sentence.strip().lower()
+            embedding = embeddings[i] if embeddings is not None else None
+            self.sentences_checked += 1
+            if self._is_duplicate(text, embedding):
+                self.sentences_duplicate += 1
+                is_new.append(False)
+                continue
+            self._recent.append((now, text, embedding))
+            is_new.append(True)
+        return is_new
+
+    async def filter_sentences_async(self, sentences: List[str]) -> List[bool]:
+        return await asyncio.to_thread(self.filter_sentences, sentences)
+
+    # ============================================================
+    # Scene cache
+    # ============================================================
+    def lookup(self, fingerprint: Optional[Fingerprint]) -> Optional[str]:
+        """Description of a cached scene close enough to this fingerprint"""
+        if fingerprint is None:
+            return None
+        best_key, best_similarity = None, self.cache_similarity
+        for key, (cached, _) in self._scenes.items():
+            similarity = compare(cached, fingerprint)
+            if similarity >= best_similarity:
+                best_key, best_similarity = key, similarity
+        if best_key is None:
+            self.cache_misses += 1
+            return None
+        self.cache_hits += 1
+        self._scenes.move_to_end(best_key)
+        return self._scenes[best_key][1]
+
+    def remember_scene(self, fingerprint: Optional[Fingerprint], description: str):
+        if fingerprint is None or not description:
+            return
+        self._scenes[self._next_key] = (fingerprint, description)
+        self._next_key += 1
+        while len(self._scenes) > self.cache_size:
+            self._scenes.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "semantic": not _embedder_failed,
+            "sentences_checked": self.sentences_checked,
+            "sentences_duplicate": self.sentences_duplicate,
+            "recent_sentences": len(self._recent),
+            "cached_scenes": len(self._scenes),
+            "cache_hits": self.cache_hits,
+            "cache_hit_ratio": round(self.cache_hits / lookups, 3) if lookups else None,
+        }
@@ -0,0 +1,148 @@
+"""
+Fair sharing of the Gemini call budget between real-time description sessions.
+
+- Every session has its own description interval (client-configurable,
+  never below min_interval).
+- The global budget is calls_per_minute. With N sessions, each session may
+  call at most once every N / rate seconds (its fair share), so one busy
+  client can never use up the budget of the others.
+- A token bucket (bursts of up to max_in_flight calls) plus a cap on calls in
+  flight enforce the global limit when many sessions become due together.
+
+Outcomes of every frame offered by a session are counted (sent, throttled,
+unchanged, budget, failed, cancelled, cached, duplicate) so the skip rate can
+be monitored, along with time to first streamed chunk and total time of sent
+descriptions.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.config import config
+
+OUTCOME_SENT = "sent"
+OUTCOME_THROTTLED = "throttled"  # Session interval (or fair share) not elapsed
+OUTCOME_UNCHANGED = "unchanged"  # Scene too similar to the last description
+OUTCOME_BUDGET = "budget"        # Global budget or in-flight cap exhausted
+OUTCOME_FAILED = "failed"        # Gemini call failed or timed out
+OUTCOME_CANCELLED = "cancelled"  # Request superseded by a newer, different frame
+OUTCOME_CACHED = "cached"        # Revisited scene answered from the session's cache, no call
+OUTCOME_DUPLICATE = "duplicate"  # Description only repeated recently spoken sentences
+OUTCOMES = (OUTCOME_SENT, OUTCOME_THROTTLED, OUTCOME_UNCHANGED, OUTCOME_BUDGET, OUTCOME_FAILED,
+            OUTCOME_CANCELLED, OUTCOME_CACHED, OUTCOME_DUPLICATE)
+
+LATENCY_WINDOW = 200  # Recent descriptions kept for latency percentiles
+
+
+class DescriptionScheduler:
+    """Global Gemini budget + per-session fair share for description calls"""
+
+    def __init__(self, calls_per_minute: float = 30.0, default_interval: float = 3.0,
+                 min_interval: float = 1.0, max_in_flight: int = 4):
+        self.rate = max(calls_per_minute, 0.1) / 60.0
+        self.default_interval = default_interval
+        self.min_interval = min_interval
+        self.max_in_flight = max(1, max_in_flight)
+
+        self._lock = threading.Lock()
+        self._tokens = float(self.max_in_flight)
+        self._last_refill = time.monotonic()
+        self.active_sessions = 0
+        self.in_flight = 0
+        self.outcomes: Dict[str, int] = {outcome: 0 for outcome in OUTCOMES}
+        self.first_chunk_ms = deque(maxlen=LATENCY_WINDOW)
+        self.total_ms = deque(maxlen=LATENCY_WINDOW)
+
+    # ============================================================
+    # Sessions
+    # ============================================================
+    def register(self):
+        with self._lock:
+            self.active_sessions += 1
+
+    def unregister(self):
+        with self._lock:
+            self.active_sessions = max(0, self.active_sessions - 1)
+
+    def clamp_interval(self, interval) -> float:
+        """Per-user interval requested by a client, bounded by min_interval"""
+        try:
+            return max(float(interval), self.min_interval)
+        except (TypeError, ValueError):
+            return self.default_interval
+
+    def fair_interval(self) -> float:
+        """Shortest interval per session that keeps all sessions within the budget"""
+        return max(1, self.active_sessions) / self.rate
+
+    def effective_interval(self, interval: float) -> float:
+        return max(interval, self.fair_interval())
+
+    # ============================================================
+    # Budget
+    # ============================================================
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(float(self.max_in_flight), self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def try_acquire(self) -> bool:
+        """Reserve one Gemini call (False = over budget, skip this frame)"""
+        with self._lock:
+            self._refill()
+            if self.in_flight >= self.max_in_flight or self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            self.in_flight += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+
+    def record(self, outcome: str):
+        with self._lock:
+            self.outcomes[outcome] += 1
+
+    def record_latency(self, first_chunk_ms: float, total_ms: float):
+        """Time to first chunk (= total when not streaming) and total time of a sent description"""
+        with self._lock:
+            self.first_chunk_ms.append(first_chunk_ms)
+            self.total_ms.append(total_ms)
+
+    @staticmethod
+    def _percentiles(values) -> Optional[Dict]:
+        if not values:
+            return None
+        values = np.asarray(values, dtype=np.float64)
+        return {
+            "p50_ms": round(float(np.percentile(values, 50)), 1),
+            "p95_ms": round(float(np.percentile(values, 95)), 1),
+        }
+
+    def get_stats(self) -> Dict:
+        offered = sum(self.outcomes.values())
+        return {
+            "active_sessions": self.active_sessions,
+            "calls_per_minute": round(self.rate * 60.0, 2),
+            "fair_interval": round(self.fair_interval(), 2),
+            "min_interval": self.min_interval,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "outcomes": dict(self.outcomes),
+            "sent_ratio": round(self.outcomes[OUTCOME_SENT] / offered, 3) if offered else None,
+            "time_to_first_chunk": self._percentiles(list(self.first_chunk_ms)),
+            "total_time": self._percentiles(list(self.total_ms)),
+        }
+
+
+description_scheduler = DescriptionScheduler(
+    calls_per_minute=config.DESCRIPTION_CALLS_PER_MINUTE,
+    default_interval=config.DESCRIPTION_INTERVAL,
+    min_interval=config.DESCRIPTION_MIN_INTERVAL,
+    max_in_flight=config.DESCRIPTION_MAX_IN_FLIGHT,
+)
@@ -1,49 +1,77 @@
-import cv2
-import numpy as np
-import os
+"""
+Real-time scene description engine.
+
+DescriptionEngine describes frames from any number of sources at once:
+
+    - pushed frames: engine.submit(name, frame) from any producer (a
+      WebSocket handler, a file reader, a test), BGR arrays or JPEG bytes
+    - capture sources: engine.add_capture(name, source) decodes a camera,
+      video file, stream URL or image directory with a FrameCapturer
+
+Each source has a latest-frame slot and a worker thread that sleeps on a
+condition / stop event until the source is due and a newer frame exists
+(no polling), checks it for a scene change (SceneChangeDetector) and
+describes it. A semaphore bounds the Gemini calls in flight across sources.
+Descriptions go to one bounded output queue that drops the oldest entry
+when full, so a consumer that stops reading never grows memory.
+
+Run headless on several sources for offline load testing, e.g.
+    python app/services/stream_video/realtime_main.py video1.mp4 frames/ --headless --dry-run --duration 60
+"""
+
+import argparse
 import base64
-import time
-import threading
-from queue import Queue
+import os
 import sys
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 from config import config
-from langchain_google_genai import ChatGoogleGenerativeAI
+from utils.frame_capture import FrameCapturer, VideoSource, open_source
+from utils.image_prep import prepare_frame, prepare_image
+from utils.scene_change import SceneChangeDetector
+
+OUTPUT_QUEUE_SIZE = 100   # Descriptions kept for consumers (oldest dropped first)
+RECHECK_INTERVAL = 0.5    # Seconds before an unchanged source is checked again
+MAX_CONCURRENT_CALLS = 4  # Gemini calls in flight across all sources
+LATENCY_WINDOW = 200      # Recent descriptions kept per source for latency percentiles
 
-# Initialize Gemini client
-gemini_client = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    temperature=0.3,
-    google_api_key=config.GOOGLE_API_KEY
-)
+Frame = Union[np.ndarray, bytes]
 
-# Global variables
-description_queue = Queue()  # Queue for descriptions to send to frontend
-current_frame = None
-previous_frame = None
-is_running = True
+
+@lru_cache(maxsize=1)
+def get_gemini_client():
+    """Gemini client, created (and LangChain imported) on first use"""
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(
+        model="gemini-2.5-flash",
+        temperature=0.3,
+        google_api_key=config.GOOGLE_API_KEY
+    )
 
 
 def encode_image_from_frame(frame):
-    """Encode OpenCV frame to base64 JPEG"""
+    """Encode OpenCV frame to base64 JPEG (resized / re-encoded with the real-time profile)"""
+    if config.LLM_IMAGE_PREP:
+        return base64.b64encode(prepare_frame(frame, "realtime_description")).decode('utf-8')
     _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 70])
     return base64.b64encode(buffer).decode('utf-8')
 
 
-def detect_significant_change(frame1, frame2, threshold=0.15):
-    """Detect if there's significant change between two frames"""
-    if frame1 is None or frame2 is None:
-        return True
-    
-    # Resize for faster comparison
-    frame1_small = cv2.resize(frame1, (320, 240))
-    frame2_small = cv2.resize(frame2, (320, 240))
-    
-    # Calculate difference
-    diff = cv2.absdiff(frame1_small, frame2_small)
-    change_ratio = np.sum(diff > 30) / diff.size
-    
-    return change_ratio > threshold
+def encode_image(frame: Frame) -> str:
+    """Base64 JPEG of a BGR frame or of JPEG bytes"""
+    if isinstance(frame, np.ndarray):
+        return encode_image_from_frame(frame)
+    if config.LLM_IMAGE_PREP:
+        frame = prepare_image(frame, "realtime_description").data
+    return base64.b64encode(frame).decode('utf-8')
 
 
 def create_vision_message(base64_image):
@@ -70,150 +98,356 @@ def analyze_image(base64_image):
     """Analyze image using Gemini and return description"""
     try:
         messages = create_vision_message(base64_image)
-        
+
         # Invoke Gemini
-        response = gemini_client.invoke(messages)
-        
+        response = get_gemini_client().invoke(messages)
+
         description = response.content.strip()
         print(f"[DESCRIPTION] {description}")
-        print()  # New line
-        
+
         return description
     except Exception as e:
         print(f"[ERROR] Gemini analysis failed: {e}")
         return None
 
 
-def capture_video_stream():
-    """Capture video frames continuously"""
-    global current_frame, is_running
-    
-    print("[VIDEO] Starting camera...")
-    cap = cv2.VideoCapture(0)  # 0 for webcam, or video file path
-    
-    if not cap.isOpened():
-        print("[ERROR] Cannot open camera")
-        return
-    
-    # Set camera properties for better performance
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-    cap.set(cv2.CAP_PROP_FPS, 30)
-    
-    print("[VIDEO] Camera opened successfully")
-    
-    while is_running:
-        ret, frame = cap.read()
-        if ret:
-            current_frame = frame.copy()
-            
-            # Optional: Display preview window
-            cv2.imshow('Real-time Description (Press Q to quit)', frame)
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                is_running = False
+def dry_run_describer(latency: float = 1.0) -> Callable[[str], str]:
+    """Stand-in for analyze_image that sleeps instead of calling Gemini (load testing)"""
+    def describe(base64_image):
+        time.sleep(latency)
+        return f"Dry-run description of a {len(base64_image) * 3 // 4} byte frame."
+    return describe
+
+
+class DropOldestQueue:
+    """Bounded FIFO: put() never blocks, a full queue drops its oldest item"""
+
+    def __init__(self, maxsize: int = OUTPUT_QUEUE_SIZE):
+        self._items = deque(maxlen=max(1, maxsize))
+        self._not_empty = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item):
+        with self._not_empty:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._not_empty.notify()
+
+    def get(self, timeout: Optional[float] = None):
+        """Oldest item, waiting up to timeout seconds (None if still empty)"""
+        with self._not_empty:
+            if not self._not_empty.wait_for(lambda: self._items, timeout):
+                return None
+            return self._items.popleft()
+
+    def get_nowait(self):
+        with self._not_empty:
+            return self._items.popleft() if self._items else None
+
+    def __len__(self):
+        return len(self._items)
+
+
+class FrameSlot:
+    """Latest pushed frame of a source (same wait_for_frame() contract as FrameCapturer)"""
+
+    def __init__(self):
+        self._slot: Tuple[int, Optional[Frame]] = (0, None)
+        self._new_frame = threading.Condition()
+        self._closed = False
+        self.frames_received = 0
+
+    def put(self, frame: Frame):
+        with self._new_frame:
+            self._slot = (self._slot[0] + 1, frame)
+            self.frames_received += 1
+            self._new_frame.notify_all()
+
+    def close(self):
+        with self._new_frame:
+            self._closed = True
+            self._new_frame.notify_all()
+
+    @property
+    def is_running(self) -> bool:
+        return not self._closed
+
+    def wait_for_frame(self, after: int = 0, timeout: Optional[float] = None) -> Tuple[Optional[int], Optional[Frame]]:
+        with self._new_frame:
+            if not self._new_frame.wait_for(lambda: self._slot[0] > after or self._closed, timeout):
+                return None, None
+            if self._slot[0] <= after:
+                return None, None
+            return self._slot
+
+    def get_stats(self) -> dict:
+        return {"frames_received": self.frames_received}
+
+
+class DescriptionSource:
+    """Per-source state: frame feed, change detector, schedule, counters"""
+
+    def __init__(self, name: str, feed, interval: float, change_threshold: float):
+        self.name = name
+        self.feed = feed  # FrameSlot or FrameCapturer
+        self.interval = interval
+        self.change_detector = SceneChangeDetector(change_threshold)
+        self.next_check_time = 0.0
+        self.thread: Optional[threading.Thread] = None
+        self.described = 0
+        self.unchanged = 0
+        self.failed = 0
+        self.frames_checked = 0
+        self.latency_ms = deque(maxlen=LATENCY_WINDOW)
+
+    def get_stats(self) -> dict:
+        latencies = np.asarray(self.latency_ms, dtype=np.float64)
+        return {
+            "interval": self.interval,
+            "frames_checked": self.frames_checked,
+            "described": self.described,
+            "unchanged": self.unchanged,
+            "failed": self.failed,
+            "latency_p50_ms": round(float(np.percentile(latencies, 50)), 1) if latencies.size else None,
+            "latency_p95_ms": round(float(np.percentile(latencies, 95)), 1) if latencies.size else None,
+            "feed": self.feed.get_stats(),
+            "change_detection": self.change_detector.get_stats(),
+        }
+
+
+class DescriptionEngine:
+    """
+    Describes frames from many sources on worker threads into one bounded
+    output queue. describe takes a base64 JPEG and returns text or None
+    (analyze_image by default, dry_run_describer() for offline tests).
+    """
+
+    def __init__(self, describe: Callable[[str], Optional[str]] = analyze_image,
+                 interval: float = config.DESCRIPTION_INTERVAL,
+                 change_threshold: float = config.DESCRIPTION_CHANGE_THRESHOLD,
+                 max_concurrent: int = MAX_CONCURRENT_CALLS,
+                 queue_size: int = OUTPUT_QUEUE_SIZE):
+        self.describe = describe
+        self.interval = interval
+        self.change_threshold = change_threshold
+        self.output = DropOldestQueue(queue_size)
+        self.sources: Dict[str, DescriptionSource] = {}
+        self._calls = threading.BoundedSemaphore(max(1, max_concurrent))
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    # ============================================================
+    # Sources
+    # ============================================================
+    def _add(self, name: str, feed, interval: Optional[float]) -> DescriptionSource:
+        with self._lock:
+            if name in self.sources:
+                raise ValueError(f"Source already exists: {name}")
+            source = DescriptionSource(name, feed, self.interval if interval is None else interval,
+                                       self.change_threshold)
+            self.sources[name] = source
+        source.thread = threading.Thread(target=self._run_source, args=(source,),
+                                         name=f"describe-{name}", daemon=True)
+        source.thread.start()
+        return source
+
+    def add_source(self, name: str, interval: Optional[float] = None) -> DescriptionSource:
+        """Source fed with submit(name, frame)"""
+        return self._add(name, FrameSlot(), interval)
+
+    def add_capture(self, name: str, source: Union[str, int] = 0, fps: Optional[float] = None,
+                    loop: bool = True, interval: Optional[float] = None) -> DescriptionSource:
+        """Source decoded by a FrameCapturer (camera index, video, stream URL, image directory)"""
+        frame_source = open_source(source, loop=loop, fps=fps)
+        if isinstance(frame_source, VideoSource) and frame_source.live:
+            # Set camera properties for better performance
+            frame_source.properties = {
+                cv2.CAP_PROP_FRAME_WIDTH: 640,
+                cv2.CAP_PROP_FRAME_HEIGHT: 480,
+                cv2.CAP_PROP_FPS: 30,
+            }
+        capturer = FrameCapturer(frame_source, fps=fps, name=f"capture-{name}").start()
+        return self._add(name, capturer, interval)
+
+    def submit(self, name: str, frame: Frame):
+        """Offer the newest frame of a pushed source (BGR array or JPEG bytes)"""
+        self.sources[name].feed.put(frame)
+
+    def remove_source(self, name: str, timeout: float = 5.0):
+        with self._lock:
+            source = self.sources.pop(name, None)
+        if source is not None:
+            self._close_feed(source)
+            source.thread.join(timeout)
+
+    @staticmethod
+    def _close_feed(source: DescriptionSource):
+        if isinstance(source.feed, FrameCapturer):
+            source.feed.stop()
+        else:
+            source.feed.close()
+
+    # ============================================================
+    # Worker
+    # ============================================================
+    def _run_source(self, source: DescriptionSource):
+        print(f"[PROCESS] Describing source {source.name}")
+        last_sequence = 0
+        while not self._stop_event.is_set():
+            # Not due yet: sleep until due (woken early by stop())
+            wait = source.next_check_time - time.monotonic()
+            if wait > 0 and self._stop_event.wait(wait):
                 break
+
+            sequence, frame = source.feed.wait_for_frame(last_sequence, timeout=1.0)
+            if sequence is None:
+                if not source.feed.is_running:
+                    break  # Source ended or was removed
+                continue
+            last_sequence = sequence
+
+            try:
+                self._process(source, frame)
+            except Exception as e:
+                source.failed += 1
+                source.next_check_time = time.monotonic() + RECHECK_INTERVAL
+                print(f"[PROCESS ERROR] {source.name}: {e}")
+        print(f"[PROCESS] Source {source.name} stopped")
+
+    def _process(self, source: DescriptionSource, frame: Frame):
+        source.frames_checked += 1
+        if isinstance(frame, np.ndarray):
+            changed, similarity, fingerprint = source.change_detector.check_frame(frame)
         else:
-            print("[VIDEO] Failed to capture frame")
-            time.sleep(0.1)
-    
-    cap.release()
+            changed, similarity, fingerprint = source.change_detector.check(frame)
+        if not changed:
+            source.unchanged += 1
+            source.next_check_time = time.monotonic() + RECHECK_INTERVAL
+            return
+
+        started = time.monotonic()
+        source.next_check_time = started + source.interval
+        base64_image = encode_image(frame)
+        with self._calls:
+            description = self.describe(base64_image)
+        if not description:
+            source.failed += 1
+            return
+
+        latency_ms = (time.monotonic() - started) * 1000.0
+        source.latency_ms.append(latency_ms)
+        source.change_detector.accept(fingerprint)
+        source.described += 1
+        self.output.put({
+            "source": source.name,
+            "timestamp": time.time(),
+            "description": description,
+            "similarity": round(similarity, 3) if similarity is not None else None,
+            "latency_ms": round(latency_ms, 1),
+        })
+
+    # ============================================================
+    # Output / lifecycle
+    # ============================================================
+    def get_description(self, timeout: Optional[float] = None):
+        """Oldest undelivered description, waiting up to timeout seconds (None if none)"""
+        return self.output.get(timeout)
+
+    def get_latest_description(self):
+        """Oldest undelivered description (non-blocking)"""
+        return self.output.get_nowait()
+
+    @property
+    def is_running(self) -> bool:
+        return not self._stop_event.is_set() and any(
+            source.thread.is_alive() for source in list(self.sources.values()))
+
+    def stop(self, timeout: float = 5.0):
+        self._stop_event.set()
+        sources = list(self.sources.values())
+        for source in sources:
+            self._close_feed(source)
+        for source in sources:
+            source.thread.join(timeout)
+
+    def get_stats(self) -> dict:
+        return {
+            "sources": {name: source.get_stats() for name, source in list(self.sources.items())},
+            "queued": len(self.output),
+            "dropped": self.output.dropped,
+        }
+
+
+def show_preview(engine: DescriptionEngine, name: str):
+    """Display the latest frame of a capture source (main thread) until 'q' or the engine stops"""
+    capturer = engine.sources[name].feed
+    last_sequence = 0
+    while engine.is_running:
+        sequence, frame = capturer.wait_for_frame(last_sequence, timeout=1.0)
+        if sequence is None:
+            continue
+        last_sequence = sequence
+
+        cv2.imshow('Real-time Description (Press Q to quit)', frame)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+
     cv2.destroyAllWindows()
-    print("[VIDEO] Camera stopped")
-
-
-def process_frames():
-    """Process frames and generate descriptions"""
-    global current_frame, previous_frame, is_running
-    
-    print("[PROCESS] Starting frame processor...")
-    last_description_time = 0
-    description_interval = 3  # Describe every 3 seconds
-    
-    while is_running:
-        try:
-            # Wait for frame to be available
-            if current_frame is None:
-                time.sleep(0.5)
-                continue
-            
-            current_time = time.time()
-            
-            # Check if enough time has passed
-            if current_time - last_description_time < description_interval:
-                time.sleep(0.5)
-                continue
-            
-            # Check for significant change
-            if not detect_significant_change(previous_frame, current_frame):
-                print("[PROCESS] No significant change detected, skipping...")
-                time.sleep(1)
-                continue
-            
-            # Process frame
-            frame_to_process = current_frame.copy()
-            previous_frame = frame_to_process.copy()
-            
-            print(f"\n[PROCESS] Analyzing frame at {time.strftime('%H:%M:%S')}...")
-            base64_image = encode_image_from_frame(frame_to_process)
-            
-            # Analyze image
-            description = analyze_image(base64_image)
-            
-            if description:
-                # Put description in queue for WebSocket/API to consume
-                description_queue.put({
-                    "timestamp": time.time(),
-                    "description": description
-                })
-                last_description_time = current_time
-            
-        except Exception as e:
-            print(f"[PROCESS ERROR] {e}")
-            time.sleep(1)
-    
-    print("[PROCESS] Frame processor stopped")
-
-
-def get_latest_description():
-    """Get latest description from queue (non-blocking)"""
-    try:
-        return description_queue.get_nowait()
-    except:
-        return None
+
+
+def print_descriptions(engine: DescriptionEngine, until: Optional[float]):
+    """Headless: print descriptions as they arrive until the deadline or the engine stops"""
+    while engine.is_running and (until is None or time.monotonic() < until):
+        item = engine.get_description(timeout=0.5)
+        if item is not None:
+            print(f"[{item['source']}] ({item['latency_ms']:.0f} ms) {item['description']}")
 
 
 def main():
-    """Main function to run real-time description"""
-    global is_running
-    
+    """Run real-time description on one or more sources"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sources", nargs="*", default=["0"],
+                        help="Camera index, video file, stream URL or image directory (default: camera 0)")
+    parser.add_argument("--headless", action="store_true", help="No preview window")
+    parser.add_argument("--interval", type=float, default=config.DESCRIPTION_INTERVAL)
+    parser.add_argument("--fps", type=float, default=None, help="Pace file sources at this rate")
+    parser.add_argument("--duration", type=float, default=None, help="Headless: stop after this many seconds")
+    parser.add_argument("--max-concurrent", type=int, default=MAX_CONCURRENT_CALLS)
+    parser.add_argument("--dry-run", action="store_true", help="Do not call Gemini (load testing)")
+    parser.add_argument("--dry-run-latency", type=float, default=1.0)
+    args = parser.parse_args()
+
+    describe = dry_run_describer(args.dry_run_latency) if args.dry_run else analyze_image
+    engine = DescriptionEngine(describe=describe, interval=args.interval, max_concurrent=args.max_concurrent)
+
     print("="*60)
     print("🎥 REAL-TIME SCENE DESCRIPTION (Backend Only)")
     print("="*60)
-    print("Camera will start automatically.")
-    print("Descriptions generated every 3 seconds when changes detected.")
-    print("Descriptions available via get_latest_description() for WebSocket/API.")
+    print(f"Sources: {', '.join(args.sources)}")
+    print(f"Descriptions generated every {args.interval:g} seconds per source when changes detected.")
     print("Press 'Q' in video window or Ctrl+C to stop.")
     print("="*60)
     print()
-    
-    # Create threads
-    video_thread = threading.Thread(target=capture_video_stream, daemon=True)
-    process_thread = threading.Thread(target=process_frames, daemon=True)
-    
+
+    until = time.monotonic() + args.duration if args.duration else None
     try:
-        # Start all threads
-        video_thread.start()
-        time.sleep(1)  # Wait for camera to initialize
-        process_thread.start()
-        
-        # Keep main thread alive
-        video_thread.join()
-        
+        for index, source in enumerate(args.sources):
+            engine.add_capture(f"source{index}", source, fps=args.fps)
+        if args.headless:
+            print_descriptions(engine, until)
+        else:
+            # Preview of the first source runs on the main thread; descriptions are printed by analyze_image
+            show_preview(engine, "source0")
     except KeyboardInterrupt:
         print("\n[MAIN] Stopping...")
     finally:
-        is_running = False
-        time.sleep(2)  # Wait for threads to finish
+        engine.stop()
+        stats = engine.get_stats()
+        for name, source_stats in stats["sources"].items():
+            print(f"[STATS] {name}: described={source_stats['described']} unchanged={source_stats['unchanged']} "
+                  f"failed={source_stats['failed']} p50={source_stats['latency_p50_ms']} ms")
+        print(f"[STATS] queue dropped={stats['dropped']}")
         print("[MAIN] Application stopped")
 
 
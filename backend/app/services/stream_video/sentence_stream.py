@@ -0,0 +1,63 @@
+"""
+Split streamed LLM text into partial chunks with sentence boundaries marked.
+
+Tokens are forwarded as soon as they arrive, but a chunk never spans two
+sentences, and the chunk that completes a sentence carries the full
+sentence text so a client can start speaking it right away. A terminator at
+the very end of the received text (e.g. "3." in "3.5 meters") is held back
+until the next token shows whether it really ends the sentence.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+# Terminator run, optional closing quotes/brackets, then whitespace
+SENTENCE_BOUNDARY = re.compile(r"[.!?…]+[\"'”’)\]]*\s+")
+TRAILING_TERMINATOR = re.compile(r"[.!?…]+[\"'”’)\]]*$")
+
+# (chunk text, completed sentence or None)
+Piece = Tuple[str, Optional[str]]
+
+
+class SentenceStream:
+    """Feed streamed text in, get (chunk, completed sentence) pieces out"""
+
+    def __init__(self):
+        self._sentence = ""  # Text of the current sentence emitted so far
+        self._held = ""      # Received but not emitted (possible boundary)
+        self.sentences: List[str] = []
+
+    def feed(self, text: str) -> List[Piece]:
+        buffer = self._held + text
+        pieces: List[Piece] = []
+        position = 0
+        for match in SENTENCE_BOUNDARY.finditer(buffer):
+            pieces.append(self._emit(buffer[position:match.end()], end_sentence=True))
+            position = match.end()
+
+        rest = buffer[position:]
+        trailing = TRAILING_TERMINATOR.search(rest)
+        cut = trailing.start() if trailing else len(rest)
+        if cut:
+            pieces.append(self._emit(rest[:cut], end_sentence=False))
+        self._held = rest[cut:]
+        return pieces
+
+    def flush(self) -> List[Piece]:
+        """End of stream: whatever is left completes the last sentence"""
+        held, self._held = self._held, ""
+        if not (self._sentence + held).strip():
+            return []
+        return [self._emit(held, end_sentence=True)]
+
+    def _emit(self, text: str, end_sentence: bool) -> Piece:
+        self._sentence += text
+        if not end_sentence:
+            return text, None
+        sentence, self._sentence = self._sentence.strip(), ""
+        self.sentences.append(sentence)
+        return text, sentence
+
+    @property
+    def text(self) -> str:
+        return " ".join(self.sentences)
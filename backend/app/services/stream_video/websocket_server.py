@@ -8,30 +8,55 @@ from fastapi.responses import JSONResponse
 import asyncio
 import json
 import base64
-import numpy as np
-import cv2
+import time
 from datetime import datetime
+from functools import lru_cache
+from typing import Optional
 
 # Import the analysis function from realtime_main
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 from config import config
-from langchain_google_genai import ChatGoogleGenerativeAI
-
-# Initialize Gemini client
-gemini_client = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    temperature=0.3,
-    google_api_key=config.GOOGLE_API_KEY
+from app.utils.frame_protocol import (
+    MESSAGE_TYPE_FRAME,
+    PROTOCOL_BINARY,
+    FrameProtocolError,
+    negotiate_protocol,
+    unpack_frame,
+)
+from app.utils.image_prep import prepare_image
+from app.utils.scene_change import SceneChangeDetector, compare, fingerprint_jpeg
+from app.services.stream_video.sentence_stream import SentenceStream
+from app.services.stream_video.description_memory import DescriptionMemory
+from app.services.stream_video.description_scheduler import (
+    OUTCOME_BUDGET,
+    OUTCOME_CACHED,
+    OUTCOME_CANCELLED,
+    OUTCOME_DUPLICATE,
+    OUTCOME_FAILED,
+    OUTCOME_SENT,
+    OUTCOME_THROTTLED,
+    OUTCOME_UNCHANGED,
+    OUTCOMES,
+    description_scheduler,
 )
 
+
+@lru_cache(maxsize=1)
+def get_gemini_client():
+    """Gemini client, created (and LangChain imported) on first use"""
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(
+        model="gemini-2.5-flash",
+        temperature=0.3,
+        google_api_key=config.GOOGLE_API_KEY
+    )
+
+
 class ConnectionManager:
     def __init__(self):
         self.active_connections: list[WebSocket] = []
-        self.last_frame = None
-        self.last_description_time = 0
-        self.description_interval = 3  # seconds
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
@@ -64,6 +89,8 @@ class ConnectionManager:
             self.disconnect(conn)
 
 manager = ConnectionManager()
+# websocket -> DescriptionSession
+sessions: dict = {}
 
 
 def create_vision_message(base64_image):
@@ -86,51 +113,418 @@ def create_vision_message(base64_image):
     ]
 
 
-async def analyze_frame(base64_image: str) -> str:
-    """Analyze image using Gemini and return description"""
+async def analyze_frame(base64_image: str, timeout: Optional[float] = None) -> str:
+    """
+    Analyze image using Gemini and return description.
+    The call is awaited (never blocks the event loop) and gives up after
+    timeout seconds (DESCRIPTION_TIMEOUT by default). Cancelling the calling
+    task cancels the request.
+    """
+    timeout = config.DESCRIPTION_TIMEOUT if timeout is None else timeout
     try:
         messages = create_vision_message(base64_image)
         
         # Invoke Gemini
-        response = gemini_client.invoke(messages)
+        response = await asyncio.wait_for(get_gemini_client().ainvoke(messages), timeout=timeout)
         
         description = response.content.strip()
         print(f"[DESCRIPTION] {description}")
         
         return description
+    except asyncio.TimeoutError:
+        print(f"[ERROR] Gemini analysis timed out after {timeout:.1f}s")
+        return None
     except Exception as e:
         print(f"[ERROR] Gemini analysis failed: {e}")
         return None
 
 
-def detect_significant_change(frame1_b64, frame2_b64, threshold=0.15):
-    """Detect if there's significant change between two frames"""
-    if frame1_b64 is None or frame2_b64 is None:
-        return True
-    
-    try:
-        # Decode base64 to numpy arrays
-        frame1_data = base64.b64decode(frame1_b64)
-        frame2_data = base64.b64decode(frame2_b64)
-        
-        frame1 = cv2.imdecode(np.frombuffer(frame1_data, np.uint8), cv2.IMREAD_COLOR)
-        frame2 = cv2.imdecode(np.frombuffer(frame2_data, np.uint8), cv2.IMREAD_COLOR)
-        
-        if frame1 is None or frame2 is None:
-            return True
-        
-        # Resize for faster comparison
-        frame1_small = cv2.resize(frame1, (320, 240))
-        frame2_small = cv2.resize(frame2, (320, 240))
-        
-        # Calculate difference
-        diff = cv2.absdiff(frame1_small, frame2_small)
-        change_ratio = np.sum(diff > 30) / diff.size
-        
-        return change_ratio > threshold
-    except Exception as e:
-        print(f"[ERROR] Change detection failed: {e}")
-        return True
+def chunk_text(chunk) -> str:
+    """Text of a streamed message chunk (content may be a list of parts)"""
+    content = chunk.content
+    if isinstance(content, list):
+        return "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    return content or ""
+
+
+def parse_bool(value) -> bool:
+    if isinstance(value, str):
+        return value.lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
+def split_sentences(text: str) -> list:
+    sentences = SentenceStream()
+    sentences.feed(text)
+    sentences.flush()
+    return sentences.sentences
+
+
+def to_jpeg_bytes(frame_data):
+    """Raw JPEG bytes from a base64 string or a binary-protocol payload"""
+    if isinstance(frame_data, str):
+        return base64.b64decode(frame_data)
+    return frame_data
+
+
+def frame_fingerprint(frame_data):
+    """Scene fingerprint of a base64 or binary frame (base64 + JPEG decode; run off the event loop)"""
+    return fingerprint_jpeg(to_jpeg_bytes(frame_data))
+
+
+def to_base64(frame_data) -> str:
+    """Base64 JPEG for the Gemini data URL (binary payloads are encoded here)"""
+    if isinstance(frame_data, str):
+        return frame_data
+    return base64.b64encode(frame_data).decode("utf-8")
+
+
+class DescriptionSession:
+    """
+    Per-connection real-time description state.
+
+    The receive loop drops each frame into a single "latest" slot. A worker
+    task waits until the session is due (its own interval, stretched to its
+    fair share of the Gemini budget, see description_scheduler.py), checks
+    the newest frame for a scene change and describes it. Frames replaced in
+    the slot while waiting count as throttled. At most one Gemini request per
+    session is pending; it is cancelled as soon as a newer frame shows a
+    different scene, and the newer frame is described instead. Frames are
+    fingerprinted in a worker thread, once per frame.
+
+    With streaming on, the description is sent as description_partial
+    chunks while Gemini generates it (sentence ends marked, see
+    sentence_stream.py), followed by the usual final description message.
+
+    Sentences repeating what was said recently are not spoken again, and a
+    scene seen before is answered from the session's cache without a Gemini
+    call (see description_memory.py).
+    """
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.change_detector = SceneChangeDetector(config.DESCRIPTION_CHANGE_THRESHOLD)
+        self.interval = description_scheduler.default_interval
+        self.stream = config.DESCRIPTION_STREAMING
+        self.dedup = config.DESCRIPTION_DEDUP
+        self.memory = DescriptionMemory(
+            similarity_threshold=config.DESCRIPTION_DEDUP_THRESHOLD,
+            window_seconds=config.DESCRIPTION_DEDUP_WINDOW,
+            cache_size=config.DESCRIPTION_CACHE_SIZE,
+            cache_similarity=config.DESCRIPTION_CACHE_THRESHOLD,
+        )
+        self.last_description_time = 0.0  # Wall clock, reported to clients
+        self.next_request_time = 0.0      # Monotonic, used for scheduling
+        self.pending: Optional[asyncio.Task] = None
+        self._pending_fingerprint = None  # Fingerprint of the frame being described
+        self.frames_received = 0
+        self.outcomes = {outcome: 0 for outcome in OUTCOMES}
+        self._frame = None
+        self._frame_ready = asyncio.Event()    # A frame is waiting (for the worker loop)
+        self._frame_arrived = asyncio.Event()  # A frame came in (for the staleness check)
+        self._fingerprinted = None  # (frame, fingerprint) of the last frame fingerprinted
+        self._worker: Optional[asyncio.Task] = None
+        self._partials_sent = 0  # Of the current request
+        self._first_chunk_time: Optional[float] = None
+        self._new_sentences: list = []  # Of the current request, not said recently
+
+        # ?change_threshold=0.8&interval=5&stream=false&dedup=false in the connect URL
+        self.configure(websocket.query_params)
+        description_scheduler.register()
+
+    def start(self):
+        self._worker = asyncio.create_task(self._process_loop())
+
+    def submit(self, frame_data):
+        """Offer a new frame; replaces (throttles) a frame still waiting"""
+        self.frames_received += 1
+        if self._frame is not None:
+            self.record(OUTCOME_THROTTLED)
+        # Copy binary payloads out of the receive buffer
+        self._frame = frame_data if isinstance(frame_data, str) else bytes(frame_data)
+        self._frame_ready.set()
+        self._frame_arrived.set()
+
+    async def _fingerprint(self, frame_data):
+        """Fingerprint of a frame, computed in a worker thread and reused for the same frame"""
+        if self._fingerprinted is not None and self._fingerprinted[0] is frame_data:
+            return self._fingerprinted[1]
+        fingerprint = await asyncio.to_thread(frame_fingerprint, frame_data)
+        self._fingerprinted = (frame_data, fingerprint)
+        return fingerprint
+
+    async def is_stale(self, frame_data) -> bool:
+        """Is the frame being described significantly different from frame_data?"""
+        fingerprint = await self._fingerprint(frame_data)
+        if fingerprint is None or self._pending_fingerprint is None:
+            return False
+        return compare(self._pending_fingerprint, fingerprint) < self.change_detector.threshold
+
+    async def _wait_unless_stale(self, task: asyncio.Task):
+        """Wait for a description request; cancel it once a newer frame shows a different scene"""
+        self._frame_arrived.clear()
+        while not task.done():
+            arrived = asyncio.ensure_future(self._frame_arrived.wait())
+            try:
+                # wait() does not raise when the request is cancelled
+                await asyncio.wait({task, arrived}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                arrived.cancel()
+            if task.done():
+                break
+            # Frames arriving during the check are coalesced: the newest is checked next
+            self._frame_arrived.clear()
+            frame_data = self._frame
+            if frame_data is not None and await self.is_stale(frame_data) and not task.done():
+                print("[PROCESS] Scene changed, cancelling stale description request")
+                task.cancel()
+
+    def configure(self, options) -> dict:
+        """Apply per-user settings: change_threshold (0-1), interval (seconds), stream, dedup (bool)"""
+        if options.get("change_threshold") is not None:
+            try:
+                self.change_detector.set_threshold(options.get("change_threshold"))
+            except (TypeError, ValueError):
+                pass
+        if options.get("interval") is not None:
+            self.interval = description_scheduler.clamp_interval(options.get("interval"))
+        if options.get("stream") is not None:
+            self.stream = parse_bool(options.get("stream"))
+        if options.get("dedup") is not None:
+            self.dedup = parse_bool(options.get("dedup"))
+        return {
+            "interval": self.interval,
+            "stream": self.stream,
+            "dedup": self.dedup,
+            "effective_interval": round(description_scheduler.effective_interval(self.interval), 2),
+            "change_detection": self.change_detector.get_stats(),
+        }
+
+    def record(self, outcome: str):
+        self.outcomes[outcome] += 1
+        description_scheduler.record(outcome)
+
+    async def _process_loop(self):
+        while True:
+            await self._frame_ready.wait()
+
+            # Not due yet: sleep, newer frames replace the waiting one meanwhile
+            wait = self.next_request_time - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+
+            self._frame_ready.clear()
+            frame_data, self._frame = self._frame, None
+            if frame_data is None:
+                continue
+            await self._describe(frame_data)
+
+    async def _new_only(self, sentences: list) -> list:
+        """The sentences not said recently (all of them with dedup off)"""
+        if not self.dedup or not sentences:
+            return list(sentences)
+        is_new = await self.memory.filter_sentences_async(sentences)
+        return [sentence for sentence, new in zip(sentences, is_new) if new]
+
+    async def _describe(self, frame_data):
+        # Check for significant change against the last described frame
+        changed, similarity, fingerprint = self.change_detector.check_fingerprint(
+            await self._fingerprint(frame_data)
+        )
+        if not changed:
+            self.record(OUTCOME_UNCHANGED)
+            return
+
+        # Scene seen before: answer from the cache, no Gemini call and no budget used
+        cached = self.memory.lookup(fingerprint)
+        if cached:
+            await self._answer_from_cache(cached, fingerprint, similarity)
+            return
+
+        if not description_scheduler.try_acquire():
+            self.record(OUTCOME_BUDGET)
+            return
+
+        started = time.monotonic()
+        self.next_request_time = started + description_scheduler.effective_interval(self.interval)
+        current_time = datetime.now().timestamp()
+        print(f"[PROCESS] Analyzing frame at {datetime.now().strftime('%H:%M:%S')}...")
+        self._partials_sent = 0
+        self._first_chunk_time = None
+        self._new_sentences = []
+        if config.LLM_IMAGE_PREP:
+            # Whatever resolution the browser sent, Gemini gets the real-time profile
+            prepared = await asyncio.to_thread(prepare_image, to_jpeg_bytes(frame_data), "realtime_description")
+            frame_data = prepared.data
+        base64_image = to_base64(frame_data)
+        if self.stream:
+            task = asyncio.ensure_future(self._stream_description(base64_image, current_time))
+        else:
+            task = asyncio.ensure_future(analyze_frame(base64_image))
+        self.pending, self._pending_fingerprint = task, fingerprint
+        try:
+            await self._wait_unless_stale(task)
+        finally:
+            if not task.done():
+                task.cancel()  # The session itself is closing
+            self.pending, self._pending_fingerprint = None, None
+            description_scheduler.release()
+
+        if task.cancelled():
+            # Superseded by a newer scene: describe it after the minimum interval
+            # instead of the full one (the global budget still applies)
+            self.record(OUTCOME_CANCELLED)
+            self.next_request_time = started + description_scheduler.min_interval
+            if self._partials_sent:
+                # Lets the client stop speaking the stale description
+                await manager.send_personal_message({
+                    "type": "description_cancelled",
+                    "timestamp": current_time
+                }, self.websocket)
+            return
+
+        description = task.result()
+        if description:
+            total_ms = (time.monotonic() - started) * 1000.0
+            first_chunk_ms = ((self._first_chunk_time - started) * 1000.0
+                              if self._first_chunk_time is not None else total_ms)
+            description_scheduler.record_latency(first_chunk_ms, total_ms)
+
+            # Update state: only the fingerprint of the described frame is kept
+            self.change_detector.accept(fingerprint)
+            self.memory.remember_scene(fingerprint, description)
+            self.last_description_time = current_time
+
+            # Streamed sentences were checked as they completed
+            sentences = split_sentences(description)
+            if self.stream:
+                new_sentences = self._new_sentences
+            else:
+                new_sentences = await self._new_only(sentences)
+            if not new_sentences:
+                self.record(OUTCOME_DUPLICATE)
+                print("[PROCESS] Description repeats recent ones, not spoken")
+                if self._partials_sent:
+                    await manager.send_personal_message({
+                        "type": "description_duplicate",
+                        "timestamp": current_time
+                    }, self.websocket)
+                return
+
+            shortened = len(new_sentences) < len(sentences)
+            self.record(OUTCOME_SENT)
+            await manager.send_personal_message({
+                "type": "description",
+                "text": " ".join(new_sentences) if shortened else description,
+                "shortened": shortened,
+                "similarity": round(similarity, 3) if similarity is not None else None,
+                "timestamp": current_time,
+                "first_chunk_ms": round(first_chunk_ms, 1),
+                "total_ms": round(total_ms, 1)
+            }, self.websocket)
+        else:
+            self.record(OUTCOME_FAILED)
+            await manager.send_personal_message({
+                "type": "error",
+                "message": "Failed to analyze frame"
+            }, self.websocket)
+
+    async def _answer_from_cache(self, cached: str, fingerprint, similarity):
+        self.change_detector.accept(fingerprint)
+        self.next_request_time = time.monotonic() + self.interval
+        sentences = split_sentences(cached)
+        new_sentences = await self._new_only(sentences)
+        if not new_sentences:
+            self.record(OUTCOME_DUPLICATE)
+            return
+        current_time = datetime.now().timestamp()
+        shortened = len(new_sentences) < len(sentences)
+        text = " ".join(new_sentences) if shortened else cached
+        self.last_description_time = current_time
+        self.record(OUTCOME_CACHED)
+        print(f"[DESCRIPTION] (cached) {text}")
+        await manager.send_personal_message({
+            "type": "description",
+            "text": text,
+            "cached": True,
+            "shortened": shortened,
+            "similarity": round(similarity, 3) if similarity is not None else None,
+            "timestamp": current_time
+        }, self.websocket)
+
+    async def _stream_description(self, base64_image: str, timestamp: float) -> Optional[str]:
+        """
+        Stream the description from Gemini, sending a description_partial
+        message per chunk; returns the full text (None on error / timeout).
+        """
+        sentences = SentenceStream()
+
+        async def consume():
+            async for chunk in get_gemini_client().astream(create_vision_message(base64_image)):
+                text = chunk_text(chunk)
+                if not text:
+                    continue
+                if self._first_chunk_time is None:
+                    self._first_chunk_time = time.monotonic()
+                await self._send_partials(sentences.feed(text), timestamp)
+            await self._send_partials(sentences.flush(), timestamp)
+
+        try:
+            await asyncio.wait_for(consume(), timeout=config.DESCRIPTION_TIMEOUT)
+        except asyncio.TimeoutError:
+            print(f"[ERROR] Gemini streaming timed out after {config.DESCRIPTION_TIMEOUT:.1f}s")
+            return None
+        except Exception as e:
+            print(f"[ERROR] Gemini streaming failed: {e}")
+            return None
+
+        description = sentences.text
+        print(f"[DESCRIPTION] {description}")
+        return description or None
+
+    async def _send_partials(self, pieces, timestamp: float):
+        for text, sentence in pieces:
+            message = {
+                "type": "description_partial",
+                "text": text,
+                "index": self._partials_sent,
+                "sentence_end": sentence is not None,
+                "timestamp": timestamp
+            }
+            if sentence is not None:
+                if await self._new_only([sentence]):
+                    self._new_sentences.append(sentence)
+                    message["sentence"] = sentence
+                else:
+                    # Said recently: the client shows it but does not speak it again
+                    message["duplicate"] = True
+            await manager.send_personal_message(message, self.websocket)
+            self._partials_sent += 1
+
+    async def close(self):
+        for task in (self._worker, self.pending):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        description_scheduler.unregister()
+
+    def get_stats(self) -> dict:
+        return {
+            "frames_received": self.frames_received,
+            "interval": self.interval,
+            "effective_interval": round(description_scheduler.effective_interval(self.interval), 2),
+            "stream": self.stream,
+            "dedup": self.dedup,
+            "last_description_time": self.last_description_time,
+            "pending": self.pending is not None,
+            "outcomes": dict(self.outcomes),
+            "change_detection": self.change_detector.get_stats(),
+            "memory": self.memory.get_stats(),
+        }
 
 
 async def websocket_realtime_description(websocket: WebSocket):
@@ -145,69 +539,104 @@ async def websocket_realtime_description(websocket: WebSocket):
         "timestamp": 1234567890
     }
     
-    Backend responds with:
+    or, when connected with ?protocol=binary, binary messages of a
+    frame_protocol header followed by the raw JPEG bytes.
+    
+    Each connection has its own DescriptionSession. A frame is only
+    described when the session is due and its similarity to the last
+    described frame is below the change threshold. Both can be set per user
+    in the connect URL (?interval=5&change_threshold=0.8) or at any time with
+    {"type": "config", "interval": 5, "change_threshold": 0.8}.
+    
+    Backend responds with (streaming on, the default; ?stream=false or
+    {"type": "config", "stream": false} turns it off) partial chunks as
+    Gemini generates them; the chunk completing a sentence has
+    sentence_end=true and the full sentence:
+    {
+        "type": "description_partial",
+        "text": "with a laptop. ",
+        "index": 3,
+        "sentence_end": true,
+        "sentence": "A desk with a laptop.",
+        "timestamp": 1234567890
+    }
+    
+    then the final message (same timestamp as its partials):
     {
         "type": "description",
         "text": "Scene description here",
-        "timestamp": 1234567890
+        "similarity": 0.62,
+        "timestamp": 1234567890,
+        "first_chunk_ms": 420.0,
+        "total_ms": 1350.0
     }
+    
+    If a request is cancelled for a newer scene after partials were sent,
+    {"type": "description_cancelled", "timestamp": 1234567890} follows.
+    
+    Sentences said in the last DESCRIPTION_DEDUP_WINDOW seconds are not
+    repeated (?dedup=false turns this off): a partial completing such a
+    sentence has "duplicate": true instead of "sentence", and the final text
+    only keeps new sentences ("shortened": true). If nothing is new, no
+    description is sent, or {"type": "description_duplicate", "timestamp": ...}
+    after partials. A scene seen before is answered from the session's cache
+    with "cached": true and no Gemini call.
     """
     await manager.connect(websocket)
+    protocol = negotiate_protocol(websocket)
+    session = DescriptionSession(websocket)
+    sessions[websocket] = session
+    session.start()
     
     try:
         # Send initial status
         await manager.send_personal_message({
             "type": "status",
-            "message": "Connected. Send frames to receive descriptions."
+            "message": "Connected. Send frames to receive descriptions.",
+            "protocol": protocol,
+            "interval": session.interval,
+            "change_threshold": session.change_detector.threshold
         }, websocket)
         
         while True:
             # Receive frame from frontend
-            data = await websocket.receive_text()
-            message = json.loads(data)
+            raw = await websocket.receive()
+            if raw["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(raw.get("code", 1000))
+            
+            if raw.get("bytes") is not None:
+                if protocol != PROTOCOL_BINARY:
+                    continue
+                try:
+                    frame = unpack_frame(raw["bytes"])
+                except FrameProtocolError as e:
+                    print(f"[WebSocket Error] Bad binary frame: {e}")
+                    continue
+                if frame.message_type != MESSAGE_TYPE_FRAME:
+                    continue
+                message = {"type": "frame", "data": frame.payload}
+            else:
+                message = json.loads(raw.get("text") or "{}")
             
             if message.get("type") == "frame":
-                base64_image = message.get("data")
-                current_time = datetime.now().timestamp()
+                image_data = message.get("data")
                 
-                if not base64_image:
+                if image_data is None or len(image_data) == 0:
                     await manager.send_personal_message({
                         "type": "error",
                         "message": "No image data received"
                     }, websocket)
                     continue
                 
-                # Check if enough time has passed since last description
-                time_since_last = current_time - manager.last_description_time
-                if time_since_last < manager.description_interval:
-                    print(f"[THROTTLE] Skipping frame, {manager.description_interval - time_since_last:.1f}s remaining")
-                    continue
-                
-                # Check for significant change
-                if not detect_significant_change(manager.last_frame, base64_image):
-                    print("[PROCESS] No significant change detected, skipping...")
-                    continue
-                
-                # Analyze the frame
-                print(f"[PROCESS] Analyzing frame at {datetime.now().strftime('%H:%M:%S')}...")
-                description = await analyze_frame(base64_image)
-                
-                if description:
-                    # Update state
-                    manager.last_frame = base64_image
-                    manager.last_description_time = current_time
-                    
-                    # Send description back to client
-                    await manager.send_personal_message({
-                        "type": "description",
-                        "text": description,
-                        "timestamp": current_time
-                    }, websocket)
-                else:
-                    await manager.send_personal_message({
-                        "type": "error",
-                        "message": "Failed to analyze frame"
-                    }, websocket)
+                session.submit(image_data)
+            
+            elif message.get("type") == "config":
+                settings = session.configure(message)
+                await manager.send_personal_message({
+                    "type": "status",
+                    "message": "Configuration updated",
+                    **settings
+                }, websocket)
             
             elif message.get("action") == "stop":
                 await manager.send_personal_message({
@@ -217,10 +646,12 @@ async def websocket_realtime_description(websocket: WebSocket):
                 break
                 
     except WebSocketDisconnect:
-        manager.disconnect(websocket)
         print("[WebSocket] Client disconnected normally")
     except Exception as e:
         print(f"[WebSocket Error] {e}")
+    finally:
+        sessions.pop(websocket, None)
+        await session.close()
         manager.disconnect(websocket)
 
 
@@ -253,10 +684,13 @@ async def stop_realtime_description():
 
 async def get_description_status():
     """HTTP endpoint to check status"""
+    active = list(sessions.values())
     return JSONResponse(content={
         "is_running": len(manager.active_connections) > 0,
         "connected_clients": len(manager.active_connections),
-        "last_description_time": manager.last_description_time
+        "last_description_time": max((session.last_description_time for session in active), default=0),
+        "scheduler": description_scheduler.get_stats(),
+        "sessions": [session.get_stats() for session in active]
     })
 
 
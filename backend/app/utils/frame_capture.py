@@ -0,0 +1,301 @@
+"""
+Threaded frame capture shared by outdoor navigation and real-time description.
+
+FrameCapturer decodes frames from a source in its own thread and publishes
+them into a single "latest frame" slot tagged with a sequence number.
+Consumers ask for a frame newer than the last one they processed, so they
+never work on stale frames and never queue up behind the decoder; frames
+nobody picked up are simply overwritten.
+
+Sources:
+    - camera index (0, "0") or stream URL (rtsp://, http://): live, paced by the device
+    - video file: paced at the file's FPS (or fps=...), optionally looping
+    - directory of images: paced at fps (default DEFAULT_IMAGE_FPS), optionally looping
+"""
+
+import abc
+import glob
+import os
+import threading
+import time
+from typing import Iterator, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+DEFAULT_VIDEO_FPS = 30.0
+DEFAULT_IMAGE_FPS = 10.0
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+STREAM_SCHEMES = ("rtsp://", "rtmp://", "http://", "https://", "udp://", "tcp://")
+RECONNECT_DELAY = 1.0  # Seconds between reconnect attempts for live sources
+RECONNECT_ATTEMPTS = 5
+
+
+class FrameSource(abc.ABC):
+    """A source of BGR frames. read() returns None at the end of the source."""
+
+    live = False  # Reads block at the device rate, so no pacing is needed
+    fps: Optional[float] = None
+
+    def open(self):
+        pass
+
+    @abc.abstractmethod
+    def read(self) -> Optional[np.ndarray]:
+        ...
+
+    def close(self):
+        pass
+
+
+class VideoSource(FrameSource):
+    """Video file, camera index or network stream read through cv2.VideoCapture"""
+
+    def __init__(self, source: Union[str, int], loop: bool = True, properties: Optional[dict] = None):
+        self.source = source
+        self.loop = loop
+        # cv2.CAP_PROP_* -> value, applied on open (e.g. camera resolution)
+        self.properties = properties or {}
+        self.live = isinstance(source, int) or str(source).lower().startswith(STREAM_SCHEMES)
+        self._capture = None
+
+    def _connect(self):
+        self._capture = cv2.VideoCapture(self.source)
+        for prop, value in self.properties.items():
+            self._capture.set(prop, value)
+
+    def open(self):
+        self._connect()
+        if not self._capture.isOpened():
+            raise RuntimeError(f"[ERROR] Could not open video source: {self.source}")
+        if not self.live:
+            self.fps = self._capture.get(cv2.CAP_PROP_FPS) or DEFAULT_VIDEO_FPS
+
+    def read(self) -> Optional[np.ndarray]:
+        ret, frame = self._capture.read()
+        if ret and frame is not None:
+            return frame
+
+        if self.live:
+            # Dropped stream / camera hiccup: reconnect instead of ending
+            for _ in range(RECONNECT_ATTEMPTS):
+                self._capture.release()
+                time.sleep(RECONNECT_DELAY)
+                self._connect()
+                ret, frame = self._capture.read()
+                if ret and frame is not None:
+                    return frame
+            return None
+
+        # When video ends, restart (or stop)
+        if self.loop:
+            self._capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self._capture.read()
+            if ret and frame is not None:
+                return frame
+        return None
+
+    def close(self):
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+
+
+class ImageDirectorySource(FrameSource):
+    """Images of a directory in name order, e.g. frames dumped from a video"""
+
+    def __init__(self, directory: str, fps: Optional[float] = None, loop: bool = True):
+        self.directory = directory
+        self.fps = fps or DEFAULT_IMAGE_FPS
+        self.loop = loop
+        self._paths = []
+        self._index = 0
+
+    def open(self):
+        self._paths = sorted(
+            path for path in glob.glob(os.path.join(self.directory, "*"))
+            if path.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if not self._paths:
+            raise RuntimeError(f"[ERROR] No images found in: {self.directory}")
+        self._index = 0
+
+    def read(self) -> Optional[np.ndarray]:
+        # Skip unreadable files; stop after one full pass without a frame
+        for _ in range(len(self._paths)):
+            if self._index >= len(self._paths):
+                if not self.loop:
+                    return None
+                self._index = 0
+            path = self._paths[self._index]
+            self._index += 1
+            frame = cv2.imread(path)
+            if frame is not None:
+                return frame
+        return None
+
+
+def open_source(source: Union[str, int, FrameSource], loop: bool = True,
+                fps: Optional[float] = None) -> FrameSource:
+    """Build a FrameSource from a camera index, URL, video path or image directory"""
+    if isinstance(source, FrameSource):
+        return source
+    if isinstance(source, str) and source.isdigit():
+        source = int(source)
+    if isinstance(source, str) and os.path.isdir(source):
+        return ImageDirectorySource(source, fps=fps, loop=loop)
+    return VideoSource(source, loop=loop)
+
+
+class _Pacer:
+    """Sleeps so frames come out at `fps` (0 / None = no pacing)"""
+
+    def __init__(self, fps: Optional[float]):
+        self.interval = 1.0 / fps if fps and fps > 0 else 0.0
+        self._next = time.perf_counter()
+
+    def wait(self, stop_event: Optional[threading.Event] = None):
+        if not self.interval:
+            return
+        delay = self._next - time.perf_counter()
+        if delay > 0:
+            if stop_event is not None:
+                stop_event.wait(delay)
+            else:
+                time.sleep(delay)
+        # Do not try to catch up after a stall
+        self._next = max(self._next + self.interval, time.perf_counter() - self.interval)
+
+
+def iter_frames(source: Union[str, int, FrameSource], fps: Optional[float] = None, loop: bool = True,
+                max_frames: Optional[int] = None) -> Iterator[np.ndarray]:
+    """
+    Yield every frame of a source in the calling thread (no frames dropped).
+
+    Args:
+        source: Camera index, URL, video path, image directory or FrameSource
+        fps: Pace frames at this rate; 0 = as fast as possible,
+             None = the source's own frame rate
+        loop: Restart from the first frame when a file source ends
+        max_frames: Stop after this many frames (None = until the end)
+    """
+    frame_source = open_source(source, loop=loop, fps=fps)
+    frame_source.open()
+    pacer = _Pacer(frame_source.fps if fps is None and not frame_source.live else fps)
+    produced = 0
+    try:
+        while max_frames is None or produced < max_frames:
+            frame = frame_source.read()
+            if frame is None:
+                break
+            pacer.wait()
+            produced += 1
+            yield frame
+    finally:
+        frame_source.close()
+
+
+class FrameCapturer:
+    """
+    Decodes a source in a background thread into a single latest-frame slot.
+
+    The slot holds a (sequence, frame) tuple that is replaced, never mutated,
+    so readers take it with a single attribute read and may keep the frame
+    without copying. wait_for_frame() blocks until a frame newer than the
+    caller's last sequence number arrives.
+    """
+
+    def __init__(self, source: Union[str, int, FrameSource], fps: Optional[float] = None,
+                 loop: bool = True, name: str = "capturer"):
+        self.source = open_source(source, loop=loop, fps=fps)
+        self.fps = fps
+        self.name = name
+
+        self._slot: Tuple[int, Optional[np.ndarray]] = (0, None)
+        self._new_frame = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.error: Optional[Exception] = None
+        self.frames_captured = 0
+        self.frames_consumed = 0
+
+    def start(self) -> "FrameCapturer":
+        if self._thread is not None:
+            return self
+        self.source.open()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        print(f"[Capturer] Started ({self.name})")
+        return self
+
+    def stop(self, timeout: float = 2.0):
+        self._stop_event.set()
+        with self._new_frame:
+            self._new_frame.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        print(f"[Capturer] Stopped ({self.name})")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        pacer = _Pacer(None if self.source.live else (self.fps if self.fps is not None else self.source.fps))
+        try:
+            while not self._stop_event.is_set():
+                frame = self.source.read()
+                if frame is None:
+                    break
+                pacer.wait(self._stop_event)
+                self.frames_captured += 1
+                self._slot = (self._slot[0] + 1, frame)
+                with self._new_frame:
+                    self._new_frame.notify_all()
+        except Exception as e:
+            self.error = e
+            print(f"[Capturer] Error ({self.name}): {e}")
+        finally:
+            self.source.close()
+            self._stop_event.set()
+            with self._new_frame:
+                self._new_frame.notify_all()
+
+    def latest(self) -> Tuple[int, Optional[np.ndarray]]:
+        """(sequence, frame) of the newest frame; sequence 0 means no frame yet"""
+        return self._slot
+
+    def wait_for_frame(self, after: int = 0, timeout: Optional[float] = None) -> Tuple[Optional[int], Optional[np.ndarray]]:
+        """
+        Newest frame with sequence > after, waiting up to timeout seconds.
+        Returns (None, None) on timeout or when capture has ended.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._new_frame:
+            while self._slot[0] <= after:
+                if self._stop_event.is_set():
+                    return None, None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None, None
+                self._new_frame.wait(remaining)
+        sequence, frame = self._slot
+        self.frames_consumed += 1
+        return sequence, frame
+
+    def get_stats(self) -> dict:
+        return {
+            "source": str(getattr(self.source, "source", getattr(self.source, "directory", ""))),
+            "running": self.is_running,
+            "frames_captured": self.frames_captured,
+            "frames_consumed": self.frames_consumed,
+            "frames_skipped": max(0, self.frames_captured - self.frames_consumed),
+        }
@@ -0,0 +1,77 @@
+"""
+Binary WebSocket frame protocol shared by /ws/outdoor-navigation and
+/ws/realtime-description.
+
+A client opts in at connect time with the query parameter `?protocol=binary`
+and may then send frames as binary messages instead of JSON with a base64
+data URL. JSON text messages (e.g. "stop") keep working in both modes.
+
+Binary message layout (little-endian, 14-byte header):
+
+    offset  size  field
+    0       1     protocol version (1)
+    1       1     message type (1 = JPEG frame)
+    2       4     sequence number (uint32)
+    6       8     client timestamp in seconds (float64)
+    14      ...   raw JPEG bytes
+"""
+
+import struct
+import time
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import cv2
+import numpy as np
+
+PROTOCOL_JSON = "json"
+PROTOCOL_BINARY = "binary"
+PROTOCOL_VERSION = 1
+
+MESSAGE_TYPE_FRAME = 1
+
+HEADER = struct.Struct("<BBId")
+
+
+class FrameProtocolError(ValueError):
+    """Raised when a binary message does not follow the frame protocol."""
+
+
+@dataclass
+class BinaryFrame:
+    message_type: int
+    sequence: int
+    timestamp: float
+    payload: memoryview
+
+
+def negotiate_protocol(websocket) -> str:
+    """Protocol requested by the client in the connect URL (defaults to JSON)"""
+    requested = (websocket.query_params.get("protocol") or PROTOCOL_JSON).lower()
+    return PROTOCOL_BINARY if requested == PROTOCOL_BINARY else PROTOCOL_JSON
+
+
+def pack_frame(jpeg_bytes: bytes, sequence: int, timestamp: Optional[float] = None,
+               message_type: int = MESSAGE_TYPE_FRAME) -> bytes:
+    """Build a binary frame message (used by clients and benchmarks)"""
+    timestamp = time.time() if timestamp is None else timestamp
+    header = HEADER.pack(PROTOCOL_VERSION, message_type, sequence & 0xFFFFFFFF, timestamp)
+    return header + bytes(jpeg_bytes)
+
+
+def unpack_frame(data: Union[bytes, bytearray, memoryview]) -> BinaryFrame:
+    """Parse a binary frame message without copying the JPEG payload"""
+    view = memoryview(data)
+    if len(view) <= HEADER.size:
+        raise FrameProtocolError(f"Binary message too short ({len(view)} bytes)")
+
+    version, message_type, sequence, timestamp = HEADER.unpack_from(view)
+    if version != PROTOCOL_VERSION:
+        raise FrameProtocolError(f"Unsupported frame protocol version {version}")
+
+    return BinaryFrame(message_type, sequence, timestamp, view[HEADER.size:])
+
+
+def decode_jpeg(payload, flags: int = cv2.IMREAD_COLOR) -> Optional[np.ndarray]:
+    """Decode JPEG bytes / memoryview straight into a BGR frame"""
+    return cv2.imdecode(np.frombuffer(payload, np.uint8), flags)
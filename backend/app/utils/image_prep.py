@@ -0,0 +1,144 @@
+"""
+Image preparation before vision-LLM calls.
+
+Uploads and camera frames used to be sent to Gemini as they arrived: full
+phone-camera resolution for captioning, whatever the browser sent for
+real-time description. Each task now has a profile:
+
+    - max_side: longest side sent to the model (OCR keeps more pixels than
+      captioning, real-time description the fewest)
+    - quality: JPEG quality of the re-encode
+    - trim_borders: crop near-uniform margins (e.g. the table around a page)
+
+The image is decoded once (at reduced JPEG scale when it is much larger
+than needed, see jpeg.py), resized, re-encoded without metadata (EXIF,
+thumbnails, ICC profiles; orientation is applied by the decoder) and sent
+as JPEG. If the original is a JPEG that needs no resize, is already
+smaller than the re-encode and carries no metadata segments, the original
+is kept.
+"""
+
+import base64
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import cv2
+import numpy as np
+
+from .jpeg import jpeg_dimensions, jpeg_has_metadata, reduced_decode_flag
+
+
+@dataclass(frozen=True)
+class ImageProfile:
+    max_side: int
+    quality: int
+    trim_borders: bool = False
+
+
+TASK_PROFILES: Dict[str, ImageProfile] = {
+    "text_recognition": ImageProfile(max_side=1600, quality=85, trim_borders=True),
+    "image_captioning": ImageProfile(max_side=768, quality=75),
+    "distance_estimation": ImageProfile(max_side=1024, quality=80),
+    "currency_detection": ImageProfile(max_side=1024, quality=85),  # Colours tell notes apart
+    "realtime_description": ImageProfile(max_side=640, quality=70),
+}
+DEFAULT_PROFILE = ImageProfile(max_side=1024, quality=80)
+
+BORDER_TOLERANCE = 24    # Grey levels from the border colour that still count as background
+BORDER_MIN_CONTENT = 0.01  # Share of a row / column that must differ to count as content
+BORDER_PADDING = 0.02    # Margin kept around the content (share of each side)
+BORDER_MIN_GAIN = 0.1    # Only crop when it removes at least this share of the area
+
+
+@dataclass
+class PreparedImage:
+    data: bytes              # JPEG sent to the model
+    width: int
+    height: int
+    original_size: int       # Bytes received
+    prepare_ms: float
+    reencoded: bool          # False: the original was small enough and kept
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_size - len(self.data)
+
+
+def get_profile(task: str) -> ImageProfile:
+    return TASK_PROFILES.get(task, DEFAULT_PROFILE)
+
+
+def _decode(data: bytes, max_side: int) -> Optional[np.ndarray]:
+    dimensions = jpeg_dimensions(data)
+    flag = cv2.IMREAD_COLOR
+    if dimensions is not None:
+        scale = min(1.0, max_side / max(dimensions))
+        flag = reduced_decode_flag(data, (int(np.ceil(dimensions[0] * scale)),
+                                          int(np.ceil(dimensions[1] * scale))))
+    return cv2.imdecode(np.frombuffer(data, np.uint8), flag)
+
+
+def trim_borders(image: np.ndarray) -> np.ndarray:
+    """Crop near-uniform margins around the content (unchanged if there is little to gain)"""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    edges = np.concatenate((gray[0], gray[-1], gray[:, 0], gray[:, -1]))
+    background = float(np.median(edges))
+    content = np.abs(gray.astype(np.int16) - background) > BORDER_TOLERANCE
+
+    rows = np.flatnonzero(content.mean(axis=1) > BORDER_MIN_CONTENT)
+    cols = np.flatnonzero(content.mean(axis=0) > BORDER_MIN_CONTENT)
+    if rows.size == 0 or cols.size == 0:
+        return image
+
+    height, width = gray.shape
+    pad_y, pad_x = int(height * BORDER_PADDING), int(width * BORDER_PADDING)
+    top, bottom = max(0, rows[0] - pad_y), min(height, rows[-1] + 1 + pad_y)
+    left, right = max(0, cols[0] - pad_x), min(width, cols[-1] + 1 + pad_x)
+    if (bottom - top) * (right - left) > (1.0 - BORDER_MIN_GAIN) * height * width:
+        return image
+    return image[top:bottom, left:right]
+
+
+def prepare_frame(frame: np.ndarray, task: str) -> bytes:
+    """Resize (and crop) an already decoded BGR frame for task, as JPEG bytes"""
+    profile = get_profile(task)
+    if profile.trim_borders:
+        frame = trim_borders(frame)
+    height, width = frame.shape[:2]
+    scale = profile.max_side / max(height, width)
+    if scale < 1.0:
+        frame = cv2.resize(frame, (max(1, round(width * scale)), max(1, round(height * scale))),
+                           interpolation=cv2.INTER_AREA)
+    ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, profile.quality])
+    if not ok:
+        raise ValueError("JPEG encoding failed")
+    return buffer.tobytes()
+
+
+def prepare_image(data: bytes, task: str) -> PreparedImage:
+    """Encoded image (any format OpenCV reads) -> JPEG prepared for task"""
+    start = time.perf_counter()
+    profile = get_profile(task)
+    image = _decode(data, profile.max_side)
+    if image is None:
+        # Not an image OpenCV can read: let the model deal with it
+        return PreparedImage(data, 0, 0, len(data), (time.perf_counter() - start) * 1000.0, False)
+
+    prepared = prepare_frame(image, task)
+    width, height = jpeg_dimensions(prepared)
+    # The original may only go out as-is if nothing (EXIF, GPS, ...) rides along
+    reencoded = not (jpeg_dimensions(data) == (width, height) and len(data) <= len(prepared)
+                     and not jpeg_has_metadata(data))
+    return PreparedImage(prepared if reencoded else bytes(data), width, height, len(data),
+                         (time.perf_counter() - start) * 1000.0, reencoded)
+
+
+def prepare_base64(base64_image: str, task: str) -> str:
+    """prepare_image() for a base64 payload (returned unchanged if it is not valid base64)"""
+    try:
+        data = base64.b64decode(base64_image)
+    except ValueError:
+        return base64_image
+    prepared = prepare_image(data, task)
+    return base64.b64encode(prepared.data).decode("utf-8")
@@ -0,0 +1,100 @@
+"""
+JPEG helpers for decoding client frames at reduced scale.
+
+libjpeg can scale by 1/2, 1/4 or 1/8 while decoding (in the DCT domain),
+which is much cheaper than a full decode followed by a resize. The image
+size is read from the JPEG headers so the largest reduction that still
+covers the size a consumer needs can be picked before decoding.
+"""
+
+import struct
+from typing import Optional, Tuple
+
+import cv2
+
+# Scale factor -> imdecode flag, largest reduction first
+REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+# Start-of-frame markers that carry the image size (SOF0-SOF15 except DHT,
+# JPG and DAC, which share the range)
+_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Markers without a length field
+_STANDALONE_MARKERS = frozenset(range(0xD0, 0xDA)) | {0x01}
+# APP1-APP15 (EXIF, XMP, ICC profile, ...) and COM segments; APP0 is the JFIF header
+_METADATA_MARKERS = frozenset(range(0xE1, 0xF0)) | {0xFE}
+
+
+def jpeg_dimensions(data) -> Optional[Tuple[int, int]]:
+    """(width, height) read from the JPEG headers, or None if not a JPEG"""
+    view = memoryview(data)
+    size = len(view)
+    if size < 4 or view[0] != 0xFF or view[1] != 0xD8:
+        return None
+
+    pos = 2
+    while pos + 4 <= size:
+        if view[pos] != 0xFF:
+            return None
+        marker = view[pos + 1]
+        if marker == 0xFF:  # Fill byte
+            pos += 1
+            continue
+        if marker in _STANDALONE_MARKERS:
+            pos += 2
+            continue
+        if marker in _SOF_MARKERS:
+            if pos + 9 > size:
+                return None
+            height, width = struct.unpack_from(">HH", view, pos + 5)
+            return width, height
+        if marker == 0xDA:  # Start of scan without a frame header
+            return None
+        (length,) = struct.unpack_from(">H", view, pos + 2)
+        pos += 2 + length
+    return None
+
+
+def jpeg_has_metadata(data) -> bool:
+    """True if the JPEG headers carry APP1-APP15 or COM segments (EXIF, GPS, ...)"""
+    view = memoryview(data)
+    size = len(view)
+    if size < 4 or view[0] != 0xFF or view[1] != 0xD8:
+        return False
+
+    pos = 2
+    while pos + 4 <= size:
+        if view[pos] != 0xFF:
+            return False
+        marker = view[pos + 1]
+        if marker == 0xFF:  # Fill byte
+            pos += 1
+            continue
+        if marker in _STANDALONE_MARKERS:
+            pos += 2
+            continue
+        if marker in _METADATA_MARKERS:
+            return True
+        if marker == 0xDA:  # Entropy-coded data follows, no more headers
+            return False
+        (length,) = struct.unpack_from(">H", view, pos + 2)
+        pos += 2 + length
+    return False
+
+
+def reduced_decode_flag(data, target_size: Tuple[int, int]) -> int:
+    """imdecode flag for the cheapest decode that still covers target_size (width, height)"""
+    dimensions = jpeg_dimensions(data)
+    if dimensions is None:
+        return cv2.IMREAD_COLOR
+
+    width, height = dimensions
+    target_width, target_height = target_size
+    for factor, flag in REDUCED_DECODE_FLAGS:
+        # libjpeg rounds scaled dimensions up
+        if -(-width // factor) >= target_width and -(-height // factor) >= target_height:
+            return flag
+    return cv2.IMREAD_COLOR
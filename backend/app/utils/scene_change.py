@@ -0,0 +1,153 @@
+"""
+Scene change detection for real-time description.
+
+Instead of decoding the previous and the current full JPEG on every frame,
+only a compact fingerprint of the last described frame is kept:
+
+    - a small grayscale thumbnail (structure, compared pixel by pixel)
+    - a 64-bit difference hash (dHash, robust to exposure / noise)
+    - a normalised hue/saturation histogram (colour content)
+
+A new frame is decoded once at reduced JPEG scale (see jpeg.py), turned
+into a fingerprint and compared with the reference. compare() returns a
+similarity in [0, 1]; a frame counts as a scene change when the similarity
+drops below the detector's threshold, which each client can tune.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .jpeg import reduced_decode_flag
+
+DECODE_SIZE = (64, 48)     # Smallest decode that still covers the fingerprint (width, height)
+THUMBNAIL_SIZE = (32, 24)  # Grayscale thumbnail (width, height)
+HASH_SIZE = 8              # dHash: 8x8 bits from a 9x8 grayscale image
+HIST_BINS = (16, 4)        # Hue x saturation bins
+PIXEL_CHANGE_LEVEL = 30    # Thumbnail pixels differing by more than this count as changed
+
+# Weights of the three similarities in the combined score
+THUMBNAIL_WEIGHT = 0.5
+HASH_WEIGHT = 0.25
+HISTOGRAM_WEIGHT = 0.25
+
+DEFAULT_THRESHOLD = 0.85
+
+
+@dataclass
+class Fingerprint:
+    thumbnail: np.ndarray  # uint8, THUMBNAIL_SIZE grayscale
+    hash: int              # 64-bit dHash
+    histogram: np.ndarray  # float32, sums to 1
+
+
+def decode_small(data) -> Optional[np.ndarray]:
+    """Decode JPEG bytes at the largest reduction still covering DECODE_SIZE"""
+    return cv2.imdecode(np.frombuffer(data, np.uint8), reduced_decode_flag(data, DECODE_SIZE))
+
+
+def compute_fingerprint(frame: np.ndarray) -> Fingerprint:
+    """Fingerprint of a BGR frame (large frames are shrunk to DECODE_SIZE first)"""
+    if frame.shape[1] > DECODE_SIZE[0] * 2 or frame.shape[0] > DECODE_SIZE[1] * 2:
+        frame = cv2.resize(frame, DECODE_SIZE, interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    thumbnail = cv2.resize(gray, THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
+
+    # dHash: is each pixel brighter than its right neighbour?
+    hash_image = cv2.resize(gray, (HASH_SIZE + 1, HASH_SIZE), interpolation=cv2.INTER_AREA)
+    bits = (hash_image[:, 1:] > hash_image[:, :-1]).flatten()
+    frame_hash = int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    histogram = cv2.calcHist([hsv], [0, 1], None, list(HIST_BINS), [0, 180, 0, 256]).flatten()
+    histogram /= max(float(histogram.sum()), 1.0)
+
+    return Fingerprint(thumbnail=thumbnail, hash=frame_hash, histogram=histogram.astype(np.float32))
+
+
+def fingerprint_jpeg(data) -> Optional[Fingerprint]:
+    """Fingerprint straight from JPEG bytes (None if they do not decode)"""
+    frame = decode_small(data)
+    if frame is None:
+        return None
+    return compute_fingerprint(frame)
+
+
+def compare(a: Fingerprint, b: Fingerprint) -> float:
+    """Similarity of two fingerprints in [0, 1] (1 = same scene)"""
+    diff = cv2.absdiff(a.thumbnail, b.thumbnail)
+    thumbnail_similarity = 1.0 - np.count_nonzero(diff > PIXEL_CHANGE_LEVEL) / diff.size
+    hash_similarity = 1.0 - bin(a.hash ^ b.hash).count("1") / (HASH_SIZE * HASH_SIZE)
+    histogram_similarity = float(np.minimum(a.histogram, b.histogram).sum())
+
+    return float(THUMBNAIL_WEIGHT * thumbnail_similarity
+                 + HASH_WEIGHT * hash_similarity
+                 + HISTOGRAM_WEIGHT * histogram_similarity)
+
+
+class SceneChangeDetector:
+    """
+    Keeps the fingerprint of the last described frame.
+
+    check() fingerprints a new frame and reports whether it differs enough
+    from the reference; accept() makes it the new reference once it has
+    been described, so frames that were never described never move it.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.reference: Optional[Fingerprint] = None
+        self.last_similarity: Optional[float] = None
+        self.frames_checked = 0
+        self.changes_detected = 0
+
+    def set_threshold(self, threshold: float):
+        self.threshold = min(max(float(threshold), 0.0), 1.0)
+
+    def check(self, data) -> Tuple[bool, Optional[float], Optional[Fingerprint]]:
+        """
+        (changed, similarity, fingerprint) for JPEG bytes. Without a
+        reference, or if the frame cannot be decoded, it counts as changed
+        with similarity None.
+        """
+        return self._check(fingerprint_jpeg(data))
+
+    def check_frame(self, frame: np.ndarray) -> Tuple[bool, Optional[float], Optional[Fingerprint]]:
+        """check() for an already decoded BGR frame"""
+        return self._check(compute_fingerprint(frame) if frame is not None else None)
+
+    def check_fingerprint(self, fingerprint: Optional[Fingerprint]) -> Tuple[bool, Optional[float], Optional[Fingerprint]]:
+        """check() for a fingerprint computed elsewhere (e.g. in a worker thread)"""
+        return self._check(fingerprint)
+
+    def _check(self, fingerprint: Optional[Fingerprint]) -> Tuple[bool, Optional[float], Optional[Fingerprint]]:
+        self.frames_checked += 1
+        if fingerprint is None or self.reference is None:
+            self.last_similarity = None
+            self.changes_detected += 1
+            return True, None, fingerprint
+
+        similarity = compare(self.reference, fingerprint)
+        self.last_similarity = similarity
+        changed = similarity < self.threshold
+        if changed:
+            self.changes_detected += 1
+        return changed, similarity, fingerprint
+
+    def accept(self, fingerprint: Optional[Fingerprint]):
+        """Make a (described) frame the new reference"""
+        self.reference = fingerprint
+
+    def reset(self):
+        self.reference = None
+        self.last_similarity = None
+
+    def get_stats(self) -> dict:
+        return {
+            "threshold": self.threshold,
+            "last_similarity": round(self.last_similarity, 3) if self.last_similarity is not None else None,
+            "frames_checked": self.frames_checked,
+            "changes_detected": self.changes_detected,
+        }
@@ -0,0 +1,128 @@
+"""
+Lazy loading of the heavy backend subsystems.
+
+Importing TensorFlow (outdoor navigation), sentence-transformers or the
+LangChain providers takes from seconds to tens of seconds, so main.py must
+not import them at module level. Each subsystem is registered here with a
+loader function instead; the loader runs the first time the subsystem is
+needed, or earlier in a background warm-up thread started after the API is
+up. Readiness per subsystem is exposed through status() for health checks.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+STATE_PENDING = "pending"
+STATE_LOADING = "loading"
+STATE_READY = "ready"
+STATE_FAILED = "failed"
+
+
+class Subsystem:
+    """One lazily loaded subsystem; load() runs the loader at most once at a time"""
+
+    def __init__(self, name: str, loader: Callable[[], Any], description: str = ""):
+        self.name = name
+        self.loader = loader
+        self.description = description
+        self.state = STATE_PENDING
+        self.value = None
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> Any:
+        """Return the loaded value, running the loader if needed (raises on failure)"""
+        if self.state == STATE_READY:
+            return self.value
+        with self._lock:
+            # Another thread may have finished loading while we waited
+            if self.state == STATE_READY:
+                return self.value
+            self.state = STATE_LOADING
+            self.error = None
+            start = time.perf_counter()
+            try:
+                self.value = self.loader()
+            except Exception as e:
+                # A failed subsystem is retried on the next load()
+                self.state = STATE_FAILED
+                self.error = f"{type(e).__name__}: {e}"
+                self.load_seconds = time.perf_counter() - start
+                print(f"[Subsystems] {self.name} failed to load: {self.error}")
+                raise
+            self.load_seconds = time.perf_counter() - start
+            self.state = STATE_READY
+            print(f"[Subsystems] {self.name} ready in {self.load_seconds:.2f}s")
+            return self.value
+
+    def get_status(self) -> Dict:
+        return {
+            "state": self.state,
+            "ready": self.state == STATE_READY,
+            "description": self.description,
+            "load_seconds": round(self.load_seconds, 2) if self.load_seconds is not None else None,
+            "error": self.error,
+        }
+
+
+class SubsystemLoader:
+    """Registry of lazily loaded subsystems with a background warm-up"""
+
+    def __init__(self):
+        self._subsystems: Dict[str, Subsystem] = {}
+        self._warm_thread: Optional[threading.Thread] = None
+        self.started_at = time.time()
+
+    def register(self, name: str, loader: Callable[[], Any], description: str = "") -> Subsystem:
+        subsystem = Subsystem(name, loader, description)
+        self._subsystems[name] = subsystem
+        return subsystem
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._subsystems
+
+    def get(self, name: str) -> Any:
+        """Load (if needed) and return a subsystem, blocking the calling thread"""
+        return self._subsystems[name].load()
+
+    async def require(self, name: str) -> Any:
+        """Async get(): loads in a worker thread so the event loop keeps serving"""
+        subsystem = self._subsystems[name]
+        if subsystem.state == STATE_READY:
+            return subsystem.value
+        return await asyncio.to_thread(subsystem.load)
+
+    def is_ready(self, name: str) -> bool:
+        return self._subsystems[name].state == STATE_READY
+
+    def warm(self, names: Optional[Iterable[str]] = None):
+        """Load subsystems one after another in a daemon thread (no-op if already warming)"""
+        if self._warm_thread is not None and self._warm_thread.is_alive():
+            return
+        names = list(names) if names is not None else list(self._subsystems)
+
+        def run():
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception:
+                    # Recorded in the subsystem status; keep warming the rest
+                    pass
+
+        self._warm_thread = threading.Thread(target=run, name="subsystem-warmup", daemon=True)
+        self._warm_thread.start()
+        print(f"[Subsystems] Warming up in background: {', '.join(names)}")
+
+    def status(self) -> Dict:
+        subsystems = {name: s.get_status() for name, s in self._subsystems.items()}
+        return {
+            "ready": all(s["ready"] for s in subsystems.values()),
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "subsystems": subsystems,
+        }
+
+
+subsystems = SubsystemLoader()
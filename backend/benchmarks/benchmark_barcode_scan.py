@@ -0,0 +1,109 @@
+"""
+Barcode decode latency of the sequential cascade against the parallel one
+(stages fanned out over a thread pool, first hit in stage order wins), on
+the examples/*.jpg product images. Images without a barcode are the worst
+case: every stage runs.
+
+Both modes use the default stage order with no time budget, so their
+results must be identical; the report flags any image where they are not.
+Needs pyzbar with the native zbar library. Run from the backend directory:
+    python benchmarks/benchmark_barcode_scan.py --repeat 5 --workers 2 4 8
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Thêm đường dẫn để import modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+
+
+def detections_key(detections):
+    return [(d.code, d.symbology, d.polygon) for d in detections]
+
+
+def time_scan(scanner, frame, parallel, repeat):
+    timings, detections = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        detections = scanner._decode_barcodes(frame, parallel=parallel)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return float(np.percentile(timings, 50)), detections
+
+
+def summarise(per_image):
+    values = list(per_image.values())
+    return {"worst_ms": round(max(values), 1), "mean_ms": round(float(np.mean(values)), 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, nargs="+", default=[4])
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    # Fixed order and no budget: both modes try the same stages
+    os.environ["BARCODE_SCAN_BUDGET_MS"] = "0"
+    os.environ["BARCODE_ADAPTIVE_ORDER"] = "false"
+    from app.config import config
+    from app.services.barcode_scanning import BarcodeScannerService
+
+    try:
+        scanner = BarcodeScannerService()
+    except RuntimeError as exc:
+        print(f"Barcode scanner unavailable: {exc}")
+        return
+
+    images = [(path.name, cv2.imread(str(path))) for path in sorted(EXAMPLES_DIR.glob("*.jpg"))]
+    images = [(name, frame) for name, frame in images if frame is not None]
+    if not images:
+        print(f"No .jpg files in {EXAMPLES_DIR}")
+        return
+
+    sequential, results = {}, {}
+    for name, frame in images:
+        scanner._decode_barcodes(frame, parallel=False)  # warmup
+        sequential[name], detections = time_scan(scanner, frame, False, args.repeat)
+        results[name] = detections_key(detections)
+
+    report = {
+        "images": {name: {"codes": [key[0] for key in results[name]]} for name, _ in images},
+        "sequential": summarise(sequential),
+    }
+    for name in sequential:
+        report["images"][name]["sequential_ms"] = round(sequential[name], 1)
+
+    for workers in args.workers:
+        config.BARCODE_PARALLEL_WORKERS = workers
+        if scanner._executor is not None:
+            scanner._executor.shutdown()
+            scanner._executor = None  # New pool with this many workers
+        parallel, mismatches = {}, []
+        for name, frame in images:
+            scanner._decode_barcodes(frame, parallel=True)  # warmup
+            parallel[name], detections = time_scan(scanner, frame, True, args.repeat)
+            if detections_key(detections) != results[name]:
+                mismatches.append(name)
+            report["images"][name][f"parallel_{workers}_ms"] = round(parallel[name], 1)
+        report[f"parallel_{workers}"] = {
+            **summarise(parallel),
+            "worst_case_speedup": round(max(sequential.values()) / max(parallel.values()), 2),
+            "mismatches": mismatches,
+        }
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Micro-benchmark of the vectorized CircularBuffer against the previous
+list-based implementation, with an equivalence check of mean().
+
+Run from the backend directory:
+    python benchmarks/benchmark_circular_buffer.py
+"""
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+# Thêm đường dẫn để import modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.outdoor_navigation.utils.circularBuffer import CircularBuffer
+
+
+class LegacyCircularBuffer:
+    """The list-based buffer this module replaced (kept for comparison)"""
+
+    def __init__(self, capacity, noneOverridePercent=0.8):
+        self.capacity = capacity
+        self.queue = [None] * capacity
+        self.minNumPercent = noneOverridePercent
+
+    def add(self, term):
+        self.queue.pop()
+        self.queue.insert(0, term)
+
+    def mean(self):
+        temp = self.queue.copy()
+        none_count = sum(1 for t in temp if t is None)
+        if none_count >= self.minNumPercent * self.capacity:
+            return None
+        temp = [t for t in temp if t is not None]
+        return np.mean(np.array(temp), axis=0)
+
+
+def make_readings(n, n_classes=3, none_ratio=0.2, seed=0):
+    rng = np.random.default_rng(seed)
+    readings = []
+    for _ in range(n):
+        if rng.random() < none_ratio:
+            readings.append(None)
+        else:
+            p = rng.random(n_classes)
+            readings.append(p / p.sum())
+    return readings
+
+
+def check_equivalence(capacity, readings):
+    new = CircularBuffer(capacity, noneOverridePercent=0.5, n_classes=3)
+    old = LegacyCircularBuffer(capacity, noneOverridePercent=0.5)
+    for term in readings:
+        new.add(term)
+        old.add(term)
+        a, b = new.mean(), old.mean()
+        if (a is None) != (b is None) or (a is not None and not np.allclose(a, b)):
+            return False
+    return True
+
+
+def main():
+    readings = make_readings(5000)
+
+    for capacity in (20, 100, 1000):
+        ok = check_equivalence(capacity, readings)
+
+        def run(buffer):
+            def step():
+                for term in readings:
+                    buffer.add(term)
+                    buffer.mean()
+            return step
+
+        legacy_s = min(timeit.repeat(run(LegacyCircularBuffer(capacity, 0.5)), number=1, repeat=5))
+        vector_s = min(timeit.repeat(run(CircularBuffer(capacity, 0.5, n_classes=3)), number=1, repeat=5))
+
+        per_op_legacy = legacy_s / len(readings) * 1e6
+        per_op_vector = vector_s / len(readings) * 1e6
+        print(
+            f"capacity {capacity:5d}: legacy {per_op_legacy:7.2f} us/frame  "
+            f"vectorized {per_op_vector:7.2f} us/frame  "
+            f"speedup {per_op_legacy / per_op_vector:5.1f}x  equivalent={ok}"
+        )
+
+
+if __name__ == "__main__":
+    main()
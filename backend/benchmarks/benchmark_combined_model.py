@@ -0,0 +1,110 @@
+"""
+Accuracy / latency comparison of the separate navigation models
+(VGG16 sidewalk + ResNet152 turn) and the combined model.
+
+The example videos are unlabelled, so accuracy is measured as per-class
+agreement with the separate (production) models on the same frames. Frames
+come from the held-out tail of each video (combined_model.HOLDOUT_FRACTION),
+which the turn head never saw during distillation.
+
+Run from the backend directory:
+    python benchmarks/benchmark_combined_model.py --frames 200
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Thêm đường dẫn để import modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.outdoor_navigation.combined_model import (
+    COMBINED_WEIGHTS_PATH,
+    HOLDOUT_FRACTION,
+    holdout_frames,
+    load_combined_model,
+)
+from app.services.outdoor_navigation.sidewalk_classification import CLASSES as SIDEWALK_CLASSES, SidewalkClassification
+from app.services.outdoor_navigation.turn_classification import LABELS as TURN_LABELS, TurnClassification
+from app.services.outdoor_navigation.utils.frame_sampling import EXAMPLE_VIDEO_DIR, list_example_videos
+from benchmarks.common import per_class_agreement, to_labels
+
+
+def latency_ms(fn, inputs):
+    latencies = []
+    outputs = []
+    for x in inputs:
+        start = time.perf_counter()
+        outputs.append(fn(x))
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    return np.array(latencies), outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video-dir", default=EXAMPLE_VIDEO_DIR)
+    parser.add_argument("--weights", default=COMBINED_WEIGHTS_PATH)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    videos = list_example_videos(args.video_dir)
+    if not videos:
+        print(f"No .mp4 files found in {args.video_dir}")
+        return
+
+    frames = holdout_frames(videos, max_frames=args.frames)
+    if not frames:
+        print(f"Could not read held-out frames from {args.video_dir}")
+        return
+    inputs = [SidewalkClassification.preprocess_frame(frame) for frame in frames]
+    print(f"Sampled {len(frames)} held-out frames (last {HOLDOUT_FRACTION:.0%}) from {len(videos)} videos")
+
+    sidewalk_model = SidewalkClassification.load_model()
+    turn_model = TurnClassification.load_model()
+    combined = load_combined_model(args.weights)
+
+    # Warm up every path
+    for model in (sidewalk_model, turn_model, combined):
+        model.predict(inputs[0], verbose=0)
+
+    separate_ms, separate_out = latency_ms(
+        lambda x: (sidewalk_model.predict(x, verbose=0)[0], turn_model.predict(x, verbose=0)[0]), inputs
+    )
+    combined_ms, combined_out = latency_ms(
+        lambda x: tuple(out[0] for out in combined.predict(x, verbose=0)), inputs
+    )
+
+    sep_sidewalk = to_labels([o[0] for o in separate_out], SIDEWALK_CLASSES, SIDEWALK_CLASSES[-1])
+    sep_turn = to_labels([o[1] for o in separate_out], TURN_LABELS, TURN_LABELS[1])
+    comb_sidewalk = to_labels([o[0] for o in combined_out], SIDEWALK_CLASSES, SIDEWALK_CLASSES[-1])
+    comb_turn = to_labels([o[1] for o in combined_out], TURN_LABELS, TURN_LABELS[1])
+
+    report = {
+        "combined_model": combined.name,
+        "frames": len(frames),
+        "holdout_fraction": HOLDOUT_FRACTION,
+        "latency_ms": {
+            "separate_p50": round(float(np.percentile(separate_ms, 50)), 2),
+            "separate_p99": round(float(np.percentile(separate_ms, 99)), 2),
+            "combined_p50": round(float(np.percentile(combined_ms, 50)), 2),
+            "combined_p99": round(float(np.percentile(combined_ms, 99)), 2),
+        },
+        "sidewalk_agreement": per_class_agreement(sep_sidewalk, comb_sidewalk, SIDEWALK_CLASSES),
+        "turn_agreement": per_class_agreement(sep_turn, comb_turn, TURN_LABELS),
+    }
+    report["latency_ms"]["speedup_p50"] = round(
+        report["latency_ms"]["separate_p50"] / report["latency_ms"]["combined_p50"], 2
+    )
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Parity check and latency benchmark of the exported ONNX / TFLite navigation
+models against the Keras models they were exported from.
+
+Export first, then run from the backend directory:
+    python -m app.services.outdoor_navigation.export --format onnx tflite
+    python benchmarks/benchmark_exported_models.py --threads 4
+
+Exits with status 1 if an exported model disagrees with Keras.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Thêm đường dẫn để import modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.outdoor_navigation.export import EXPORT_DIR, EXPORT_FORMATS, MODEL_LOADERS, exported_model_path
+from app.services.outdoor_navigation.inference import load_exported_model
+from app.services.outdoor_navigation.sidewalk_classification import SidewalkClassification
+from app.services.outdoor_navigation.utils.frame_sampling import (
+    EXAMPLE_VIDEO_DIR,
+    list_example_videos,
+    sample_video_frames,
+)
+
+PROB_TOLERANCE = 1e-3
+
+
+def run(model, inputs):
+    model.predict(inputs[0], verbose=0)  # warmup
+    latencies = []
+    outputs = []
+    for x in inputs:
+        start = time.perf_counter()
+        outputs.append(model.predict(x, verbose=0)[0])
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    return np.array(latencies), np.array(outputs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video-dir", default=EXAMPLE_VIDEO_DIR)
+    parser.add_argument("--export-dir", default=EXPORT_DIR)
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=0, help="Intra-op threads (0 = runtime default)")
+    args = parser.parse_args()
+
+    videos = list_example_videos(args.video_dir)
+    if not videos:
+        print(f"No .mp4 files found in {args.video_dir}")
+        return 0
+
+    frames = sample_video_frames(videos, max_frames=args.frames)
+    inputs = [SidewalkClassification.preprocess_frame(frame) for frame in frames]
+    print(f"Sampled {len(frames)} frames from {len(videos)} videos")
+
+    failed = False
+    for name, loader in MODEL_LOADERS.items():
+        keras_ms, keras_out = run(loader(), inputs)
+        print(f"\n[{name}] keras   p50 {np.percentile(keras_ms, 50):7.2f} ms  p99 {np.percentile(keras_ms, 99):7.2f} ms")
+
+        for fmt in EXPORT_FORMATS:
+            path = exported_model_path(name, fmt, args.export_dir)
+            if not os.path.exists(path):
+                print(f"[{name}] {fmt:7s} skipped ({path} not found)")
+                continue
+
+            model = load_exported_model(path, fmt, intra_op_threads=args.threads)
+            ms, out = run(model, inputs)
+
+            max_diff = float(np.max(np.abs(out - keras_out)))
+            same_class = float(np.mean(np.argmax(out, axis=1) == np.argmax(keras_out, axis=1)))
+            ok = max_diff <= PROB_TOLERANCE and same_class == 1.0
+            failed = failed or not ok
+
+            print(
+                f"[{name}] {fmt:7s} p50 {np.percentile(ms, 50):7.2f} ms  p99 {np.percentile(ms, 99):7.2f} ms  "
+                f"speedup {np.percentile(keras_ms, 50) / np.percentile(ms, 50):.2f}x  "
+                f"same class {same_class * 100:.1f}%  max |diff| {max_diff:.2e}  {'OK' if ok else 'MISMATCH'}"
+            )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+Decode time and memory per navigation frame: full resolution decode + resize
+(previous path) against the reduced-scale decode of utils.frame_ingest.
+
+Frames are the JPEG images in examples/, resized to common camera
+resolutions and re-encoded at the frontend's JPEG quality. With --agreement,
+frames sampled from the example videos are encoded the same way and the
+sidewalk / turn models are run on both decodes; the report gives the share
+of frames whose predicted class is unchanged (overall and per class of the
+full-decode prediction). Check it before enabling NAVIGATION_REDUCED_DECODE.
+Run from the backend directory:
+    python benchmarks/benchmark_frame_ingest.py --repeat 20
+    python benchmarks/benchmark_frame_ingest.py --agreement --frames 300 --output ingest.json
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Thêm đường dẫn để import modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.outdoor_navigation.sidewalk_classification import CLASSES as SIDEWALK_CLASSES, SidewalkClassification
+from app.services.outdoor_navigation.turn_classification import LABELS as TURN_LABELS, TurnClassification
+from app.services.outdoor_navigation.utils.frame_ingest import (
+    MODEL_INPUT_SIZE,
+    decode_model_input,
+    reduced_decode_flag,
+)
+from app.services.outdoor_navigation.utils.frame_sampling import (
+    EXAMPLE_VIDEO_DIR,
+    list_example_videos,
+    sample_video_frames,
+)
+from benchmarks.common import per_class_agreement, to_labels
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+RESOLUTIONS = ((640, 480), (1280, 720), (1920, 1080))
+
+MODELS = {
+    "sidewalk": (SidewalkClassification.load_model, SIDEWALK_CLASSES, SIDEWALK_CLASSES[-1]),
+    "turn": (TurnClassification.load_model, TURN_LABELS, TURN_LABELS[1]),
+}
+
+
+def load_jpegs(width, height, quality):
+    jpegs = []
+    for path in sorted(EXAMPLES_DIR.glob("*.jpg")):
+        image = cv2.imread(str(path))
+        if image is None:
+            continue
+        image = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+        ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if ok:
+            jpegs.append(buffer.tobytes())
+    return jpegs
+
+
+def time_decode(jpegs, reduced, repeat):
+    decode_model_input(jpegs[0], reduced=reduced)  # warmup
+    timings = []
+    for _ in range(repeat):
+        for jpeg in jpegs:
+            start = time.perf_counter()
+            decode_model_input(jpeg, reduced=reduced)
+            timings.append((time.perf_counter() - start) * 1000.0)
+    return np.array(timings)
+
+
+def decoded_bytes(jpeg, reduced):
+    """Size of the intermediate image imdecode allocates"""
+    flag = reduced_decode_flag(jpeg) if reduced else cv2.IMREAD_COLOR
+    return cv2.imdecode(np.frombuffer(jpeg, np.uint8), flag).nbytes
+
+
+def encode_frames(frames, width, height, quality):
+    jpegs = []
+    for frame in frames:
+        frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+        ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if ok:
+            jpegs.append(buffer.tobytes())
+    return jpegs
+
+
+def prediction_agreement(video_dir, max_frames, quality):
+    """Per model and resolution: do full and reduced decodes give the same predicted class?"""
+    videos = list_example_videos(video_dir)
+    if not videos:
+        print(f"No .mp4 files found in {video_dir}")
+        return None
+    frames = sample_video_frames(videos, max_frames=max_frames, stride=7)
+    print(f"Agreement check on {len(frames)} frames from {len(videos)} videos")
+
+    inputs = {}
+    for width, height in RESOLUTIONS:
+        jpegs = encode_frames(frames, width, height, quality)
+        inputs[f"{width}x{height}"] = {
+            reduced: np.stack([SidewalkClassification.preprocess_frame(decode_model_input(j, reduced=reduced))[0]
+                               for j in jpegs])
+            for reduced in (False, True)
+        }
+
+    report = {"frames": len(frames)}
+    for name, (loader, labels, fallback) in MODELS.items():
+        model = loader()
+        report[name] = {}
+        for resolution, batches in inputs.items():
+            full = to_labels(model.predict(batches[False], verbose=0), labels, fallback)
+            reduced = to_labels(model.predict(batches[True], verbose=0), labels, fallback)
+            report[name][resolution] = {
+                "overall_agreement": round(float(np.mean(np.array(full) == np.array(reduced))), 3),
+                "per_class": per_class_agreement(full, reduced, labels),
+            }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quality", type=int, default=80)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--agreement", action="store_true",
+                        help="Also compare sidewalk / turn predictions on full vs reduced decodes")
+    parser.add_argument("--video-dir", default=EXAMPLE_VIDEO_DIR)
+    parser.add_argument("--frames", type=int, default=300, help="Video frames for --agreement")
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    model_input_bytes = MODEL_INPUT_SIZE[0] * MODEL_INPUT_SIZE[1] * 3
+    report = {}
+    for width, height in RESOLUTIONS:
+        jpegs = load_jpegs(width, height, args.quality)
+        if not jpegs:
+            print(f"No .jpg files found in {EXAMPLES_DIR}")
+            return
+
+        full_ms = time_decode(jpegs, reduced=False, repeat=args.repeat)
+        reduced_ms = time_decode(jpegs, reduced=True, repeat=args.repeat)
+
+        # Previous path: full decode + full-size latest_frame copy kept per session
+        full_decoded = decoded_bytes(jpegs[0], reduced=False)
+        full_per_frame = 2 * full_decoded + model_input_bytes
+        reduced_per_frame = decoded_bytes(jpegs[0], reduced=True) + model_input_bytes
+
+        # How much the model input changes (0-255 scale)
+        input_mad = np.mean([
+            np.abs(decode_model_input(j, reduced=True).astype(np.int16)
+                   - decode_model_input(j, reduced=False).astype(np.int16)).mean()
+            for j in jpegs
+        ])
+
+        full_p50 = float(np.percentile(full_ms, 50))
+        reduced_p50 = float(np.percentile(reduced_ms, 50))
+        report[f"{width}x{height}"] = {
+            "full_decode_p50_ms": round(full_p50, 3),
+            "reduced_decode_p50_ms": round(reduced_p50, 3),
+            "decode_ms_saved": round(full_p50 - reduced_p50, 3),
+            "speedup": round(full_p50 / reduced_p50, 2),
+            "full_bytes_per_frame": full_per_frame,
+            "reduced_bytes_per_frame": reduced_per_frame,
+            "memory_saved_kb": round((full_per_frame - reduced_per_frame) / 1024, 1),
+            "model_input_mean_abs_diff": round(float(input_mad), 2),
+        }
+
+    if args.agreement:
+        report["prediction_agreement"] = prediction_agreement(args.video_dir, args.frames, args.quality)
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
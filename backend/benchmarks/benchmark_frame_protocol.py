@@ -0,0 +1,125 @@
+"""
+Bytes on the wire and server-side parse + decode cost of the JSON/base64
+frame messages compared with the binary frame protocol.
+
+Frames are the JPEG images in examples/, resized to the camera resolution
+and re-encoded at the frontend's JPEG quality. Run from the backend directory:
+    python benchmarks/benchmark_frame_protocol.py --width 640 --height 480
+"""
+import argparse
+import base64
+import json
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Thêm đường dẫn để import modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.utils.frame_protocol import decode_jpeg, pack_frame, unpack_frame
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+
+
+def load_jpegs(width, height, quality):
+    jpegs = []
+    for path in sorted(EXAMPLES_DIR.glob("*.jpg")):
+        image = cv2.imread(str(path))
+        if image is None:
+            continue
+        image = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+        ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if ok:
+            jpegs.append(buffer.tobytes())
+    return jpegs
+
+
+def json_message(jpeg, sequence):
+    data_url = "data:image/jpeg;base64," + base64.b64encode(jpeg).decode("utf-8")
+    return json.dumps({"type": "frame", "data": data_url, "timestamp": sequence})
+
+
+def handle_json(text):
+    """What the JSON path does per frame on the server"""
+    message = json.loads(text)
+    frame_data = message["data"].split("base64,")[1]
+    return decode_jpeg(base64.b64decode(frame_data))
+
+
+def handle_binary(data):
+    """What the binary path does per frame on the server"""
+    return decode_jpeg(unpack_frame(data).payload)
+
+
+def measure(handler, messages, repeat):
+    handler(messages[0])  # warmup
+    timings = []
+    for _ in range(repeat):
+        for message in messages:
+            start = time.perf_counter()
+            handler(message)
+            timings.append((time.perf_counter() - start) * 1000.0)
+    return np.array(timings)
+
+
+def measure_parse(handler, messages, repeat):
+    """Protocol overhead only (no JPEG decode)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            handler(message)
+    return (time.perf_counter() - start) * 1e6 / (repeat * len(messages))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--quality", type=int, default=80)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    jpegs = load_jpegs(args.width, args.height, args.quality)
+    if not jpegs:
+        print(f"No .jpg files found in {EXAMPLES_DIR}")
+        return
+
+    json_messages = [json_message(jpeg, i) for i, jpeg in enumerate(jpegs)]
+    binary_messages = [pack_frame(jpeg, i) for i, jpeg in enumerate(jpegs)]
+
+    json_bytes = np.mean([len(m.encode("utf-8")) for m in json_messages])
+    binary_bytes = np.mean([len(m) for m in binary_messages])
+
+    json_ms = measure(handle_json, json_messages, args.repeat)
+    binary_ms = measure(handle_binary, binary_messages, args.repeat)
+
+    json_parse_us = measure_parse(
+        lambda t: base64.b64decode(json.loads(t)["data"].split("base64,")[1]), json_messages, args.repeat
+    )
+    binary_parse_us = measure_parse(unpack_frame, binary_messages, args.repeat)
+
+    report = {
+        "frames": len(jpegs),
+        "resolution": f"{args.width}x{args.height}",
+        "json": {
+            "bytes_per_frame": int(json_bytes),
+            "parse_us": round(json_parse_us, 1),
+            "parse_decode_p50_ms": round(float(np.percentile(json_ms, 50)), 3),
+            "frames_per_s": round(1000.0 / float(np.mean(json_ms)), 1),
+        },
+        "binary": {
+            "bytes_per_frame": int(binary_bytes),
+            "parse_us": round(binary_parse_us, 1),
+            "parse_decode_p50_ms": round(float(np.percentile(binary_ms, 50)), 3),
+            "frames_per_s": round(1000.0 / float(np.mean(binary_ms)), 1),
+        },
+        "bandwidth_saving": round(1.0 - binary_bytes / json_bytes, 3),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Payload size and preparation cost of the per-task image preparation of
+app/utils/image_prep.py, against sending the upload as it arrived.
+
+Every image in examples/ (phone photos, screenshots, scanned pages) is
+prepared with each task profile. Per task the report gives bytes sent
+before / after, the share saved, preparation time and the upload time the
+saving is worth at --uplink-mbps. With --live (needs GOOGLE_API_KEY and
+langchain-google-genai) each image is also sent to Gemini both ways with the
+task prompt, and the median end-to-end latencies are reported. Run from the
+backend directory:
+    python benchmarks/benchmark_image_prep.py --repeat 10
+    python benchmarks/benchmark_image_prep.py --live --limit 3
+"""
+import argparse
+import base64
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Thêm đường dẫn để import modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.utils.image_prep import TASK_PROFILES, prepare_image
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+# Tasks sent through get_llm_response (the others use their own prompts)
+LIVE_TASKS = ("text_recognition", "image_captioning", "distance_estimation")
+
+
+def load_images():
+    paths = sorted(EXAMPLES_DIR.glob("*.jpg")) + sorted(EXAMPLES_DIR.glob("*.png"))
+    return [(path.name, path.read_bytes()) for path in paths]
+
+
+def median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return float(np.percentile(timings, 50))
+
+
+def gemini_latency_ms(task, data, repeat):
+    """Median end-to-end latency of a get_llm_response-style call for this image"""
+    from app.services.all_task.pipeline import get_llm, get_task_prompt
+
+    llm = get_llm("gemini")
+    image_url = f"data:image/jpeg;base64,{base64.b64encode(data).decode('utf-8')}"
+    messages = [
+        {"role": "system", "content": get_task_prompt(task)},
+        {"role": "user", "content": [{"type": "image_url", "image_url": {"url": image_url}}]},
+    ]
+    return median_ms(lambda: llm.invoke(messages), repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--uplink-mbps", type=float, default=5.0, help="Client uplink for the upload estimate")
+    parser.add_argument("--live", action="store_true", help="Also measure Gemini latency (uses API quota)")
+    parser.add_argument("--live-repeat", type=int, default=3)
+    parser.add_argument("--limit", type=int, default=0, help="Only the first N images (0 = all)")
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    images = load_images()
+    if args.limit:
+        images = images[:args.limit]
+    if not images:
+        print(f"No .jpg / .png files in {EXAMPLES_DIR}")
+        return
+
+    report = {"images": len(images), "uplink_mbps": args.uplink_mbps}
+    for task, profile in TASK_PROFILES.items():
+        original_bytes, prepared_bytes, prepare_ms, kept = [], [], [], 0
+        latency_original, latency_prepared = [], []
+        for name, data in images:
+            prepared = prepare_image(data, task)
+            original_bytes.append(len(data))
+            prepared_bytes.append(len(prepared.data))
+            kept += not prepared.reencoded
+            prepare_ms.append(median_ms(lambda: prepare_image(data, task), args.repeat))
+            if args.live and task in LIVE_TASKS:
+                latency_original.append(gemini_latency_ms(task, data, args.live_repeat))
+                latency_prepared.append(gemini_latency_ms(task, prepared.data, args.live_repeat))
+
+        total_original, total_prepared = sum(original_bytes), sum(prepared_bytes)
+        saved = total_original - total_prepared
+        entry = {
+            "max_side": profile.max_side,
+            "quality": profile.quality,
+            "trim_borders": profile.trim_borders,
+            "mean_original_kb": round(total_original / len(images) / 1024, 1),
+            "mean_prepared_kb": round(total_prepared / len(images) / 1024, 1),
+            "bytes_saved_ratio": round(saved / total_original, 3),
+            "originals_kept": kept,
+            "prepare_p50_ms": round(float(np.percentile(prepare_ms, 50)), 2),
+            "prepare_max_ms": round(max(prepare_ms), 2),
+            # Base64 in the request adds a third to the bytes on the wire
+            "upload_saved_ms_per_image": round(saved / len(images) * 4 / 3 * 8 / (args.uplink_mbps * 1e3), 1),
+        }
+        if latency_original:
+            entry["gemini_original_p50_ms"] = round(float(np.percentile(latency_original, 50)), 1)
+            entry["gemini_prepared_p50_ms"] = round(float(np.percentile(latency_prepared, 50)), 1)
+            entry["gemini_latency_change_ms"] = round(entry["gemini_prepared_p50_ms"]
+                                                      - entry["gemini_original_p50_ms"], 1)
+        report[task] = entry
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Compare per-frame latency of Keras model.predict and the compiled tf.function
+path for the outdoor navigation classifiers, and check that both paths
+produce the same classes.
+
+Run from the backend directory:
+    python benchmarks/benchmark_inference_modes.py --frames 100
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Thêm đường dẫn để import modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.outdoor_navigation.inference import CompiledKerasModel
+from app.services.outdoor_navigation.sidewalk_classification import SidewalkClassification
+from app.services.outdoor_navigation.turn_classification import TurnClassification
+from app.services.outdoor_navigation.utils.frame_sampling import (
+    EXAMPLE_VIDEO_DIR,
+    list_example_videos,
+    sample_video_frames,
+)
+
+
+def time_per_frame(predict, inputs):
+    latencies = []
+    outputs = []
+    for x in inputs:
+        start = time.perf_counter()
+        outputs.append(predict(x)[0])
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    return np.array(latencies), np.array(outputs)
+
+
+def benchmark_model(name, classifier_cls, frames):
+    model = classifier_cls.load_model()
+    compiled = CompiledKerasModel(model).warmup()
+    # Warm up the Keras path too so neither side pays first-call costs
+    model.predict(np.zeros((1, 100, 100, 3), dtype=np.uint8), verbose=0)
+
+    inputs = [classifier_cls.preprocess_frame(frame) for frame in frames]
+
+    keras_ms, keras_out = time_per_frame(lambda x: model.predict(x, verbose=0), inputs)
+    compiled_ms, compiled_out = time_per_frame(compiled.predict, inputs)
+
+    same_class = np.mean(np.argmax(keras_out, axis=1) == np.argmax(compiled_out, axis=1))
+    max_diff = float(np.max(np.abs(keras_out - compiled_out)))
+
+    print(f"\n[{name}] {len(inputs)} frames")
+    print(f"  model.predict : p50 {np.percentile(keras_ms, 50):7.2f} ms  p99 {np.percentile(keras_ms, 99):7.2f} ms")
+    print(f"  compiled      : p50 {np.percentile(compiled_ms, 50):7.2f} ms  p99 {np.percentile(compiled_ms, 99):7.2f} ms")
+    print(f"  speedup (p50) : {np.percentile(keras_ms, 50) / np.percentile(compiled_ms, 50):.2f}x")
+    print(f"  same class    : {same_class * 100:.1f}%   max |prob diff| {max_diff:.2e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video-dir", default=EXAMPLE_VIDEO_DIR)
+    parser.add_argument("--frames", type=int, default=100)
+    args = parser.parse_args()
+
+    videos = list_example_videos(args.video_dir)
+    if not videos:
+        print(f"No .mp4 files found in {args.video_dir}")
+        return
+
+    frames = sample_video_frames(videos, max_frames=args.frames)
+    print(f"Sampled {len(frames)} frames from {len(videos)} videos")
+
+    benchmark_model("Sidewalk / VGG16", SidewalkClassification, frames)
+    benchmark_model("Turn / ResNet152", TurnClassification, frames)
+
+
+if __name__ == "__main__":
+    main()
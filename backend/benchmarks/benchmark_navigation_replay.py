@@ -0,0 +1,299 @@
+"""
+Offline replay benchmark for outdoor navigation: replays the example videos
+as N concurrent simulated clients and reports throughput, per-stage latency
+and memory, optionally as JSON for regression tracking.
+
+Modes:
+    direct     each client calls decode + OutdoorNavigationPipeline.process_frame
+               from its own thread (what a session worker does)
+    websocket  each client connects to the real /ws/outdoor-navigation handler
+               in-process (starlette TestClient) and waits for every reply;
+               frames the governor sheds (NAVIGATION_MAX_IN_FLIGHT) are
+               counted separately and left out of the latencies
+
+Frames are JPEG-encoded once up front, so client-side encoding is not
+measured. Run from the backend directory:
+    python benchmarks/benchmark_navigation_replay.py --clients 4 --fps 10 --frames 300
+    python benchmarks/benchmark_navigation_replay.py --mode websocket --clients 8 --fps 0 --output replay.json
+"""
+import argparse
+import base64
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Thêm đường dẫn để import modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import config
+from app.utils.frame_capture import iter_frames
+from app.services.outdoor_navigation.model_registry import _current_rss_bytes, model_registry
+from app.services.outdoor_navigation.pipeline import OutdoorNavigationPipeline
+from app.services.outdoor_navigation.utils.frame_sampling import EXAMPLE_VIDEO_DIR, list_example_videos
+from app.services.outdoor_navigation import websocket_server
+from app.services.outdoor_navigation.governor import navigation_governor
+from app.utils.frame_protocol import PROTOCOL_BINARY, PROTOCOL_JSON, pack_frame
+
+MEMORY_SAMPLE_INTERVAL = 0.1
+
+
+def rss_mb():
+    rss = _current_rss_bytes()
+    return round(rss / (1024 * 1024), 1) if rss is not None else None
+
+
+class MemorySampler(threading.Thread):
+    """Tracks peak RSS while the replay runs"""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peak_mb = rss_mb()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(MEMORY_SAMPLE_INTERVAL):
+            current = rss_mb()
+            if current is not None and (self.peak_mb is None or current > self.peak_mb):
+                self.peak_mb = current
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def load_client_frames(videos, clients, frames, quality):
+    """JPEG frames per client; client i replays video i % len(videos) (looping)"""
+    encoded = {}
+    for video in {videos[i % len(videos)] for i in range(clients)}:
+        jpegs = []
+        for frame in iter_frames(video, fps=0, loop=True, max_frames=frames):
+            ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            if ok:
+                jpegs.append(buffer.tobytes())
+        encoded[video] = jpegs
+    return [encoded[videos[i % len(videos)]] for i in range(clients)]
+
+
+def pace(index, start, fps):
+    """Sleep until frame `index` is due (no-op when fps is 0)"""
+    if fps > 0:
+        delay = start + index / fps - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def percentiles(values):
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0:
+        return None
+    return {
+        "count": int(values.size),
+        "p50_ms": round(float(np.percentile(values, 50)), 2),
+        "p95_ms": round(float(np.percentile(values, 95)), 2),
+        "p99_ms": round(float(np.percentile(values, 99)), 2),
+    }
+
+
+def merge_stage_timings(pipelines):
+    merged = {}
+    for pipeline in pipelines:
+        for stage, timings in pipeline.stage_timings.items():
+            merged.setdefault(stage, []).extend(timings)
+    return {stage: percentiles(values) for stage, values in sorted(merged.items())}
+
+
+def run_direct_client(index, jpegs, fps, start_barrier, results):
+    pipeline = OutdoorNavigationPipeline()
+    pipeline.start()
+    latencies, skipped = [], 0
+
+    start_barrier.wait()
+    start = time.perf_counter()
+    for i, jpeg in enumerate(jpegs):
+        pace(i, start, fps)
+        frame_start = time.perf_counter()
+        result = websocket_server.decode_and_process(pipeline, jpeg)
+        latencies.append((time.perf_counter() - frame_start) * 1000.0)
+        skipped += bool(result and result.get("skipped"))
+
+    results[index] = {
+        "elapsed_s": time.perf_counter() - start,
+        "latencies": latencies,
+        "skipped": skipped,
+        "pipeline": pipeline,
+    }
+    pipeline.stop()
+
+
+def wait_until_ready(ws):
+    """Skip "queued" statuses until the session is admitted; False if rejected"""
+    while True:
+        message = ws.receive_json()
+        if message.get("state") == "ready":
+            return True
+        if message.get("state") == "rejected":
+            return False
+
+
+def run_websocket_client(index, jpegs, fps, protocol, client, start_barrier, done_barrier, results):
+    with client.websocket_connect(f"/ws/outdoor-navigation?protocol={protocol}") as ws:
+        if not wait_until_ready(ws):
+            results[index] = {"elapsed_s": 0.0, "latencies": [], "skipped": 0, "shed": 0, "rejected": True}
+            start_barrier.wait()
+            done_barrier.wait()
+            done_barrier.wait()
+            return
+        # Reply to every frame (shed ones included) so each one can be timed end to end
+        ws.send_json({"type": "config", "guidance": {"emit": "all"}})
+        ws.receive_json()
+
+        latencies, skipped, shed = [], 0, 0
+        start_barrier.wait()
+        start = time.perf_counter()
+        for i, jpeg in enumerate(jpegs):
+            pace(i, start, fps)
+            frame_start = time.perf_counter()
+            if protocol == PROTOCOL_BINARY:
+                ws.send_bytes(pack_frame(jpeg, i))
+            else:
+                data = "data:image/jpeg;base64," + base64.b64encode(jpeg).decode("utf-8")
+                ws.send_text(json.dumps({"type": "frame", "data": data}))
+            reply = ws.receive_json()
+            if reply.get("shed"):
+                shed += 1
+                continue
+            latencies.append((time.perf_counter() - frame_start) * 1000.0)
+            skipped += bool(reply.get("skipped"))
+
+        results[index] = {
+            "elapsed_s": time.perf_counter() - start,
+            "latencies": latencies,
+            "skipped": skipped,
+            "shed": shed,
+        }
+        # Keep the session open until the main thread has read its stage timings
+        done_barrier.wait()
+        done_barrier.wait()
+        ws.send_json({"type": "stop"})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("direct", "websocket"), default="direct")
+    parser.add_argument("--video-dir", default=EXAMPLE_VIDEO_DIR)
+    parser.add_argument("--clients", type=int, default=1)
+    parser.add_argument("--fps", type=float, default=10.0, help="Frames per second per client (0 = as fast as possible)")
+    parser.add_argument("--frames", type=int, default=300, help="Frames replayed per client")
+    parser.add_argument("--quality", type=int, default=80, help="JPEG quality of the replayed frames")
+    parser.add_argument("--protocol", choices=(PROTOCOL_JSON, PROTOCOL_BINARY), default=PROTOCOL_BINARY,
+                        help="Frame encoding in websocket mode")
+    parser.add_argument("--model-mode", choices=("separate", "combined"), default=config.NAVIGATION_MODEL_MODE)
+    parser.add_argument("--batching", action="store_true", default=config.NAVIGATION_BATCHING)
+    parser.add_argument("--no-adaptive", action="store_true", help="Infer every frame (disable the adaptive rate)")
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    videos = list_example_videos(args.video_dir)
+    if not videos:
+        print(f"No .mp4 files found in {args.video_dir}")
+        return
+
+    # Sessions (including the websocket handler's) read their settings from config
+    config.NAVIGATION_MODEL_MODE = args.model_mode
+    config.NAVIGATION_BATCHING = args.batching
+    config.NAVIGATION_ADAPTIVE_RATE = not args.no_adaptive
+
+    client_frames = load_client_frames(videos, args.clients, args.frames, args.quality)
+    print(f"Replaying {args.frames} frames x {args.clients} clients from {len(videos)} videos ({args.mode} mode)")
+
+    memory_before = rss_mb()
+    model_registry.preload(model_mode=args.model_mode)
+    memory_models = rss_mb()
+
+    results = [None] * args.clients
+    start_barrier = threading.Barrier(args.clients + 1)
+    done_barrier = threading.Barrier(args.clients + 1)
+
+    if args.mode == "websocket":
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        # Every client runs at once (start barrier), so none may wait in the admission queue
+        navigation_governor.max_sessions = max(navigation_governor.max_sessions, args.clients)
+        app = FastAPI()
+        app.add_api_websocket_route("/ws/outdoor-navigation", websocket_server.websocket_outdoor_navigation)
+        client = TestClient(app)
+        threads = [
+            threading.Thread(target=run_websocket_client, args=(
+                i, client_frames[i], args.fps, args.protocol, client, start_barrier, done_barrier, results
+            ))
+            for i in range(args.clients)
+        ]
+    else:
+        threads = [
+            threading.Thread(target=run_direct_client, args=(i, client_frames[i], args.fps, start_barrier, results))
+            for i in range(args.clients)
+        ]
+
+    sampler = MemorySampler()
+    for thread in threads:
+        thread.start()
+    start_barrier.wait()
+    sampler.start()
+    start = time.perf_counter()
+
+    if args.mode == "websocket":
+        done_barrier.wait()
+        wall_time = time.perf_counter() - start
+        pipelines = [session.pipeline for session in list(websocket_server.sessions.values())]
+        stages = merge_stage_timings(pipelines)
+        done_barrier.wait()
+        for thread in threads:
+            thread.join()
+    else:
+        for thread in threads:
+            thread.join()
+        wall_time = time.perf_counter() - start
+        stages = merge_stage_timings([r["pipeline"] for r in results])
+    sampler.stop()
+
+    total_frames = sum(len(r["latencies"]) for r in results)
+    sent_frames = total_frames + sum(r.get("shed", 0) for r in results)
+    report = {
+        "mode": args.mode,
+        "protocol": args.protocol if args.mode == "websocket" else None,
+        "clients": args.clients,
+        "target_fps_per_client": args.fps,
+        "frames_per_client": args.frames,
+        "model_mode": args.model_mode,
+        "inference_mode": model_registry.inference_mode,
+        "batching": args.batching,
+        "adaptive_rate": not args.no_adaptive,
+        "wall_time_s": round(wall_time, 2),
+        "throughput_fps": round(total_frames / wall_time, 2),
+        "per_client_fps": [round(len(r["latencies"]) / r["elapsed_s"], 2) for r in results if r["elapsed_s"]],
+        "skipped_ratio": round(sum(r["skipped"] for r in results) / max(1, total_frames), 3),
+        "shed_ratio": round((sent_frames - total_frames) / max(1, sent_frames), 3),
+        "rejected_clients": sum(bool(r.get("rejected")) for r in results),
+        "end_to_end": percentiles([ms for r in results for ms in r["latencies"]]),
+        "stages": stages,
+        "memory_mb": {
+            "before_models": memory_before,
+            "after_models": memory_models,
+            "peak": sampler.peak_mb,
+        },
+    }
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Accuracy delta and speedup of the INT8 quantized navigation models compared
+with the float32 Keras models, per class.
+
+Quantized models are taken from the export cache (created on first use if
+missing). Run from the backend directory:
+    python benchmarks/benchmark_quantized_models.py --frames 300 --output int8_report.json
+
+The example videos are unlabelled, so the per-class accuracy delta is measured
+against the float32 model's predictions on the same frames.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Thêm đường dẫn để import modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.outdoor_navigation.export import (
+    EXPORT_DIR,
+    MODEL_LOADERS,
+    QUANTIZED_FORMAT,
+    export_int8,
+    exported_model_path,
+    is_export_stale,
+)
+from app.services.outdoor_navigation.inference import load_exported_model
+from app.services.outdoor_navigation.sidewalk_classification import CLASSES as SIDEWALK_CLASSES, SidewalkClassification
+from app.services.outdoor_navigation.turn_classification import LABELS as TURN_LABELS
+from app.services.outdoor_navigation.utils.frame_sampling import (
+    EXAMPLE_VIDEO_DIR,
+    list_example_videos,
+    sample_video_frames,
+)
+from benchmarks.common import per_class_agreement, to_labels
+
+LABELS = {
+    "sidewalk": (SIDEWALK_CLASSES, SIDEWALK_CLASSES[-1]),
+    "turn": (TURN_LABELS, TURN_LABELS[1]),
+}
+
+
+def run(model, inputs):
+    model.predict(inputs[0], verbose=0)  # warmup
+    latencies = []
+    outputs = []
+    for x in inputs:
+        start = time.perf_counter()
+        outputs.append(model.predict(x, verbose=0)[0])
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    return np.array(latencies), np.array(outputs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video-dir", default=EXAMPLE_VIDEO_DIR)
+    parser.add_argument("--export-dir", default=EXPORT_DIR)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--threads", type=int, default=0, help="TFLite interpreter threads (0 = default)")
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    videos = list_example_videos(args.video_dir)
+    if not videos:
+        print(f"No .mp4 files found in {args.video_dir}")
+        return
+
+    # Evaluate on frames offset from the calibration sample (stride 5)
+    frames = sample_video_frames(videos, max_frames=args.frames, stride=7)
+    inputs = [SidewalkClassification.preprocess_frame(frame) for frame in frames]
+    print(f"Sampled {len(frames)} frames from {len(videos)} videos")
+
+    report = {"frames": len(frames), "models": {}}
+    for name, loader in MODEL_LOADERS.items():
+        keras_model = loader()
+        path = exported_model_path(name, QUANTIZED_FORMAT, args.export_dir)
+        if is_export_stale(name, path):
+            os.makedirs(args.export_dir, exist_ok=True)
+            export_int8(name, path, video_dir=args.video_dir, model=keras_model)
+
+        float_ms, float_out = run(keras_model, inputs)
+        int8_ms, int8_out = run(load_exported_model(path, QUANTIZED_FORMAT, intra_op_threads=args.threads), inputs)
+
+        labels, fallback = LABELS[name]
+        float_labels = to_labels(float_out, labels, fallback)
+        int8_labels = to_labels(int8_out, labels, fallback)
+        agreement = per_class_agreement(float_labels, int8_labels, labels)
+
+        report["models"][name] = {
+            "float32_p50_ms": round(float(np.percentile(float_ms, 50)), 2),
+            "int8_p50_ms": round(float(np.percentile(int8_ms, 50)), 2),
+            "speedup_p50": round(float(np.percentile(float_ms, 50) / np.percentile(int8_ms, 50)), 2),
+            "model_size_mb": round(os.path.getsize(path) / (1024 * 1024), 1),
+            "overall_agreement": round(float(np.mean(np.array(float_labels) == np.array(int8_labels))), 3),
+            "per_class": {
+                label: {**stats, "accuracy_delta": round(stats["agreement"] - 1.0, 3)}
+                for label, stats in agreement.items()
+            },
+        }
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Cost and separation of real-time description change detection: the previous
+path (decode both full JPEGs, resize to 320x240, absdiff) against the
+fingerprint detector of app/utils/scene_change.py (one reduced-scale decode
+of the new frame, compared with the stored fingerprint).
+
+"Same scene" pairs are an examples/*.jpg image and a slightly shifted,
+brightened and re-encoded copy of it (camera shake, exposure change).
+"Different scene" pairs are two different images. The similarity ranges
+show where the change threshold separates them. Run from the backend directory:
+    python benchmarks/benchmark_scene_change.py --repeat 20
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Thêm đường dẫn để import modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.utils.scene_change import DEFAULT_THRESHOLD, compare, fingerprint_jpeg
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+RESOLUTIONS = ((640, 480), (1280, 720))
+
+
+def encode(image, quality):
+    ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buffer.tobytes() if ok else None
+
+
+def jittered(image, shift=4, brightness=12):
+    """Same scene, slightly moved and brighter"""
+    matrix = np.float32([[1, 0, shift], [0, 1, shift]])
+    moved = cv2.warpAffine(image, matrix, (image.shape[1], image.shape[0]), borderMode=cv2.BORDER_REFLECT)
+    return cv2.convertScaleAbs(moved, alpha=1.0, beta=brightness)
+
+
+def load_pairs(width, height, quality):
+    images = []
+    for path in sorted(EXAMPLES_DIR.glob("*.jpg")):
+        image = cv2.imread(str(path))
+        if image is not None:
+            images.append(cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA))
+    jpegs = [encode(image, quality) for image in images]
+    same = [(jpegs[i], encode(jittered(images[i]), quality)) for i in range(len(images))]
+    different = [(jpegs[i], jpegs[(i + 1) % len(jpegs)]) for i in range(len(jpegs))] if len(jpegs) > 1 else []
+    return same, different
+
+
+def legacy_change_ratio(previous_jpeg, current_jpeg):
+    """Previous detect_significant_change: two full decodes + 320x240 absdiff"""
+    frame1 = cv2.imdecode(np.frombuffer(previous_jpeg, np.uint8), cv2.IMREAD_COLOR)
+    frame2 = cv2.imdecode(np.frombuffer(current_jpeg, np.uint8), cv2.IMREAD_COLOR)
+    diff = cv2.absdiff(cv2.resize(frame1, (320, 240)), cv2.resize(frame2, (320, 240)))
+    return float(np.sum(diff > 30) / diff.size)
+
+
+def time_per_frame(fn, calls, repeat):
+    fn(*calls[0])  # warmup
+    timings = []
+    for _ in range(repeat):
+        for call in calls:
+            start = time.perf_counter()
+            fn(*call)
+            timings.append((time.perf_counter() - start) * 1000.0)
+    return float(np.percentile(timings, 50))
+
+
+def summarise(values):
+    return {"min": round(float(min(values)), 3), "max": round(float(max(values)), 3)} if values else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quality", type=int, default=70)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    report = {"threshold": DEFAULT_THRESHOLD}
+    for width, height in RESOLUTIONS:
+        same, different = load_pairs(width, height, args.quality)
+        if not different:
+            print(f"Need at least two .jpg files in {EXAMPLES_DIR}")
+            return
+
+        # The detector only fingerprints the new frame; the reference is stored
+        pairs = same + different
+        stored = [(fingerprint_jpeg(previous), current) for previous, current in pairs]
+        fingerprint_ms = time_per_frame(lambda reference, current: compare(reference, fingerprint_jpeg(current)),
+                                        stored, args.repeat)
+        legacy_ms = time_per_frame(legacy_change_ratio, pairs, args.repeat)
+
+        def similarities(pairs):
+            return [compare(fingerprint_jpeg(a), fingerprint_jpeg(b)) for a, b in pairs]
+
+        same_similarity = similarities(same)
+        different_similarity = similarities(different)
+        report[f"{width}x{height}"] = {
+            "legacy_p50_ms": round(legacy_ms, 3),
+            "fingerprint_p50_ms": round(fingerprint_ms, 3),
+            "speedup": round(legacy_ms / fingerprint_ms, 2),
+            "same_scene_similarity": summarise(same_similarity),
+            "different_scene_similarity": summarise(different_similarity),
+            "same_scene_flagged_changed": sum(s < DEFAULT_THRESHOLD for s in same_similarity),
+            "different_scene_missed": sum(s >= DEFAULT_THRESHOLD for s in different_similarity),
+            "legacy_same_scene_flagged_changed": sum(legacy_change_ratio(a, b) > 0.15 for a, b in same),
+            "legacy_different_scene_missed": sum(legacy_change_ratio(a, b) <= 0.15 for a, b in different),
+            "pairs": len(pairs),
+        }
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
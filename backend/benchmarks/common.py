@@ -0,0 +1,22 @@
+"""Helpers shared by the navigation benchmark scripts."""
+import numpy as np
+
+from app.services.outdoor_navigation.sidewalk_classification import DETECTION_THRESHOLD
+
+
+def to_labels(preds, labels, fallback):
+    """Per-frame label using the classifiers' detection threshold (no smoothing)"""
+    return [labels[int(np.argmax(p))] if max(p) >= DETECTION_THRESHOLD else fallback for p in preds]
+
+
+def per_class_agreement(reference, candidate, labels):
+    """For each reference class: how many frames, and the share the candidate labels the same"""
+    result = {}
+    for label in labels:
+        idx = [i for i, ref in enumerate(reference) if ref == label]
+        if idx:
+            result[label] = {
+                "frames": len(idx),
+                "agreement": round(sum(candidate[i] == label for i in idx) / len(idx), 3),
+            }
+    return result
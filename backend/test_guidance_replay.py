@@ -0,0 +1,125 @@
+"""
+Replay tests cho GuidanceStateMachine (hysteresis, min dwell, heartbeat).
+
+Replays scripted per-frame guidance sequences at 10 FPS with synthetic
+timestamps, so the results are deterministic and no models are needed.
+Run from the backend directory:
+    python test_guidance_replay.py
+"""
+import random
+import sys
+from pathlib import Path
+
+# Thêm đường dẫn để import modules
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services.outdoor_navigation.guidance import (
+    EVENT_CHANGE,
+    EVENT_HEARTBEAT,
+    MIN_HEARTBEAT_INTERVAL,
+    GuidanceStateMachine,
+)
+
+FPS = 10
+STRAIGHT = "Keep going straight"
+MOVE_LEFT = "Move left to stay on sidewalk"
+MOVE_RIGHT = "Move right to stay on sidewalk"
+TURN_LEFT = "Turn left ahead"
+
+
+def replay(sequence, **kwargs):
+    """Feed one guidance per frame; returns [(frame_index, event, stable_guidance)]"""
+    state = GuidanceStateMachine(**kwargs)
+    events = []
+    for i, guidance in enumerate(sequence):
+        event = state.update(guidance, now=i / FPS)
+        if event is not None:
+            events.append((i, event, state.current))
+    return events, state
+
+
+def changes(events):
+    return [(i, guidance) for i, event, guidance in events if event == EVENT_CHANGE]
+
+
+def test_single_frame_flicker_is_ignored():
+    sequence = [STRAIGHT] * 50
+    for i in (10, 21, 22, 35):
+        sequence[i] = MOVE_LEFT
+    events, _ = replay(sequence, confirm_frames=3, min_dwell=1.0)
+    assert changes(events) == [(0, STRAIGHT)], events
+
+
+def test_sustained_change_waits_for_confirmation_and_dwell():
+    # Change starts at 0.5 s; confirmed at frame 7 but dwell (1 s) ends at frame 10
+    sequence = [STRAIGHT] * 5 + [MOVE_LEFT] * 30
+    events, _ = replay(sequence, confirm_frames=3, min_dwell=1.0)
+    assert changes(events) == [(0, STRAIGHT), (10, MOVE_LEFT)], events
+
+
+def test_urgent_guidance_skips_dwell():
+    sequence = [STRAIGHT] * 2 + [TURN_LEFT] * 10
+    events, _ = replay(sequence, confirm_frames=3, min_dwell=1.0)
+    assert changes(events) == [(0, STRAIGHT), (4, TURN_LEFT)], events
+
+
+def test_heartbeat_when_nothing_changes():
+    events, _ = replay([STRAIGHT] * (20 * FPS), heartbeat_interval=5.0)
+    heartbeats = [i for i, event, _ in events if event == EVENT_HEARTBEAT]
+    assert heartbeats == [50, 100, 150], heartbeats
+
+
+def test_noisy_stream_cuts_messages_by_an_order_of_magnitude():
+    rng = random.Random(0)
+    # 60 s walk: stable segments of 3-8 s, 15% of frames misclassified
+    sequence, segments = [], 0
+    segment = STRAIGHT
+    while len(sequence) < 60 * FPS:
+        segment = rng.choice([g for g in (STRAIGHT, MOVE_LEFT, MOVE_RIGHT) if g != segment])
+        sequence += [segment] * rng.randint(3 * FPS, 8 * FPS)
+        segments += 1
+    sequence = [
+        rng.choice([STRAIGHT, MOVE_LEFT, MOVE_RIGHT]) if rng.random() < 0.15 else guidance
+        for guidance in sequence[:60 * FPS]
+    ]
+
+    events, state = replay(sequence)
+    raw_changes = sum(1 for a, b in zip(sequence, sequence[1:]) if a != b)
+    print(f"  frames={len(sequence)} raw_changes={raw_changes} "
+          f"messages={len(events)} transitions={state.transitions}")
+    assert len(events) * 10 <= len(sequence), events
+    # Every real segment change is followed, none of the noise is
+    assert state.transitions == segments, (state.transitions, segments)
+
+
+def test_client_settings_are_clamped():
+    # heartbeat_interval=0 used to send a heartbeat on every frame
+    events, state = replay([STRAIGHT] * (5 * FPS), heartbeat_interval=0, min_dwell=-3, confirm_frames=0)
+    assert (state.heartbeat_interval, state.min_dwell, state.confirm_frames) == (MIN_HEARTBEAT_INTERVAL, 0.0, 1)
+    heartbeats = [i for i, event, _ in events if event == EVENT_HEARTBEAT]
+    assert heartbeats == [10, 20, 30, 40], heartbeats
+
+    state = GuidanceStateMachine()
+    state.configure(heartbeat_interval="0", min_dwell="-1", confirm_frames="2")
+    assert (state.heartbeat_interval, state.min_dwell, state.confirm_frames) == (MIN_HEARTBEAT_INTERVAL, 0.0, 2)
+
+
+def test_invalid_client_settings_are_rejected_without_changes():
+    state = GuidanceStateMachine(min_dwell=1.0, confirm_frames=3, heartbeat_interval=5.0)
+    for settings in ({"min_dwell": "abc"}, {"confirm_frames": [3]}, {"heartbeat_interval": float("nan")},
+                     {"min_dwell": 0.5, "heartbeat_interval": "inf"}):
+        try:
+            state.configure(**settings)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"accepted {settings}")
+        assert (state.min_dwell, state.confirm_frames, state.heartbeat_interval) == (1.0, 3, 5.0), settings
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_")]
+    for name, fn in tests:
+        fn()
+        print(f"PASS {name}")
+    print(f"{len(tests)} replay tests passed")
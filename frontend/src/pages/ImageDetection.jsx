@@ -50,6 +50,10 @@ export default function ImageDetection() {
   const isSpeakingRef = useRef(false);
   const noSpeechTimeoutRef = useRef(null);
   const hasReceivedResultRef = useRef(false);
+  // Streamed real-time description: text so far, sentences already spoken,
+  // and the speech queue so sentences are read one after another
+  const partialDescriptionRef = useRef({ timestamp: null, text: "", spoken: 0 });
+  const speechQueueRef = useRef(Promise.resolve());
 
   // Initialize detection type from URL parameter
   const initialType = mode && modeToType[mode.toLowerCase()] ? modeToType[mode.toLowerCase()] : "Object";
@@ -205,13 +209,50 @@ export default function ImageDetection() {
         try {
           const data = JSON.parse(event.data);
 
-          if (data.type === "description") {
+          if (data.type === "description_partial") {
+            const partial = partialDescriptionRef.current;
+            if (partial.timestamp !== data.timestamp) {
+              // First chunk of a new description: interrupt the previous one
+              partialDescriptionRef.current = { timestamp: data.timestamp, text: "", spoken: 0 };
+              speechQueueRef.current = Promise.resolve();
+            }
+            const current = partialDescriptionRef.current;
+            current.text += data.text;
+            setRealtimeDescription(current.text);
+            if (data.sentence_end && data.sentence) {
+              // Start speaking each sentence as soon as it is complete
+              const isFirst = current.spoken === 0;
+              current.spoken += 1;
+              const timestamp = data.timestamp;
+              const sentence = data.sentence;
+              speechQueueRef.current = (isFirst ? Promise.resolve() : speechQueueRef.current).then(() => {
+                if (partialDescriptionRef.current.timestamp === timestamp) {
+                  return speech(sentence);
+                }
+              });
+            }
+          } else if (data.type === "description") {
             const description = data.text || data.description;
-            console.log("[WebSocket] Received description:", description);
+            console.log("[WebSocket] Received description:", description,
+              data.first_chunk_ms != null ? `(first chunk ${data.first_chunk_ms} ms)` : "");
             setRealtimeDescription(description);
             setReply(description);
-            // Speak the description every time
-            speech(description);
+            // Speak the description unless it was already spoken sentence by sentence
+            const partial = partialDescriptionRef.current;
+            if (partial.timestamp !== data.timestamp || partial.spoken === 0) {
+              partialDescriptionRef.current = { timestamp: data.timestamp, text: description, spoken: 1 };
+              speech(description);
+            }
+          } else if (data.type === "description_cancelled") {
+            // A newer scene replaced this description: stop reading the stale one
+            if (partialDescriptionRef.current.timestamp === data.timestamp) {
+              partialDescriptionRef.current = { timestamp: null, text: "", spoken: 0 };
+              speechQueueRef.current = Promise.resolve();
+              window.speechSynthesis?.cancel();
+            }
+          } else if (data.type === "description_duplicate") {
+            // Everything in this description was said recently: nothing new to speak
+            console.log("[WebSocket] Description repeats recent ones, not spoken");
           } else if (data.type === "error") {
             console.error("[WebSocket] Error:", data.message);
             setRealtimeDescription(`Error: ${data.message}`);
@@ -83,7 +83,7 @@ export default function OutdoorNavigation() {
       navigationStartTimeRef.current = Date.now(); // Track navigation start time
       setNavigationData({ sidewalk: null, turn: null, guidance: "Navigation active. Analyzing environment..." });
       speech("Navigation system connected");
-      startSendingFrames(ws);
+      // Frames are sent once the server reports "ready" (it may queue us first)
     };
 
     ws.onmessage = (event) => {
@@ -91,6 +91,8 @@ export default function OutdoorNavigation() {
         const data = JSON.parse(event.data);
         if (data.type === "navigation_update") {
           setIsProcessing(false);
+          // Frame dropped by the server under load: nothing to show
+          if (data.shed) return;
           setNavigationData({ sidewalk: data.sidewalk, turn: data.turn, guidance: data.guidance });
           
           if (data.guidance && data.guidance !== lastSpokenGuidanceRef.current) {
@@ -108,6 +110,12 @@ export default function OutdoorNavigation() {
           setIsProcessing(false);
           if (data.type === "error") {
             setNavigationData(prev => ({ ...prev, guidance: `Error: ${data.message}` }));
+          } else if (data.state === "ready") {
+            startSendingFrames(ws);
+          } else if (data.state === "queued" || data.state === "rejected") {
+            // Server at capacity: waiting for a slot, or turned away
+            setNavigationData(prev => ({ ...prev, guidance: data.message }));
+            speech(data.message);
           }
         }
       } catch (error) {